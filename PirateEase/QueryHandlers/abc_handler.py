@@ -1,7 +1,8 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 from PirateEase.Utils.backend_manager import BackendManager
-from PirateEase.Utils.session_manager import SessionManager
+from PirateEase.Utils.session_manager import CurrentSession
 
 """
 OOP Principles
@@ -16,7 +17,7 @@ SOLID Principles
 - Single Responsibility: Provides a single base interface for handling queries.
 - Open/Closed: New handler types can be added by subclassing w/o modifying this class.
 - Liskov Substitution: Any subclass of QueryHandler can stand in place for a QueryHandler and be used polymorphically.
-- Interface Segregation: Minimal and purpose driven interface with just one method.
+- Interface Segregation: Minimal and purpose driven interface with one required method and an optional async variant.
 """
 
 
@@ -26,9 +27,9 @@ class QueryHandler(ABC):
     """
 
     def __init__(self):
-        # Each handler has access to the same backend manager and session manager
+        # Each handler has access to the same backend manager and to whichever session it is serving
         self._backend = BackendManager()
-        self._session = SessionManager()
+        self._session = CurrentSession()
 
     @abstractmethod
     def handle(self, query: str) -> str:
@@ -38,3 +39,22 @@ class QueryHandler(ABC):
         :return: Final response to the query.
         """
         pass
+
+    async def handle_async(self, query: str) -> str:
+        """
+        Async variant of handle. Handlers that wait on the user override this to await the active channel
+        instead of blocking on input().
+        :param query: The query to handle.
+        :return: Final response to the query.
+        """
+        return self.handle(query)
+
+    async def _process_request_async(self, request_type: str, data: str = ''):
+        """
+        Routes a request to the backend on a worker thread, so a slow service never holds up the event loop and
+        every other session served on it.
+        :param request_type: The type of service to route the request to.
+        :param data: Optional data the service needs.
+        :return: Response from the service.
+        """
+        return await asyncio.to_thread(self._backend.process_request, request_type, data)
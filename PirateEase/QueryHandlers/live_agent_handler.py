@@ -25,15 +25,17 @@ class LiveAgentHandler(QueryHandler):
     QueryHandler for people requesting a live agent.
     """
 
-    def handle(self, query=None) -> str:
+    def handle(self, query=None, urgent: bool = False) -> str:
         """
         Dynamically generates a response to the agent request and tells the backend to connect the user
         with a live agent.
         :param query: Doesn't matter
+        :param urgent: True if the user is upset, which puts them ahead of the line for an agent.
         :return: Dynamically generated response and agent connection string.
         """
-        LiveAgentNotifier.notify_agents(self._session.state)
+        LiveAgentNotifier.notify_agents(self._session.history)  # Runs in the background
 
         chat_response: str = f'PirateEase: {ResponseFactory.get_response("live_agent")}'
-        agent_connection_response: str = self._backend.process_request('agent')
+        agent_connection_response: str = \
+            self._backend.process_request('agent', 'urgent') if urgent else self._backend.process_request('agent')
         return chat_response + '\n' + agent_connection_response
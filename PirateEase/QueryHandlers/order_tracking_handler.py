@@ -1,6 +1,6 @@
 from PirateEase.QueryHandlers.abc_handler import QueryHandler
+from PirateEase.Utils.backend_manager import DegradedResponse
 from PirateEase.Utils.response_factory import ResponseFactory
-from PirateEase.Utils.slow_print import slow_print
 from PirateEase.Utils.user_interface import UserInterface
 
 """
@@ -38,12 +38,45 @@ class OrderTrackingHandler(QueryHandler):
         order_id: str = UserInterface.get_order_id('order_id')
         response = self._backend.process_request('order', order_id)
         while not response:
-            not_found_response: str = 'PirateEase: ' + ResponseFactory.get_response('order_not_found').format(order_id=order_id)
-            self._session.append_history(not_found_response)
-            slow_print(not_found_response)
+            UserInterface.say(self.__not_found(order_id))
             order_id = UserInterface.get_order_id('order_id')
             response = self._backend.process_request('order', order_id)
+        self.__remember(order_id, response)
+        return response
+
+    async def handle_async(self, query: str) -> str:
+        """
+        Async version of handle that awaits the user's order ID and the backend instead of blocking on them.
+        :param query: Doesn't matter
+        :return: Response about the status of the order from the backend.
+        """
+        if 'order_id' in self._session:
+            order_id: str = self._session.get('order_id')
+            return await self._process_request_async('order', order_id)
 
-        self._session.set('order_id', order_id)
+        order_id: str = await UserInterface.get_order_id_async('order_id')
+        response = await self._process_request_async('order', order_id)
+        while not response:
+            await UserInterface.say_async(self.__not_found(order_id))
+            order_id = await UserInterface.get_order_id_async('order_id')
+            response = await self._process_request_async('order', order_id)
+        self.__remember(order_id, response)
         return response
 
+    @staticmethod
+    def __not_found(order_id: str) -> str:
+        """
+        :param order_id: The order ID the backend did not find.
+        :return: Message telling the user so.
+        """
+        return 'PirateEase: ' + ResponseFactory.get_response('order_not_found').format(order_id=order_id)
+
+    def __remember(self, order_id: str, response) -> None:
+        """
+        Stores the order ID for follow-up questions, unless the backend was degraded.
+        :param order_id: The order ID the backend answered for.
+        :param response: Its response.
+        :return: None
+        """
+        if not isinstance(response, DegradedResponse):  # Else keep nothing, the user can try again later
+            self._session.set('order_id', order_id)
@@ -33,3 +33,13 @@ class ProductAvailabilityHandler(QueryHandler):
         item_name: str = UserInterface.get_item_name()
         self._session.set('item_name', item_name)
         return self._backend.process_request('inventory', item_name)
+
+    async def handle_async(self, query) -> str:
+        """
+        Async version of handle that awaits the item name and the backend instead of blocking on them.
+        :param query: Doesn't matter
+        :return: Response from the backend with information about the product.
+        """
+        item_name: str = await UserInterface.get_item_name_async()
+        self._session.set('item_name', item_name)
+        return await self._process_request_async('inventory', item_name)
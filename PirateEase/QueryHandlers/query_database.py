@@ -1,42 +1,157 @@
-import json
+from typing import Callable, TypeVar
 
 from PirateEase.QueryHandlers.abc_handler import QueryHandler
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.hot_reload import HotReloader, Reloadable
+from PirateEase.Utils.tfidf_index import TfidfIndex
+from PirateEase.Utils.trigram_index import TrigramIndex, normalize
 
 """
 OOP Principles
-- Encapsulation: Manages the query-response mapping internally and exposes only the handle() method.
+- Encapsulation: Manages the query-response mapping and its indexes internally and exposes only the handle() method.
 - Abstraction: Consumers don’t need to know how data is stored or matched—only that a response is returned.
 - Inheritance: Inherits from QueryHandler, allowing polymorphic behavior in a handler chain.
 
 Behavioral Pattern
 - Chain of Responsibility: Acts as one handler in a chain, returning a response for known queries or deferring to others.
+- Strategy: Queries that do not match exactly go to either a trigram index or a TF-IDF index.
+
+Structural Pattern
+- Proxy: The current FaqVersion is read through a Reloadable, so queries.json can change while it is serving.
 
 SOLID Principles
-- Single Responsibility: Handles one thing—looking up and returning predefined responses.
+- Single Responsibility: Handles one thing—looking up and returning predefined responses. Fuzzy matching lives in
+                         TrigramIndex and TfidfIndex.
 - Open/Closed: Can load new queries via the JSON file or override handle() in a subclass without modifying base logic.
 - Liskov Substitution: Can substitute any other QueryHandler without breaking the system.
 - Interface Segregation: Only implements the required handle() method from QueryHandler.
 """
 
+QUERIES: str = 'Databases/queries.json'
+
+T = TypeVar('T')
+
+
+class FaqVersion:
+    """
+    One version of the predefined queries and everything matched against them. Indexes are built on first use, or
+    up front when the version replaces one that is already serving.
+    """
+
+    def __init__(self, queries: dict[str, str]):
+        """
+        :param queries: Predefined query -> response.
+        """
+        self.queries: dict[str, str] = queries
+        # Normalized query -> response, so punctuation, spacing, and apostrophes do not matter. Built on first use.
+        self.__normalized: dict[str, str] | None = None
+        # Built on the first query that does not match exactly
+        self.__fuzzy: TrigramIndex | None = None
+        self.__tfidf: TfidfIndex | None = None
+
+    @property
+    def normalized(self) -> dict[str, str]:
+        """
+        :return: Normalized predefined query -> response.
+        """
+        if self.__normalized is None:
+            self.__normalized = {normalize(question): answer for question, answer in self.queries.items()}
+        return self.__normalized
+
+    def index(self, retrieval: str) -> TrigramIndex | TfidfIndex:
+        """
+        Gets the index of normalized queries for a retrieval mode, building it if this is its first use.
+        :param retrieval: 'trigram' or 'tfidf'.
+        :return: The index.
+        """
+        if retrieval == 'tfidf':
+            if self.__tfidf is None:
+                self.__tfidf = self.__derive('faq_tfidf', lambda: TfidfIndex(
+                    (question, question) for question in self.normalized))
+            return self.__tfidf
+        if self.__fuzzy is None:
+            self.__fuzzy = self.__derive('faq_trigrams', lambda: TrigramIndex(
+                (question, question) for question in self.normalized))
+        return self.__fuzzy
+
+    def __derive(self, name: str, build: Callable[[], T]) -> T:
+        """
+        Builds an index, through its snapshot only while this version is still what queries.json holds.
+        :param name: Name of the index's snapshot.
+        :param build: Builds the index.
+        :return: The index.
+        """
+        if DataLoader.identity(QUERIES) is None or DataLoader.load(QUERIES) is not self.queries:
+            return build()  # No file to snapshot, or it changed since this version was parsed
+        return DataLoader.derive(name, (QUERIES,), build)
+
 
 class QueryDatabase(QueryHandler):
     """
-    QueryHandler for predefined query/responses.
+    QueryHandler for predefined query/responses. queries.json is reloaded in the background when it changes.
     """
+    # How queries that do not match exactly are matched: 'trigram' catches typos and small edits, 'tfidf' also
+    # catches paraphrases that reuse the same words
+    retrieval: str = 'trigram'
+    # Lowest trigram similarity at which a query counts as asking a predefined question
+    similarity: float = 0.6
+    # Lowest TF-IDF cosine similarity at which a query counts as asking a predefined question
+    tfidf_similarity: float = 0.55
+
     def __init__(self) -> None:
         super().__init__()
         # Load the DB of predefined query and responses
-        with open('Databases/queries.json', 'r', encoding='utf-8') as f:
-            self.queries: dict[str, str] = json.load(f)
+        self.__faq: Reloadable[FaqVersion] = HotReloader.watch((QUERIES,), self.__rebuild,
+                                                               current=FaqVersion(DataLoader.load(QUERIES)))
+
+    @property
+    def queries(self) -> dict[str, str]:
+        """
+        :return: The predefined queries currently being served.
+        """
+        return self.__faq.current.queries
+
+    def __rebuild(self) -> FaqVersion:
+        """
+        Builds a version from the changed queries.json, with the index it will need, before it starts serving.
+        :return: The new version.
+        """
+        faq: FaqVersion = FaqVersion(DataLoader.load(QUERIES))
+        faq.index(self.retrieval)
+        return faq
 
     def handle(self, query: str)  -> str:
         """
-        Matches the given query against a database of predefined queries and returns the result if it exists.
+        Matches the given query against a database of predefined queries and returns the result if it exists. Tries
+        an exact match after normalizing, then the most similar predefined query.
         :param query: The query to match.
         :return: Matching response or empty string.
         """
-        response: str = self.queries.get(query.lower())
-        if response is not None:
-            return response
-        else:
-            return ''
\ No newline at end of file
+        return self.handle_many([query])[0]
+
+    def handle_many(self, queries: list[str]) -> list[str]:
+        """
+        Matches many queries at once. In TF-IDF mode every query that does not match exactly is scored in a single
+        sparse matrix product.
+        :param queries: The queries to match.
+        :return: Matching response or empty string for each query, in the same order.
+        """
+        faq: FaqVersion = self.__faq.current  # Answer every query from the same version
+        keys: list[str] = [normalize(query) for query in queries]
+        responses: list[str | None] = [faq.normalized.get(key) for key in keys]
+        misses: list[int] = [position for position, response in enumerate(responses) if response is None]
+        if misses:
+            for position, match in zip(misses, self.__nearest(faq, [keys[position] for position in misses])):
+                responses[position] = faq.normalized[match[0]] if match is not None else ''
+        return responses
+
+    def __nearest(self, faq: FaqVersion, keys: list[str]) -> list[tuple[str, float] | None]:
+        """
+        Finds the predefined query closest to each normalized query with the configured retrieval.
+        :param faq: The version to search.
+        :param keys: Normalized queries.
+        :return: For each query, the closest normalized predefined query and its similarity, or None.
+        """
+        if self.retrieval == 'tfidf':
+            return faq.index('tfidf').search_many(keys, self.tfidf_similarity)
+        return [faq.index('trigram').nearest(key, self.similarity) for key in keys]
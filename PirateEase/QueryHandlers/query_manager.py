@@ -1,11 +1,7 @@
+import importlib, threading
+from typing import Callable
+
 from PirateEase.QueryHandlers.abc_handler import QueryHandler
-from PirateEase.QueryHandlers.default_handler import DefaultHandler
-from PirateEase.QueryHandlers.exit_handler import ExitHandler
-from PirateEase.QueryHandlers.live_agent_handler import LiveAgentHandler
-from PirateEase.QueryHandlers.order_tracking_handler import OrderTrackingHandler
-from PirateEase.QueryHandlers.product_availability_handler import ProductAvailabilityHandler
-from PirateEase.QueryHandlers.refund_handler import RefundHandler
-from PirateEase.QueryHandlers.query_database import QueryDatabase
 
 """
 OOP Principles
@@ -15,10 +11,12 @@ OOP Principles
 
 Creational Pattern
 - Factory Pattern: Dynamically returns the correct handler based on the input query type, decoupling instantiation from usage.
+- Lazy Initialization: A handler's module is only imported and the handler only built the first time its query type is
+                       asked for, so a conversation never pays for services it does not use.
 
 SOLID Principles
 - Single Responsibility: Manages the creation and lookup of handlers only—does not handle query execution.
-- Open/Closed: New handlers can be added to the dictionary without modifying the rest of the logic.
+- Open/Closed: New handlers can be registered without modifying the rest of the logic.
 - Liskov Substitution: All handlers returned implement the QueryHandler interface, ensuring substitutability.
 - Interface Segregation: Returns objects that conform to a clean, minimal interface.
 """
@@ -27,21 +25,60 @@ class QueryManager:
     """
     Dynamically retrieves QueryHandlers based on the type
     """
+    # Query type -> dotted path of its handler class, or a callable that builds the handler
+    registry: dict[str, str | Callable[[], QueryHandler]] = {
+        "order": "PirateEase.QueryHandlers.order_tracking_handler.OrderTrackingHandler",
+        "refund": "PirateEase.QueryHandlers.refund_handler.RefundHandler",
+        "inventory": "PirateEase.QueryHandlers.product_availability_handler.ProductAvailabilityHandler",
+        "live_agent": "PirateEase.QueryHandlers.live_agent_handler.LiveAgentHandler",
+        "exit": "PirateEase.QueryHandlers.exit_handler.ExitHandler",
+        "db": "PirateEase.QueryHandlers.query_database.QueryDatabase",
+        "unknown": "PirateEase.QueryHandlers.default_handler.DefaultHandler"
+    }
+
     def __init__(self):
-        self.handlers: dict[str, QueryHandler] = {
-            "order": OrderTrackingHandler(),
-            "refund": RefundHandler(),
-            "inventory": ProductAvailabilityHandler(),
-            "live_agent": LiveAgentHandler(),
-            "exit": ExitHandler(),
-            "db": QueryDatabase(),
-            "unknown": DefaultHandler()
-        }
+        # Handlers built so far
+        self.handlers: dict[str, QueryHandler] = {}
+        self.__lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def register(cls, query_type: str, factory: str | Callable[[], QueryHandler]) -> None:
+        """
+        Registers the handler for a query type. Managers build it the first time the type is asked for.
+        :param query_type: The type of query the handler answers.
+        :param factory: Dotted path of the handler class, or a callable that builds the handler.
+        :return: None
+        """
+        cls.registry = {**cls.registry, query_type.lower(): factory}
 
     def get_handler(self, query_type: str) -> QueryHandler:
         """
-        Retrieves the handler corresponding to the given query_type
+        Retrieves the handler corresponding to the given query_type, building it on first use.
         :param query_type: The type of query you need a handler for.
-        :return: QueryHandler matching the given query_type
+        :return: QueryHandler matching the given query_type, or None if no handler is registered for it.
+        """
+        query_type = query_type.lower()
+        handler: QueryHandler | None = self.handlers.get(query_type)
+        if handler is not None:  # Already built
+            return handler
+        factory: str | Callable[[], QueryHandler] | None = self.registry.get(query_type)
+        if factory is None:  # Nothing handles this type
+            return None
+        with self.__lock:  # Only build each handler once, even if two threads ask at the same time
+            handler = self.handlers.get(query_type)
+            if handler is None:
+                handler = self.__resolve(factory)()
+                self.handlers[query_type] = handler
+        return handler
+
+    @staticmethod
+    def __resolve(factory: str | Callable[[], QueryHandler]) -> Callable[[], QueryHandler]:
+        """
+        Imports a handler class from its dotted path, or returns the callable as is.
+        :param factory: Dotted path or callable.
+        :return: Something that builds the handler when called.
         """
-        return self.handlers.get(query_type.lower())
\ No newline at end of file
+        if not isinstance(factory, str):
+            return factory
+        module, _, name = factory.rpartition('.')
+        return getattr(importlib.import_module(module), name)
@@ -1,6 +1,6 @@
 from PirateEase.QueryHandlers.abc_handler import QueryHandler
+from PirateEase.Utils.backend_manager import DegradedResponse
 from PirateEase.Utils.response_factory import ResponseFactory
-from PirateEase.Utils.slow_print import slow_print
 from PirateEase.Utils.user_interface import UserInterface
 
 """
@@ -33,19 +33,52 @@ class RefundHandler(QueryHandler):
         :param query: Doesn't matter
         :return: Final response indicating if the order was refunded or not.
         """
-        refund_id: str = ''
         if 'refund_id' in self._session:
-            refund_id = self._session.get('refund_id')
-            return self._backend.process_request('refund_id', refund_id)
-        else:
+            return self._backend.process_request('refund_id', self._session.get('refund_id'))
+        refund_id: str = UserInterface.get_order_id('refund_id')
+        response = self._backend.process_request('refund', refund_id)
+        while not response:
+            UserInterface.say(self.__not_found(refund_id))
             refund_id = UserInterface.get_order_id('refund_id')
             response = self._backend.process_request('refund', refund_id)
-            while not response:
-                not_found_response: str = 'PirateEase: ' + ResponseFactory.get_response('order_not_found').format(order_id=refund_id)
-                self._session.append_history(not_found_response)
-                slow_print(not_found_response)
-                refund_id = UserInterface.get_order_id('refund_id')
-                response = self._backend.process_request('refund', refund_id)
-            self._session.set('refund_id', refund_id)
+        if self.__remember(refund_id, response):
             UserInterface.get_refund_reason()
-            return response
+        return response
+
+    async def handle_async(self, query: str) -> str:
+        """
+        Async version of handle that awaits the refund_id, the reason, and the backend instead of blocking on them.
+        :param query: Doesn't matter
+        :return: Final response indicating if the order was refunded or not.
+        """
+        if 'refund_id' in self._session:
+            return await self._process_request_async('refund_id', self._session.get('refund_id'))
+        refund_id: str = await UserInterface.get_order_id_async('refund_id')
+        response = await self._process_request_async('refund', refund_id)
+        while not response:
+            await UserInterface.say_async(self.__not_found(refund_id))
+            refund_id = await UserInterface.get_order_id_async('refund_id')
+            response = await self._process_request_async('refund', refund_id)
+        if self.__remember(refund_id, response):
+            await UserInterface.get_refund_reason_async()
+        return response
+
+    @staticmethod
+    def __not_found(refund_id: str) -> str:
+        """
+        :param refund_id: The order ID the backend did not find.
+        :return: Message telling the user so.
+        """
+        return 'PirateEase: ' + ResponseFactory.get_response('order_not_found').format(order_id=refund_id)
+
+    def __remember(self, refund_id: str, response) -> bool:
+        """
+        Stores the refunded order's ID for follow-up questions, unless the backend was degraded.
+        :param refund_id: The order ID the backend answered for.
+        :param response: Its response.
+        :return: True if it was stored and the refund reason should be asked.
+        """
+        if isinstance(response, DegradedResponse):  # Keep nothing, the user can try again later
+            return False
+        self._session.set('refund_id', refund_id)
+        return True
@@ -0,0 +1,128 @@
+import random
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+"""
+OOP Principles
+- Encapsulation: How free agents are stored is private to each pool.
+- Abstraction: LiveAgentService checks agents out and back in without knowing how the next one is picked.
+- Inheritance: RandomAgentPool and LRUAgentPool inherit from AgentPool.
+- Polymorphism: Either pool can be used wherever an AgentPool is expected.
+
+Behavioral Pattern
+- Strategy: Each pool is a strategy for choosing which free agent takes the next escalation.
+
+SOLID Principles
+- Single Responsibility: A pool only tracks which agents are free.
+- Open/Closed: New selection policies are new subclasses.
+- Liskov Substitution: Every pool can stand in for AgentPool.
+- Interface Segregation: Exposes add, remove, and checkout.
+"""
+
+
+class AgentPool(ABC):
+    """
+    Abstract set of free agents with constant time check out and check in. Not thread-safe on its own.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __contains__(self, agent) -> bool:
+        pass
+
+    @abstractmethod
+    def add(self, agent) -> None:
+        """
+        Puts a free agent in the pool. Adding an agent already in the pool does nothing.
+        :param agent: The agent.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, agent) -> None:
+        """
+        Takes a specific agent out of the pool if they are in it, e.g. when they clock out.
+        :param agent: The agent.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def checkout(self):
+        """
+        Takes the next agent out of the pool.
+        :return: The agent, or None if the pool is empty.
+        """
+        pass
+
+
+class RandomAgentPool(AgentPool):
+    """
+    Hands out a random free agent. Agents sit in a list with their positions indexed, so any agent can leave by
+    swapping with the last one and popping.
+    """
+
+    def __init__(self, rng: random.Random | None = None):
+        """
+        :param rng: Source of randomness, the random module by default.
+        """
+        self.__rng = rng if rng is not None else random
+        self.__agents: list = []
+        self.__positions: dict = {}  # agent -> index in __agents
+
+    def __len__(self) -> int:
+        return len(self.__agents)
+
+    def __contains__(self, agent) -> bool:
+        return agent in self.__positions
+
+    def add(self, agent) -> None:
+        if agent not in self.__positions:
+            self.__positions[agent] = len(self.__agents)
+            self.__agents.append(agent)
+
+    def remove(self, agent) -> None:
+        index: int | None = self.__positions.pop(agent, None)
+        if index is None:
+            return
+        last = self.__agents.pop()
+        if last is not agent:  # Fill the hole with the last agent
+            self.__agents[index] = last
+            self.__positions[last] = index
+
+    def checkout(self):
+        if not self.__agents:
+            return None
+        agent = self.__agents[self.__rng.randrange(len(self.__agents))]
+        self.remove(agent)
+        return agent
+
+
+class LRUAgentPool(AgentPool):
+    """
+    Hands out the agent who has been free the longest, which spreads escalations evenly across the crew.
+    """
+
+    def __init__(self):
+        self.__agents: OrderedDict = OrderedDict()  # Oldest free agent first
+
+    def __len__(self) -> int:
+        return len(self.__agents)
+
+    def __contains__(self, agent) -> bool:
+        return agent in self.__agents
+
+    def add(self, agent) -> None:
+        self.__agents.setdefault(agent, None)
+
+    def remove(self, agent) -> None:
+        self.__agents.pop(agent, None)
+
+    def checkout(self):
+        if not self.__agents:
+            return None
+        return self.__agents.popitem(last=False)[0]
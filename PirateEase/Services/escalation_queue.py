@@ -0,0 +1,98 @@
+import heapq, itertools, time
+from typing import Callable
+
+"""
+OOP Principles
+- Encapsulation: The heap and its stale entries are private, callers only push, pop, and remove escalations.
+- Abstraction: LiveAgentService asks for the next session to serve without knowing how sessions are ordered.
+
+Behavioral Pattern
+- Strategy: The clock is injected, so tests and simulations can drive wait times.
+
+SOLID Principles
+- Single Responsibility: Only orders waiting escalations by priority and then by how long they have waited.
+- Open/Closed: New priority levels are just new integers, nothing here changes.
+- Interface Segregation: Exposes push, pop, remove, and position.
+"""
+
+# Priorities, lower is served first
+URGENT: int = 0  # Negative sentiment
+NORMAL: int = 1  # Asked for an agent
+
+
+class EscalationQueue:
+    """
+    Priority queue of escalations. More urgent escalations are served first, and escalations of equal priority are
+    served in the order they started waiting. Removed or re-prioritized entries are skipped lazily when popped.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        :param clock: Returns the current time in seconds.
+        """
+        self.__clock: Callable[[], float] = clock
+        self.__heap: list[tuple[int, float, int, object]] = []
+        self.__entries: dict[object, tuple[int, float, int, object]] = {}  # escalation -> its live heap entry
+        self.__sequence = itertools.count()  # Breaks ties between escalations queued at the same instant
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, escalation) -> bool:
+        return escalation in self.__entries
+
+    def push(self, escalation, priority: int = NORMAL) -> None:
+        """
+        Queues an escalation. Pushing one that is already queued changes its priority but keeps its waiting time.
+        :param escalation: The escalation.
+        :param priority: URGENT, NORMAL, or any other integer, lower is served first.
+        :return: None
+        """
+        old: tuple | None = self.__entries.get(escalation)
+        queued_at: float = old[1] if old is not None else self.__clock()
+        entry: tuple[int, float, int, object] = (priority, queued_at, next(self.__sequence), escalation)
+        self.__entries[escalation] = entry
+        heapq.heappush(self.__heap, entry)
+
+    def pop(self):
+        """
+        Takes the escalation that should be served next.
+        :return: The escalation, or None if nobody is waiting.
+        """
+        while self.__heap:
+            entry: tuple = heapq.heappop(self.__heap)
+            if self.__entries.get(entry[3]) is entry:  # Skip entries that were removed or re-prioritized
+                del self.__entries[entry[3]]
+                return entry[3]
+        return None
+
+    def remove(self, escalation) -> None:
+        """
+        Takes an escalation out of the queue if it is in it.
+        :param escalation: The escalation.
+        :return: None
+        """
+        self.__entries.pop(escalation, None)
+        if len(self.__heap) > 2 * len(self.__entries) + 16:  # Mostly stale, rebuild
+            self.__heap = list(self.__entries.values())
+            heapq.heapify(self.__heap)
+
+    def position(self, escalation) -> int:
+        """
+        Gets an escalation's place in line.
+        :param escalation: The escalation.
+        :return: 1 for the next escalation to be served, 0 if it is not queued.
+        """
+        entry: tuple | None = self.__entries.get(escalation)
+        if entry is None:
+            return 0
+        return 1 + sum(other[:3] < entry[:3] for other in self.__entries.values())
+
+    def waited(self, escalation) -> float:
+        """
+        Gets how long an escalation has been waiting.
+        :param escalation: The escalation.
+        :return: Seconds since it was first queued, 0 if it is not queued.
+        """
+        entry: tuple | None = self.__entries.get(escalation)
+        return self.__clock() - entry[1] if entry is not None else 0.0
@@ -0,0 +1,199 @@
+import re
+from collections import Counter, defaultdict
+
+"""
+OOP Principles
+- Encapsulation: Posting lists and per-product keys are private and only change through add and remove.
+- Abstraction: search hides how candidates are gathered and ranked.
+
+SOLID Principles
+- Single Responsibility: Only finds and ranks products for an item description. It knows nothing about stock or prices.
+- Open/Closed: Ranking weights are class attributes, so a subclass can tune them without touching the index.
+- Interface Segregation: Exposes add, remove, matches, and search.
+"""
+
+# Word tokens for token postings
+_TOKEN: re.Pattern = re.compile(r"[a-z0-9]+(?:['’-][a-z0-9]+)*")
+
+# Longest n-gram indexed for substring lookups
+GRAM: int = 3
+
+
+def _tokens(text: str) -> set[str]:
+    return set(_TOKEN.findall(text))
+
+
+def _grams(text: str, n: int) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class InventoryIndex:
+    """
+    Inverted index from tokens and n-grams of product names, synonyms, and tags to product ids.
+    """
+    # Ranking weights
+    EXACT_NAME: float = 100.0
+    NAME_CONTAINS_ITEM: float = 50.0
+    ITEM_CONTAINS_SYNONYM: float = 40.0
+    SHARED_TOKEN: float = 5.0
+    SHARED_TAG: float = 2.0
+    # Words on more products than this are too common to gather candidates with, they only add to the score
+    COMMON_WORD: int = 1000
+
+    def __init__(self):
+        # n-gram (n <= GRAM) of a name -> ids, answers "is the item a substring of the name"
+        self.__name_grams: dict[str, set[int]] = defaultdict(set)
+        # Rarest n-gram of a synonym -> ids, answers "is a synonym a substring of the item"
+        self.__synonym_grams: dict[str, set[int]] = defaultdict(set)
+        # n-gram -> number of synonyms containing it, to pick rare synonym keys
+        self.__synonym_gram_counts: Counter[str] = Counter()
+        # Word token of a name, synonym, or tag -> ids, for ranked partial matches
+        self.__tokens: dict[str, set[int]] = defaultdict(set)
+        # id -> (name, synonyms, synonym keys, name and synonym tokens, tag tokens)
+        self.__entries: dict[int, tuple[str, tuple[str, ...], frozenset[str], frozenset[str], frozenset[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self.__entries
+
+    def add(self, product_id: int, name: str, synonyms: list[str], tags: list[str]) -> None:
+        """
+        Indexes a product, replacing whatever was indexed under its id before.
+        :param product_id: Id the product will be returned as.
+        :param name: The product's name.
+        :param synonyms: The product's synonyms.
+        :param tags: The product's tags.
+        :return: None
+        """
+        self.remove(product_id)
+        name = name.lower()
+        synonyms: tuple[str, ...] = tuple(s.lower() for s in synonyms)
+        words: frozenset[str] = frozenset(_tokens(name).union(*map(_tokens, synonyms)))
+        tag_words: frozenset[str] = frozenset().union(*(_tokens(t.lower()) for t in tags))
+        for gram in self.__name_keys(name):
+            self.__name_grams[gram].add(product_id)
+        for synonym in synonyms:
+            self.__synonym_gram_counts.update(_grams(synonym, GRAM))
+        synonym_keys: frozenset[str] = frozenset(map(self.__synonym_key, synonyms))
+        for key in synonym_keys:
+            self.__synonym_grams[key].add(product_id)
+        self.__entries[product_id] = (name, synonyms, synonym_keys, words, tag_words)
+        for word in words | tag_words:
+            self.__tokens[word].add(product_id)
+
+    def remove(self, product_id: int) -> None:
+        """
+        Removes a product from the index if it is there.
+        :param product_id: Id of the product to remove.
+        :return: None
+        """
+        entry = self.__entries.pop(product_id, None)
+        if entry is None:
+            return
+        name, synonyms, synonym_keys, words, tag_words = entry
+        for synonym in synonyms:
+            for gram in _grams(synonym, GRAM):
+                self.__synonym_gram_counts[gram] -= 1
+                if not self.__synonym_gram_counts[gram]:
+                    del self.__synonym_gram_counts[gram]
+        self.__discard(self.__name_grams, self.__name_keys(name), product_id)
+        self.__discard(self.__synonym_grams, synonym_keys, product_id)
+        self.__discard(self.__tokens, words | tag_words, product_id)
+
+    def matches(self, item: str) -> list[int]:
+        """
+        Finds every product the item strictly matches, i.e. the item is in its name or one of its synonyms is in the
+        item, best first.
+        :param item: Lowercase item description.
+        :return: Ids of strictly matching products, best first.
+        """
+        return [product_id for product_id, _, strict in self.__ranked(item) if strict]
+
+    def search(self, item: str, limit: int = 10) -> list[int]:
+        """
+        Ranks products against an item description, including looser matches on shared words and tags.
+        :param item: Item description.
+        :param limit: Maximum number of ids to return.
+        :return: Ids of the best matching products, best first.
+        """
+        return [product_id for product_id, _, _ in self.__ranked(item.lower())[:limit]]
+
+    def __ranked(self, item: str) -> list[tuple[int, float, bool]]:
+        """
+        Scores every candidate sharing a key with the item.
+        :param item: Lowercase item description.
+        :return: (id, score, strict match) triples sorted best first, ties broken by id.
+        """
+        item_words: set[str] = _tokens(item)
+        candidates: set[int] = self.__names_containing(item) | self.__synonym_candidates(item)
+        for word in item_words:
+            ids: set[int] = self.__tokens.get(word, set())
+            if len(ids) <= self.COMMON_WORD:
+                candidates |= ids
+
+        ranked: list[tuple[int, float, bool]] = []
+        for product_id in candidates:
+            name, synonyms, _, words, tag_words = self.__entries[product_id]
+            score: float = 0.0
+            if item == name:
+                score += self.EXACT_NAME
+            if item in name:
+                score += self.NAME_CONTAINS_ITEM + (10 * len(item) / len(name) if name else 0)
+            longest: int = max((len(s) for s in synonyms if s in item), default=-1)
+            if longest >= 0:
+                score += self.ITEM_CONTAINS_SYNONYM + (10 * longest / len(item) if item else 0)
+            strict: bool = score > 0  # Everything so far is a strict match
+            score += self.SHARED_TOKEN * len(item_words & words) + self.SHARED_TAG * len(item_words & tag_words)
+            if score:
+                ranked.append((product_id, score, strict))
+        ranked.sort(key=lambda triple: (-triple[1], triple[0]))
+        return ranked
+
+    def __names_containing(self, item: str) -> set[int]:
+        """
+        Ids of products whose name contains the item, found by intersecting n-gram postings rarest first.
+        """
+        if not item:
+            return set(self.__entries)
+        postings: list[set[int]] = [self.__name_grams.get(g, set()) for g in _grams(item, min(GRAM, len(item)))]
+        postings.sort(key=len)
+        found: set[int] = set(postings[0])
+        for posting in postings[1:]:
+            if not found:
+                break
+            found &= posting
+        return {product_id for product_id in found if item in self.__entries[product_id][0]}
+
+    def __synonym_candidates(self, item: str) -> set[int]:
+        """
+        Ids of products with a synonym that could be inside the item, found by the synonym's key n-gram.
+        """
+        found: set[int] = set(self.__synonym_grams.get('', set()))  # An empty synonym is in everything
+        for n in range(1, GRAM + 1):  # Short synonyms are their own key
+            for gram in _grams(item, n):
+                found |= self.__synonym_grams.get(gram, set())
+        return found
+
+    def __synonym_key(self, synonym: str) -> str:
+        """
+        Picks the n-gram a synonym is filed under. Any n-gram of it will do since all of them must be in a matching
+        item, so the one in the fewest synonyms keeps candidate lists short.
+        """
+        if len(synonym) <= GRAM:
+            return synonym
+        return min(sorted(_grams(synonym, GRAM)), key=self.__synonym_gram_counts.__getitem__)
+
+    @staticmethod
+    def __name_keys(name: str) -> set[str]:
+        return set().union(*(_grams(name, n) for n in range(1, GRAM + 1)))
+
+    @staticmethod
+    def __discard(postings: dict[str, set[int]], keys, product_id: int) -> None:
+        for key in keys:
+            ids: set[int] | None = postings.get(key)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del postings[key]
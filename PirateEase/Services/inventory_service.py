@@ -1,5 +1,9 @@
-import json
+from collections.abc import Mapping
 
+from PirateEase.Services.inventory_index import InventoryIndex
+from PirateEase.Services.inventory_store import InventoryProduct, InventoryStore, ProductView
+from PirateEase.Services.transport import HTTPTransport, RemoteMapping
+from PirateEase.Utils.data_loader import DataLoader
 from PirateEase.Utils.response_factory import ResponseFactory
 from PirateEase.Utils.singleton import Singleton
 
@@ -8,80 +12,155 @@ OOP Principles
 - Encapsulation: InventoryProduct encapsulates all the details of a product while InventoryService hides the inventory 
                  data and logic that operates on it.
 - Abstraction: The client interacts with check_availability w/o needing to know how the products are stored or matched.
-- Composition: InventoryService is composed of InventoryProduct instances which allows for separation of concerns.
+- Composition: InventoryService is composed of an InventoryStore and an InventoryIndex which allows for separation of
+               concerns.
 - Inheritance: InventoryService inherits from Singleton
 
 Creational Pattern
 - Singleton: Ensures centralized management of inventory and that any changes are reflected across the whole system.
 
 SOLID Principles
-- Single Responsibility: Inventory Product only models a product and performs matching on itself.
-                         InventoryService only loads and checks inventory.
+- Single Responsibility: InventoryService only loads and checks inventory. InventoryStore only stores products and
+                         InventoryIndex only finds them.
 - Open/Close: Can add more product matching techniques by extension or polymorphism
 - Liskov Substitution: Both classes can be subclassed w/o breaking core functionality
 - Interface Segregation: Each class exposes only necessary and relevant methods.
 """
 
-
-class InventoryProduct:
-    """
-    Represents a product in the inventory with a name, quantity, price, list of synonyms, and list of tags.
-    """
-
-    def __init__(self, name: str, quantity: int, price: float, synonyms: list[str], tags: list[str]):
-        self.name: str = name
-        self.quantity: int = quantity
-        self.price: float = price
-        self.synonyms: list[str] = synonyms
-        self.tags: list[str] = tags
-
-    def item_matches_product(self, item: str) -> bool:
-        """
-        Determine if a given item description matches this product.
-        :param item: Item description.
-        :return: True if the name or any synonym of this product is a substring of the item, False otherwise.
-        """
-        return item in self.name or any(synonym in item for synonym in self.synonyms)
+INVENTORY: str = 'Databases/inventory.json'
 
 
 class InventoryService(Singleton):
     """
     Singleton class for managing inventory products.
     """
+    # Base URL of a remote inventory system serving GET /inventory and /inventory/<name>, e.g. stub_backend_server.py.
+    # Products are indexed from it at startup and their stock and price are read from it on every check if set.
+    url: str | None = None
 
     def __init__(self):
         """
-        If not already initialized, loads the current inventory from a database and stores it as a list.
+        If not already initialized, loads the current inventory from a database into a column store.
         """
         if self._initialized:
             return
 
-        with open('Databases/inventory.json', 'r', encoding='utf-8') as f:
-            raw_products: list[dict] = json.load(f)
-        self.__products: list[InventoryProduct] = [
-            InventoryProduct(
+        # Parsed once and not kept, the store is the inventory from here on
+        raw_products: list[dict]
+        self.__remote: Mapping[str, dict] | None = None  # Name -> live record, if the inventory is remote
+        if self.url:
+            transport: HTTPTransport = HTTPTransport(self.url)
+            raw_products = transport.get_json('/inventory') or []
+            self.__remote = RemoteMapping(transport, '/inventory', lambda name, record: record)
+        else:
+            raw_products = DataLoader.load(INVENTORY, cache=False)
+        # Product ids are rows in the store, removed products leave an empty row behind so ids stay stable
+        self.__store: InventoryStore = InventoryStore()
+        self.__ids: dict[str, int] = {}  # Name -> id
+        self.__index: InventoryIndex = InventoryIndex()
+        for item in raw_products:
+            self.add_product(InventoryProduct(
                 name=item["name"],
                 quantity=item["quantity"],
                 price=item["price"],
                 synonyms=item.get("synonyms", []),
                 tags=item.get("tags", [])
-            )
-            for item in raw_products
-        ]
+            ))
 
         self._initialized = True
 
+    def add_product(self, product: InventoryProduct) -> None:
+        """
+        Adds a product to the inventory and index. A product with the same name is replaced.
+        :param product: The product to add.
+        :return: None
+        """
+        product_id: int | None = self.__ids.get(product.name)
+        if product_id is None:
+            product_id = self.__store.append(product)
+            self.__ids[product.name] = product_id
+        else:
+            self.__store.replace(product_id, product)
+        self.__index.add(product_id, product.name, product.synonyms, product.tags)
+
+    def update_product(self, name: str, product: InventoryProduct) -> None:
+        """
+        Replaces the product stored under a name and re-indexes it, e.g. after its name, synonyms, or tags changed.
+        Quantity and price changes need no re-indexing.
+        :param name: The product's current name in the inventory.
+        :param product: The new or changed product.
+        :return: None
+        :raises KeyError: If there is no product with that name.
+        """
+        product_id: int = self.__ids.pop(name)
+        self.__ids[product.name] = product_id
+        self.__store.replace(product_id, product)
+        self.__index.add(product_id, product.name, product.synonyms, product.tags)
+
+    def remove_product(self, name: str) -> InventoryProduct | None:
+        """
+        Removes a product from the inventory and index.
+        :param name: Name of the product to remove.
+        :return: A copy of the removed product, or None if there was no such product.
+        """
+        product_id: int | None = self.__ids.pop(name, None)
+        if product_id is None:
+            return None
+        view: ProductView = self.__store.view(product_id)
+        product: InventoryProduct = InventoryProduct(view.name, view.quantity, view.price, list(view.synonyms),
+                                                     list(view.tags))
+        self.__store.delete(product_id)
+        self.__index.remove(product_id)
+        return product
+
+    def adjust_stock(self, name: str, delta: int) -> bool:
+        """
+        Atomically adds to or takes from a product's stock. Safe to call from many threads at once.
+        :param name: Name of the product.
+        :param delta: Units to add, negative to take.
+        :return: True if the stock changed, False if there was not enough.
+        :raises KeyError: If there is no product with that name.
+        """
+        return self.__store.adjust_quantity(self.__ids[name], delta)
+
     def get_matching_items(self, item: str) -> InventoryProduct or None:
         """
-        Gets the first item that matches the given item description. If no item matches, returns None.
+        Gets the item that best matches the given item description. If no item matches, returns None.
         :param item: Item description to match against.
         :return: InventoryProduct matching description or None.
         """
-        for product in self.__products:  # For each product in our database
-            if product.item_matches_product(item):  # If the product matches the item description
-                return product  # Return it
-        else:  # No products matched
-            return None
+        matches: list[int] = self.__index.matches(item)
+        return self.__store.view(matches[0]) if matches else None
+
+    def search_items(self, item: str, limit: int = 10) -> list[InventoryProduct]:
+        """
+        Ranks products against an item description, including ones that only share a word or tag with it.
+        :param item: Item description to match against.
+        :param limit: Maximum number of products to return.
+        :return: Best matching products, best first.
+        """
+        return [self.__store.view(product_id) for product_id in self.__index.search(item, limit)]
+
+    def out_of_stock(self) -> list[InventoryProduct]:
+        """
+        Gets every product with nothing left in stock.
+        :return: Out of stock products.
+        """
+        return list(map(self.__store.view, self.__store.out_of_stock()))
+
+    def total_value(self) -> float:
+        """
+        Gets the value of everything in stock.
+        :return: Sum of quantity times price over every product.
+        """
+        return self.__store.total_value()
+
+    def value_by_tag(self) -> dict[str, float]:
+        """
+        Gets the value of the stock under each tag.
+        :return: Dictionary mapping each tag to the value of its products in stock.
+        """
+        return self.__store.value_by_tag()
 
     def check_availability(self, item: str) -> str:
         """
@@ -91,6 +170,12 @@ class InventoryService(Singleton):
         """
         # Get the matching product
         product: InventoryProduct = self.get_matching_items(item.lower())
+        if product is not None and self.__remote is not None:  # Stock and price change remotely, read them now
+            record: dict | None = self.__remote.get(product.name)
+            if record is None:  # Removed since startup
+                product = None
+            else:
+                product = InventoryProduct(product.name, record["quantity"], record["price"], [], [])
         if product is not None:  # If a matching product was found
             # Get its name, quantity, and price
             name: str = product.name
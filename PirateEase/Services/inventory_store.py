@@ -0,0 +1,264 @@
+import sys
+from array import array
+from collections import defaultdict
+from itertools import compress
+from operator import gt, mul
+from typing import Iterator
+
+from PirateEase.Utils.keyed_lock import KeyedLock
+
+"""
+OOP Principles
+- Encapsulation: Columns are private to InventoryStore. ProductView only reaches them through the store.
+- Abstraction: ProductView looks like an InventoryProduct, so callers never see the columns behind it.
+- Inheritance: ProductView inherits from InventoryProduct.
+- Polymorphism: A ProductView can be used anywhere an InventoryProduct is expected.
+
+Structural Pattern
+- Flyweight: Names, synonyms, and tags are interned and shared, and views are tiny objects made on demand.
+
+SOLID Principles
+- Single Responsibility: InventoryStore only stores products and computes stock reports over them.
+- Liskov Substitution: ProductView can stand in for InventoryProduct.
+- Interface Segregation: Rows are read and written one column at a time, reports are separate methods.
+"""
+
+
+class InventoryProduct:
+    """
+    Represents a product in the inventory with a name, quantity, price, list of synonyms, and list of tags.
+    """
+    __slots__ = ('name', 'quantity', 'price', 'synonyms', 'tags')
+
+    def __init__(self, name: str, quantity: int, price: float, synonyms: list[str], tags: list[str]):
+        self.name: str = name
+        self.quantity: int = quantity
+        self.price: float = price
+        self.synonyms: list[str] = synonyms
+        self.tags: list[str] = tags
+
+    def item_matches_product(self, item: str) -> bool:
+        """
+        Determine if a given item description matches this product.
+        :param item: Item description.
+        :return: True if the name or any synonym of this product is a substring of the item, False otherwise.
+        """
+        return item in self.name or any(synonym in item for synonym in self.synonyms)
+
+
+class ProductView(InventoryProduct):
+    """
+    A product read straight from a row of an InventoryStore. Quantity and price can be written back,
+    renaming or retagging goes through InventoryService.update_product.
+    """
+    __slots__ = ('__store', '__row')
+
+    def __init__(self, store: 'InventoryStore', row: int):
+        """
+        :param store: The store holding the product.
+        :param row: The product's row in the store.
+        """
+        self.__store: InventoryStore = store
+        self.__row: int = row
+
+    @property
+    def row(self) -> int:
+        return self.__row
+
+    @property
+    def name(self) -> str:
+        return self.__store.name(self.__row)
+
+    @property
+    def synonyms(self) -> tuple[str, ...]:
+        return self.__store.synonyms(self.__row)
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self.__store.tags(self.__row)
+
+    @property
+    def quantity(self) -> int:
+        return self.__store.quantity(self.__row)
+
+    @quantity.setter
+    def quantity(self, quantity: int) -> None:
+        self.__store.set_quantity(self.__row, quantity)
+
+    @property
+    def price(self) -> float:
+        return self.__store.price(self.__row)
+
+    @price.setter
+    def price(self, price: float) -> None:
+        self.__store.set_price(self.__row, price)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ProductView) and other.__store is self.__store and other.__row == self.__row
+
+    def __hash__(self) -> int:
+        return hash((id(self.__store), self.__row))
+
+
+class InventoryStore:
+    """
+    Column store for inventory products. Quantities and prices live in typed arrays, names, synonyms,
+    and tags are interned, and a removed product leaves an empty row behind so row numbers stay stable.
+    """
+
+    def __init__(self):
+        self.__names: list[str | None] = []
+        self.__synonyms: list[tuple[str, ...]] = []
+        self.__tags: list[tuple[str, ...]] = []
+        self.__quantities: array = array('q')
+        self.__prices: array = array('d')
+        self.__live: array = array('b')  # 1 for a product, 0 for an empty row
+        self.__rows_by_tag: dict[str, set[int]] = defaultdict(set)
+        self.__shared_tuples: dict[tuple[str, ...], tuple[str, ...]] = {}  # Products with equal tags share one tuple
+        self.__size: int = 0
+        self.__row_locks: KeyedLock = KeyedLock()  # Stock changes to one row take turns
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self) -> Iterator[ProductView]:
+        return map(self.view, self.rows())
+
+    def rows(self) -> Iterator[int]:
+        """
+        Row numbers of every product, skipping empty rows.
+        :return: Iterator over row numbers.
+        """
+        return compress(range(len(self.__live)), self.__live)
+
+    def append(self, product: InventoryProduct) -> int:
+        """
+        Stores a product in a new row.
+        :param product: The product to store.
+        :return: The product's row number.
+        """
+        row: int = len(self.__names)
+        self.__names.append(None)
+        self.__synonyms.append(())
+        self.__tags.append(())
+        self.__quantities.append(0)
+        self.__prices.append(0.0)
+        self.__live.append(0)
+        self.replace(row, product)
+        return row
+
+    def replace(self, row: int, product: InventoryProduct) -> None:
+        """
+        Overwrites a row with a product.
+        :param row: Row number to overwrite.
+        :param product: The product to store.
+        :return: None
+        """
+        self.delete(row)
+        self.__names[row] = sys.intern(product.name)
+        self.__synonyms[row] = self.__interned(product.synonyms)
+        self.__tags[row] = self.__interned(product.tags)
+        self.__quantities[row] = product.quantity
+        self.__prices[row] = product.price
+        self.__live[row] = 1
+        for tag in self.__tags[row]:
+            self.__rows_by_tag[tag].add(row)
+        self.__size += 1
+
+    def delete(self, row: int) -> None:
+        """
+        Empties a row if it holds a product.
+        :param row: Row number to empty.
+        :return: None
+        """
+        if not self.__live[row]:
+            return
+        for tag in self.__tags[row]:
+            rows: set[int] = self.__rows_by_tag[tag]
+            rows.discard(row)
+            if not rows:
+                del self.__rows_by_tag[tag]
+        self.__names[row] = None
+        self.__synonyms[row] = ()
+        self.__tags[row] = ()
+        self.__quantities[row] = 0
+        self.__prices[row] = 0.0
+        self.__live[row] = 0
+        self.__size -= 1
+
+    def __interned(self, strings) -> tuple[str, ...]:
+        strings: tuple[str, ...] = tuple(map(sys.intern, strings))
+        return self.__shared_tuples.setdefault(strings, strings)
+
+    def view(self, row: int) -> ProductView:
+        """
+        Gets a lightweight view of the product in a row.
+        :param row: The product's row number.
+        :return: View of the product.
+        """
+        return ProductView(self, row)
+
+    def name(self, row: int) -> str:
+        return self.__names[row]
+
+    def synonyms(self, row: int) -> tuple[str, ...]:
+        return self.__synonyms[row]
+
+    def tags(self, row: int) -> tuple[str, ...]:
+        return self.__tags[row]
+
+    def quantity(self, row: int) -> int:
+        return self.__quantities[row]
+
+    def set_quantity(self, row: int, quantity: int) -> None:
+        """
+        Overwrites a product's stock, taking turns with adjust_quantity so neither loses the other's change.
+        :param row: The product's row number.
+        :param quantity: The new stock.
+        :return: None
+        """
+        with self.__row_locks.hold(row):
+            self.__quantities[row] = quantity
+
+    def adjust_quantity(self, row: int, delta: int) -> bool:
+        """
+        Atomically adds to or takes from a product's stock, refusing to take more than there is.
+        :param row: The product's row number.
+        :param delta: Units to add, negative to take.
+        :return: True if the stock changed, False if there was not enough.
+        """
+        with self.__row_locks.hold(row):
+            quantity: int = self.__quantities[row] + delta
+            if quantity < 0:
+                return False
+            self.__quantities[row] = quantity
+            return True
+
+    def price(self, row: int) -> float:
+        return self.__prices[row]
+
+    def set_price(self, row: int, price: float) -> None:
+        self.__prices[row] = price
+
+    def out_of_stock(self) -> list[int]:
+        """
+        Finds every product with nothing left in stock.
+        :return: Row numbers of out of stock products.
+        """
+        # live > quantity only holds for a product (1) with no stock (0), empty rows are 0 > 0
+        return list(compress(range(len(self.__live)), map(gt, self.__live, self.__quantities)))
+
+    def total_value(self) -> float:
+        """
+        Value of everything in stock.
+        :return: Sum of quantity times price over every product.
+        """
+        return sum(map(mul, self.__quantities, self.__prices))  # Empty rows are zeroed
+
+    def value_by_tag(self) -> dict[str, float]:
+        """
+        Value of the stock under each tag.
+        :return: Dictionary mapping each tag to the sum of quantity times price of its products.
+        """
+        quantity, price = self.__quantities.__getitem__, self.__prices.__getitem__
+        return {tag: sum(map(mul, map(quantity, rows), map(price, rows))) for tag, rows in self.__rows_by_tag.items()}
@@ -1,6 +1,14 @@
-import json, random
+import asyncio, math, threading, time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Iterator, Sequence
 
+from PirateEase.Services.agent_pool import AgentPool, LRUAgentPool, RandomAgentPool
+from PirateEase.Services.escalation_queue import NORMAL, URGENT, EscalationQueue
+from PirateEase.Services.transport import HTTPTransport
+from PirateEase.Utils.data_loader import DataLoader
 from PirateEase.Utils.response_factory import ResponseFactory
+from PirateEase.Utils.session_manager import SessionManager
 from PirateEase.Utils.singleton import Singleton
 
 """
@@ -8,7 +16,9 @@ OOP Principles
 - Encapsulation: Each class hides its internal data and behavior is contained within the classes.
 - Abstraction: Clients can call get_available_agent or notify_agents w/o knowing how agents are stored or notified.
 - Inheritance: LiveAgentService inherits from Singleton
-- Composition: LiveAgentService is composed of Agent objects and adds agents to LiveAgentNotifier
+- Composition: LiveAgentService is composed of Agent objects, an AgentPool of free agents, and an EscalationQueue of
+               waiting Escalations. It adds agents to LiveAgentNotifier
+- Polymorphism: WebhookAgent is alerted over HTTP but is notified exactly like any other Agent.
 
 Creational Pattern
 - Singleton: Ensures a single, consistent list of agents and prevents connecting with unavailable agents.
@@ -16,18 +26,22 @@ Creational Pattern
 Behavioral Pattern
 - Observer: LiveAgentNotifier adds and notifies its Agent observers. This allows for dynamic subscription of agents 
             which can change as people clock in and out of work. It also decouples logic from the main service which
-            makes the program more extensible.
+            makes the program more extensible. Observers are alerted in parallel on a background executor so a slow
+            one never holds up the customer or the others.
             
 SOLID Principles
 - Single Responsibility
     - Agent manages its information and alerting itself.
     - LiveAgentNotifier handles observer management.
     - LiveAgentService manages agent availability and selection.
+    - Escalation tracks one session waiting for or connected to an agent.
 - Open/Closed: New behaviors like prioritizing more seasoned agents can be added w/o modifying existing methods
 - Liskov Substitution: Subclasses of all classes could replace the base w/o breaking functionality.
 - Interface Segregation: Each class exposes only necessary and relevant methods.
 """
 
+AGENTS: str = 'Databases/agents.json'
+
 
 class Agent:
     """
@@ -37,8 +51,20 @@ class Agent:
     def __init__(self, name: str, available: bool):
         self.name: str = name
         self.available: bool = available
+        self.__lock: threading.Lock = threading.Lock()
+
+    def claim(self) -> bool:
+        """
+        Atomically marks this agent as unavailable if they are available.
+        :return: True if this call claimed the agent, False if they were already taken.
+        """
+        with self.__lock:
+            if not self.available:
+                return False
+            self.available = False
+            return True
 
-    def alert(self, history: list[str]):
+    def alert(self, history: Sequence[str]):
         """
         Alerts this agent that someone is requesting assistance and gives them the history of their chat with PirateEase
         :param history: The history of the chat with PirateEase
@@ -47,12 +73,59 @@ class Agent:
         return f'{self.name} was alerted!\nHistory: {history}'
 
 
+class WebhookAgent(Agent):
+    """
+    An agent whose alerts are posted as JSON to an HTTP endpoint, e.g. their desk app. Every webhook agent shares
+    one transport, so alerts reuse keep-alive connections instead of opening one each.
+    """
+    __transport: HTTPTransport | None = None
+    __transport_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, name: str, available: bool, endpoint: str):
+        super().__init__(name, available)
+        self.endpoint: str = endpoint
+
+    def alert(self, history: Sequence[str]):
+        """
+        Posts the alert to this agent's endpoint.
+        :param history: The history of the chat with PirateEase
+        :return: String verifying the agent was alerted
+        :raises TransportError: If the endpoint could not be reached or returned an error.
+        """
+        transport: HTTPTransport = WebhookAgent.__get_transport(self.endpoint)
+        status, _ = transport.request('POST', self.endpoint, {'agent': self.name, 'history': list(history)})
+        return f'{self.name} was alerted! ({status})'
+
+    @staticmethod
+    def __get_transport(endpoint: str) -> HTTPTransport:
+        """
+        Gets the transport alerts are posted with, starting it on first use. It keeps a pool per host, so agents on
+        other hosts share it too.
+        :param endpoint: Any agent's endpoint, used as the base URL.
+        :return: The transport.
+        """
+        with WebhookAgent.__transport_lock:
+            if WebhookAgent.__transport is None:
+                WebhookAgent.__transport = HTTPTransport(endpoint, max_connections=LiveAgentNotifier.max_workers,
+                                                         timeout=LiveAgentNotifier.timeout)
+            return WebhookAgent.__transport
+
+
 class LiveAgentNotifier:
     """
     Class that agents can subscribe to in order to be notified of someone requesting assistance.
     """
     # All the agents subscribed to this notifier
     observers: list[Agent] = []
+    # Seconds an agent has to acknowledge an alert before it counts as timed out
+    timeout: float = 2.0
+    # Most alerts delivered at once
+    max_workers: int = 16
+    # Agents get the last this many lines of history, each cut to line_chars characters
+    history_lines: int = 20
+    line_chars: int = 300
+    __executor: ThreadPoolExecutor | None = None
+    __executor_lock: threading.Lock = threading.Lock()
 
     @staticmethod
     def add_observer(agent: Agent) -> None:
@@ -73,52 +146,362 @@ class LiveAgentNotifier:
         LiveAgentNotifier.observers.remove(agent)
 
     @staticmethod
-    def notify_agents(history: list[str]) -> None:
+    def snapshot(history: Sequence[str]) -> tuple[str, ...]:
         """
-        Alerts every subscribed agent that someone is requesting assistance.
+        Makes a compact, immutable copy of a chat history that is safe to hand to other threads.
         :param history: The history from the chat with PirateEase
+        :return: The most recent lines, each shortened if needed.
+        """
+        limit: int = LiveAgentNotifier.line_chars
+        return tuple(line if len(line) <= limit else line[:limit - 3] + '...'
+                     for line in history[-LiveAgentNotifier.history_lines:])
+
+    @staticmethod
+    def notify_agents(history: Sequence[str]) -> Future:
+        """
+        Alerts every subscribed agent that someone is requesting assistance. Alerts are sent in parallel in the
+        background, so this returns right away.
+        :param history: The history from the chat with PirateEase
+        :return: Future of a dictionary mapping each agent's name to what their alert returned, or the exception it
+                 raised. Agents that took longer than timeout are mapped to a TimeoutError.
+        """
+        snapshot: tuple[str, ...] = LiveAgentNotifier.snapshot(history)
+        agents: list[Agent] = list(LiveAgentNotifier.observers)  # Agents may leave meanwhile
+        outcome: Future = Future()
+        if not agents:
+            outcome.set_result({})
+            return outcome
+
+        results: dict[str, object] = {}
+        lock: threading.Lock = threading.Lock()
+
+        def finish() -> None:  # Time is up, whoever has not answered timed out
+            with lock:
+                if outcome.done():
+                    return
+                for agent in agents:
+                    results.setdefault(agent.name, TimeoutError(f'{agent.name} did not answer in time'))
+                outcome.set_result(dict(results))
+
+        def record(agent: Agent, alert: Future) -> None:
+            with lock:
+                if outcome.done():  # Answered after the timeout
+                    return
+                results[agent.name] = alert.exception() or alert.result()
+                if len(results) == len(agents):
+                    timer.cancel()
+                    outcome.set_result(dict(results))
+
+        timer: threading.Timer = threading.Timer(LiveAgentNotifier.timeout, finish)
+        timer.daemon = True
+        timer.start()
+        executor: ThreadPoolExecutor = LiveAgentNotifier.__get_executor()
+        for agent in agents:  # For each subscribed agent
+            executor.submit(agent.alert, snapshot).add_done_callback(partial(record, agent))  # Alert them w/ history
+        return outcome
+
+    @staticmethod
+    async def notify_agents_async(history: Sequence[str]) -> dict[str, object]:
+        """
+        Async version of notify_agents that waits for every agent to answer or time out.
+        :param history: The history from the chat with PirateEase
+        :return: Dictionary mapping each agent's name to what their alert returned or raised.
+        """
+        return await asyncio.wrap_future(LiveAgentNotifier.notify_agents(history))
+
+    @staticmethod
+    def __get_executor() -> ThreadPoolExecutor:
+        """
+        Gets the executor alerts are sent on, starting it on first use.
+        :return: The executor.
+        """
+        with LiveAgentNotifier.__executor_lock:
+            if LiveAgentNotifier.__executor is None:
+                LiveAgentNotifier.__executor = ThreadPoolExecutor(max_workers=LiveAgentNotifier.max_workers,
+                                                                  thread_name_prefix='agent-alert')
+            return LiveAgentNotifier.__executor
+
+
+class Escalation:
+    """
+    A session's request for a live agent. Starts out waiting unless an agent was free and is assigned when one is.
+    """
+
+    def __init__(self, session_id: str, priority: int = NORMAL):
+        self.session_id: str = session_id
+        self.priority: int = priority
+        self.agent: Agent | None = None
+        self.connected: bool = False  # The session has been told who its agent is
+        # (position, sessions waiting, estimated seconds) as of the last request, see LiveAgentService.queue_status
+        self.status: tuple[int, int, float] = (0, 0, 0.0)
+        self.__assigned: threading.Event = threading.Event()
+
+    def assign(self, agent: Agent) -> None:
+        """
+        Hands the session to an agent and wakes anyone waiting on it.
+        :param agent: The agent taking the session.
         :return: None
         """
-        for agent in LiveAgentNotifier.observers:  # For each subscribed agent
-            agent.alert(history)  # Alert them w/ history
+        self.agent = agent
+        self.__assigned.set()
+
+    def wait(self, timeout: float | None = None) -> Agent | None:
+        """
+        Blocks until an agent is assigned.
+        :param timeout: Seconds to wait, forever if None.
+        :return: The assigned agent, or None if the timeout ran out first.
+        """
+        self.__assigned.wait(timeout)
+        return self.agent
 
 
 class LiveAgentService(Singleton):
     """
     Singleton class for connecting clients with a live agent.
     """
+    # How the next free agent is picked, 'random' or 'lru' (the agent free the longest)
+    selection: str = 'random'
+    # Sessions that can wait for an agent at once, later escalations are turned away
+    max_waiting: int = 50
+    # Assumed length of an agent's session until real ones have been timed
+    default_handle_seconds: float = 300.0
+    # Weight of the newest session when updating the average session length
+    handle_smoothing: float = 0.2
+    # Base URL of a remote staffing system serving GET /agents, e.g. stub_backend_server.py. Used instead of the
+    # JSON file if set.
+    url: str | None = None
 
     def __init__(self):
         # If initialized, skip
         if self._initialized:
             return
-        # If not initialized, load agents from DB
+        # If not initialized, load agents from DB or the remote staffing system
         self.__agents: list[Agent] = []
-        with open('Databases/agents.json', 'r', encoding='utf-8') as f:
-            agents: list[dict] = json.load(f)
-            for a in agents:  # For each raw agent
-                agent = Agent(a.get('name'), a.get('available'))  # Instantiate an agent class
-                self.__agents.append(agent)  # Add it to the list of agents
-                if agent.available:  # If the agent is available
-                    LiveAgentNotifier.add_observer(agent)  # Add it to the observers
+        self.__pool: AgentPool = LRUAgentPool() if self.selection == 'lru' else RandomAgentPool()
+        agents: list[dict]
+        if self.url:
+            transport: HTTPTransport = HTTPTransport(self.url)
+            agents = transport.get_json('/agents') or []
+            transport.close()
+        else:
+            agents = DataLoader.load(AGENTS)
+        for a in agents:  # For each raw agent
+            if a.get('endpoint'):  # Alerted over HTTP
+                agent = WebhookAgent(a.get('name'), a.get('available'), a.get('endpoint'))
+            else:  # Instantiate an agent class
+                agent = Agent(a.get('name'), a.get('available'))
+            self.__agents.append(agent)  # Add it to the list of agents
+            if agent.available:  # If the agent is available
+                self.__pool.add(agent)
+                LiveAgentNotifier.add_observer(agent)  # Add it to the observers
+        self.__agents_by_name: dict[str, Agent] = {agent.name: agent for agent in self.__agents}
+        # Sessions waiting for an agent, negative sentiment first and then longest waiting first
+        self.__waiting: EscalationQueue = EscalationQueue(clock=lambda: time.monotonic())
+        self.__busy_since: dict[Agent, float] = {}  # Agents in a session -> when it started
+        self.__handle_seconds: float = self.default_handle_seconds  # Running average session length
+        self.__escalations: dict[str, Escalation] = {}  # session id -> its open escalation, until its agent is freed
+        self.__serving: dict[Agent, str] = {}  # Agents in a session -> the session id
+        self.__lock: threading.Lock = threading.Lock()  # Guards the pool, queue, and escalations
         # Mark as initialized
         self._initialized = True
 
-    def agent_name_in_string(self, s: str) -> bool:
+    @property
+    def waiting(self) -> int:
+        """
+        Number of sessions waiting for an agent.
+        """
+        return len(self.__waiting)
+
+    @property
+    def free_agents(self) -> int:
+        """
+        Number of agents free to take a session.
+        """
+        return len(self.__pool)
+
+    def labeled_phrases(self) -> Iterator[tuple[str, tuple[str, str]]]:
+        """
+        Tags each agent name so it can be compiled into a shared PhraseMatcher.
+        :return: Pairs of (lowercase name, ('agent', name)).
+        """
+        return ((agent.name.lower(), ('agent', agent.name)) for agent in self.__agents)
+
+    def agent_name_in_string(self, s: str, scan: set[tuple] | None = None) -> bool:
         """
         Determines if the given string contains the name of an agent. Used to determine when to
         break out of the main loop.
         :param s: The string to check for a name in.
+        :param scan: Optional labels already found in the string by a shared PhraseMatcher.
         :return: True if the name of an agent is found, False otherwise.
         """
+        if scan is not None:  # The string was already scanned, just read the answer
+            return any(source == 'agent' for source, _ in scan)
         return any(agent.name in s for agent in self.__agents)
 
-    def get_available_agent(self) -> str:
+    def request_agent(self, session_id: str, urgent: bool = False) -> Escalation | None:
+        """
+        Assigns a free agent to a session, or puts the session in line for the next one.
+        Asking again for a session that already has an escalation returns the same escalation, moving it up the line
+        if it has become urgent.
+        :param session_id: The session asking for an agent.
+        :param urgent: True if the customer is upset, which puts them ahead of everyone who is not.
+        :return: The session's escalation, with its place in line as of this request in its status, or None if every
+                 agent is busy and the line is full.
+        """
+        priority: int = URGENT if urgent else NORMAL
+        with self.__lock:
+            escalation: Escalation | None = self.__escalations.get(session_id)
+            if escalation is not None:
+                if escalation.agent is None and priority < escalation.priority:
+                    escalation.priority = priority
+                    self.__waiting.push(escalation, priority)
+                escalation.status = self.__queue_status(escalation)
+                return escalation
+            agent: Agent | None = self.__pool.checkout()
+            if agent is None and len(self.__waiting) >= self.max_waiting:
+                return None
+            escalation = Escalation(session_id, priority)
+            self.__escalations[session_id] = escalation
+            if agent is not None:
+                self.__connect(escalation, agent)
+            else:
+                self.__waiting.push(escalation, priority)
+            escalation.status = self.__queue_status(escalation)
+            return escalation
+
+    def get_available_agent(self, session_id: str | None = None, urgent: bool = False) -> str:
+        """
+        Connects the client with an available agent, or tells them where they are in line and how long it may take.
+        :param session_id: The session asking, the current session by default.
+        :param urgent: True if the customer is upset, which puts them ahead of everyone who is not.
+        :return: Connection string, or a message saying the client is waiting or that every agent is busy.
+        """
+        if session_id is None:
+            session_id = SessionManager.current().session_id
+        escalation: Escalation | None = self.request_agent(session_id, urgent)
+        if escalation is None:  # Nobody free and no room to wait
+            return ResponseFactory.get_response('agents_busy')
+        if escalation.agent is None:  # Still waiting, read where it was in line under the same lock that queued it
+            position, depth, wait = escalation.status
+            return ResponseFactory.get_response('agent_queue').format(position=position, depth=depth,
+                                                                      minutes=max(1, math.ceil(wait / 60)))
+        escalation.connected = True
+        return ResponseFactory.get_response('connecting_agent').format(agent=escalation.agent.name)
+
+    def pending_connection(self, session_id: str | None = None) -> str:
+        """
+        Checks if an agent has been assigned to a session since it started waiting.
+        :param session_id: The session, the current session by default.
+        :return: Connection string if an agent is ready for the session, empty string otherwise.
+        """
+        if session_id is None:
+            session_id = SessionManager.current().session_id
+        with self.__lock:
+            escalation: Escalation | None = self.__escalations.get(session_id)
+            if escalation is None or escalation.agent is None or escalation.connected:
+                return ''
+            escalation.connected = True  # Kept until the agent is freed, by the agent or the session ending
+        return ResponseFactory.get_response('connecting_agent').format(agent=escalation.agent.name)
+
+    def queue_status(self, session_id: str) -> tuple[int, int, float]:
         """
-        Connects the client with an available agent.
-        :return: Connection string.
+        Reports where a session is in line and roughly how long it will wait. Sessions ahead are assumed to be
+        served in waves, one per busy agent, each lasting an average session.
+        :param session_id: The session.
+        :return: (position, number of sessions waiting, estimated seconds until an agent is free for this session).
+                 Position and estimate are 0 if the session is not waiting.
+        """
+        with self.__lock:
+            return self.__queue_status(self.__escalations.get(session_id))
+
+    def position(self, session_id: str) -> int:
+        """
+        Gets a session's place in line.
+        :param session_id: The session.
+        :return: 1 for the next session to be served, 0 if the session is not waiting.
+        """
+        return self.queue_status(session_id)[0]
+
+    def release_agent(self, name: str) -> None:
+        """
+        Frees an agent once they are done with a session, e.g. from the agent's desk app. Ends the agent's link to
+        that session. The agent goes straight to the most urgent waiting session, or back into the pool if nobody is
+        waiting.
+        :param name: Name of the agent.
+        :return: None
+        :raises KeyError: If there is no agent with that name.
+        """
+        agent: Agent = self.__agents_by_name[name]
+        with self.__lock:
+            pooled: bool = self.__free(agent)
+        if pooled:
+            LiveAgentNotifier.add_observer(agent)
+
+    def cancel(self, session_id: str) -> None:
+        """
+        Withdraws a session's escalation, e.g. when the customer leaves. If an agent was assigned to it, whether or
+        not the session was connected yet, the agent is freed for the next session.
+        :param session_id: The session.
+        :return: None
+        """
+        with self.__lock:
+            escalation: Escalation | None = self.__escalations.pop(session_id, None)
+            if escalation is None:
+                return
+            self.__waiting.remove(escalation)
+            pooled: bool = escalation.agent is not None and self.__free(escalation.agent)
+        if pooled:
+            LiveAgentNotifier.add_observer(escalation.agent)
+
+    def __free(self, agent: Agent) -> bool:
+        """
+        Hands a busy agent to the most urgent waiting session, or puts them back in the pool. Called with the lock held.
+        :param agent: The agent.
+        :return: True if the agent went back into the pool and should be alerted again.
+        """
+        if agent.available or agent in self.__pool:  # Already free
+            return False
+        session_id: str | None = self.__serving.pop(agent, None)
+        if session_id is not None:  # The session is done with its escalation
+            self.__escalations.pop(session_id, None)
+        started: float | None = self.__busy_since.pop(agent, None)
+        if started is not None:  # Learn how long sessions take
+            self.__handle_seconds += self.handle_smoothing * (time.monotonic() - started - self.__handle_seconds)
+        escalation: Escalation | None = self.__waiting.pop()
+        if escalation is not None:
+            self.__connect(escalation, agent)
+            return False
+        agent.available = True
+        self.__pool.add(agent)
+        return True
+
+    def __queue_status(self, escalation: Escalation | None) -> tuple[int, int, float]:
+        """
+        Reports where an escalation is in line, see queue_status. Called with the lock held.
+        :param escalation: The escalation, or None.
+        :return: (position, number of sessions waiting, estimated seconds until an agent is free for it).
+        """
+        position: int = self.__waiting.position(escalation) if escalation is not None else 0
+        depth: int = len(self.__waiting)
+        if not position:
+            return 0, depth, 0.0
+        busy: int = max(1, len(self.__busy_since))
+        now: float = time.monotonic()
+        # The first wave ends when the agent who has been busy the longest is likely done
+        longest: float = max((now - since for since in self.__busy_since.values()), default=0.0)
+        first_wave: float = max(0.0, self.__handle_seconds - longest)
+        return position, depth, first_wave + (math.ceil(position / busy) - 1) * self.__handle_seconds
+
+    def __connect(self, escalation: Escalation, agent: Agent) -> None:
+        """
+        Takes an agent off the market and assigns them to an escalation. Called with the lock held.
+        :param escalation: The escalation to serve.
+        :param agent: The agent to serve it.
+        :return: None
         """
-        agent: Agent = random.choice([a for a in self.__agents if a.available])  # Choose a random agent
-        agent.available = False  # Mark them as unavailable
-        LiveAgentNotifier.remove_observer(agent)
-        return ResponseFactory.get_response('connecting_agent').format(agent=agent.name)  # Return dynamic response
+        agent.claim()
+        if agent in LiveAgentNotifier.observers:
+            LiveAgentNotifier.remove_observer(agent)
+        self.__busy_since[agent] = time.monotonic()
+        self.__serving[agent] = escalation.session_id
+        escalation.assign(agent)
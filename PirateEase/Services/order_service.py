@@ -1,5 +1,9 @@
-import json
+import os
+from collections.abc import Mapping
 
+from PirateEase.Services.order_store import SQLiteOrderStore
+from PirateEase.Services.transport import HTTPTransport, RemoteMapping
+from PirateEase.Utils.data_loader import DataLoader
 from PirateEase.Utils.response_factory import ResponseFactory
 from PirateEase.Utils.singleton import Singleton
 
@@ -10,7 +14,8 @@ OOP Principles
     - OrderService contains logic to retrieve order information.
 - Abstraction: retrieve_order gives a simple interface for getting order info while hiding how it is done.
 - Inheritance: OrderService inherits from Singleton
-- Composition: OrderService is composed of many Order objects.
+- Composition: OrderService is composed of many Order objects, loaded from JSON or looked up in an SQLite store or a
+               remote order system.
 
 Creational Pattern
 - Singleton: Ensures a single source of truth for all order data so there is no desync and avoids loading and parsing
@@ -20,11 +25,14 @@ SOLID Principles
 - Single Responsibility:
     - Order holds and formats order data.
     - OrderService handles loading and retrieving orders.
+- Dependency Inversion: OrderService only needs a mapping from order id to Order, whichever backend provides it.
 - Open/Closed: Can be extended to add filtering for specific regions or something similar w/o modifying core logic.
 - Liskov Substitution: Subclassing wouldn't break behavior.
 - Interface Segregation: The classes expose only focused and necessary interfaces.
 """
 
+ORDERS: str = 'Databases/orders.json'
+
 
 class Order:
     """
@@ -54,29 +62,56 @@ class OrderService(Singleton):
     """
     Singleton class that retrieves information about an outgoing order.
     """
+    # SQLite database built by `python -m PirateEase.Services.order_store`. Used instead of the JSON file if it exists.
+    database: str = 'Databases/orders.db'
+    # Base URL of a remote order system serving GET /orders/<id>, e.g. stub_backend_server.py. Used first if set.
+    url: str | None = None
 
     def __init__(self):
         # If already initialized, skip
         if self._initialized:
             return
-        # Load orders from DB
-        with open('Databases/orders.json', 'r', encoding='utf-8') as f:
-            raw_orders: dict = json.load(f)
-            self.__orders: dict[int, Order] = {
-                int(order_id): Order(
-                    id=int(order_id),
-                    customer_name=data["customer_name"],
-                    order_date=data["order_date"],
-                    eta_hours=data["eta_hours"],
-                    item=data["item"],
-                    quantity=data["quantity"],
-                    refunded=False
-                )
-                for order_id, data in raw_orders.items()
-            }
+        self.__orders: Mapping[int, Order]
+        if self.url:  # Orders live in another system, look each one up over HTTP
+            self.__orders = RemoteMapping(HTTPTransport(self.url), '/orders', self.__order, make_key=int)
+            self._initialized = True
+            return
+        if os.path.exists(self.database):  # Orders are looked up on demand, startup does not grow with order history
+            self.__orders = SQLiteOrderStore(self.database, Order)
+            self._initialized = True
+            return
+        # Load orders from DB, or from the snapshot of them if the DB has not changed
+        self.__orders = DataLoader.derive('orders', (ORDERS,), self.__load_orders)
         # Mark as initialized
         self._initialized = True
 
+    @classmethod
+    def __load_orders(cls) -> dict[int, Order]:
+        """
+        Builds every order from the JSON DB.
+        :return: Order id -> order.
+        """
+        raw_orders: dict = DataLoader.load(ORDERS, cache=False)
+        return {int(order_id): cls.__order(order_id, data) for order_id, data in raw_orders.items()}
+
+    @staticmethod
+    def __order(order_id: str | int, data: dict) -> Order:
+        """
+        Builds an order from its JSON record.
+        :param order_id: The order's id.
+        :param data: The order's record.
+        :return: The order.
+        """
+        return Order(
+            id=int(order_id),
+            customer_name=data["customer_name"],
+            order_date=data["order_date"],
+            eta_hours=data["eta_hours"],
+            item=data["item"],
+            quantity=data["quantity"],
+            refunded=False
+        )
+
     def retrieve_order(self, order_id: str) -> str:
         """
         Gets the order corresponding to the given order id.
@@ -89,3 +124,16 @@ class OrderService(Singleton):
             return str(order)  # Return its string representation
         else:  # No order matched the order ID
             return ''  # Return an empty string
+
+    def retrieve_orders(self, order_ids: list[str]) -> list[str]:
+        """
+        Gets the orders corresponding to many order ids at once, with one query when orders are kept in SQLite.
+        :param order_ids: The ids of the orders to retrieve.
+        :return: String representation of each order, or empty string where no order is found, in the same order.
+        """
+        ids: list[int] = [int(order_id) for order_id in order_ids]
+        get_many = getattr(self.__orders, 'get_many', None)
+        orders: Mapping[int, Order] = get_many(ids) if get_many is not None else self.__orders
+        # One lookup each, a remote lookup is a request
+        found: list[Order | None] = [orders.get(order_id) for order_id in ids]
+        return [str(order) if order is not None else '' for order in found]
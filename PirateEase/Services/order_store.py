@@ -0,0 +1,153 @@
+import argparse, json, os, sqlite3, threading
+from collections.abc import Mapping
+from typing import Callable, Iterator
+
+"""
+OOP Principles
+- Encapsulation: The database file and its connections are private to SQLiteOrderStore.
+- Abstraction: OrderService looks orders up by id without knowing they come from SQLite.
+- Inheritance: SQLiteOrderStore inherits from Mapping.
+- Polymorphism: SQLiteOrderStore can be used anywhere the dict of orders loaded from JSON is.
+
+Structural Pattern
+- Adapter: Adapts an SQLite table to the read-only Mapping interface OrderService already uses.
+
+SOLID Principles
+- Single Responsibility: SQLiteOrderStore only reads orders, import_orders only builds the database.
+- Liskov Substitution: SQLiteOrderStore behaves like a read-only dict of orders.
+- Dependency Inversion: OrderService depends on a Mapping of orders, not on a storage engine.
+"""
+
+_SCHEMA: str = '''
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY,
+    customer_name TEXT NOT NULL,
+    order_date TEXT NOT NULL,
+    eta_hours INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    refunded INTEGER NOT NULL DEFAULT 0
+)
+'''
+
+_COLUMNS: str = 'id, customer_name, order_date, eta_hours, item, quantity, refunded'
+_MAX_VARIABLES: int = 500  # Ids per batched query, well under SQLite's limit on placeholders
+
+
+class SQLiteOrderStore(Mapping):
+    """
+    Read-only mapping from order id to order backed by an SQLite database. Opening it costs the same no matter how
+    many orders there are, and every lookup is a primary key search.
+    """
+
+    def __init__(self, path: str, make_order: Callable[..., object]):
+        """
+        :param path: Path to a database built by import_orders.
+        :param make_order: Builds an order from its columns passed as keyword arguments, e.g. the Order class.
+        :raises FileNotFoundError: If the database does not exist.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.__make_order: Callable[..., object] = make_order
+        self.__uri: str = f'file:{os.path.abspath(path)}?mode=ro'
+        self.__local: threading.local = threading.local()  # One connection per thread
+
+    def __getitem__(self, order_id: int):
+        row: tuple | None = self.__lookup(f'SELECT {_COLUMNS} FROM orders WHERE id = ?', order_id)
+        if row is None:
+            raise KeyError(order_id)
+        return self.__order(row)
+
+    def __len__(self) -> int:
+        return self.__connection().execute('SELECT COUNT(*) FROM orders').fetchone()[0]
+
+    def __iter__(self) -> Iterator[int]:
+        return (order_id for (order_id,) in self.__connection().execute('SELECT id FROM orders ORDER BY id'))
+
+    def __contains__(self, order_id) -> bool:
+        return self.__lookup('SELECT 1 FROM orders WHERE id = ?', order_id) is not None
+
+    def get_many(self, order_ids: list[int]) -> dict:
+        """
+        Looks many orders up in one query.
+        :param order_ids: The order ids, duplicates are fine.
+        :return: Dictionary mapping each id that was found to its order.
+        """
+        ids: list[int] = [order_id for order_id in set(order_ids) if -2 ** 63 <= order_id < 2 ** 63]
+        orders: dict = {}
+        for start in range(0, len(ids), _MAX_VARIABLES):
+            chunk: list[int] = ids[start:start + _MAX_VARIABLES]
+            query: str = f'SELECT {_COLUMNS} FROM orders WHERE id IN ({", ".join("?" * len(chunk))})'
+            for row in self.__connection().execute(query, chunk):
+                orders[row[0]] = self.__order(row)
+        return orders
+
+    def __order(self, row: tuple):
+        """
+        Builds an order from its row.
+        :param row: The columns in _COLUMNS order.
+        :return: The order.
+        """
+        order_id, customer_name, order_date, eta_hours, item, quantity, refunded = row
+        return self.__make_order(id=order_id, customer_name=customer_name, order_date=order_date, eta_hours=eta_hours,
+                                 item=item, quantity=quantity, refunded=bool(refunded))
+
+    def __lookup(self, query: str, order_id: int) -> tuple | None:
+        """
+        Runs a single row query for an order id.
+        :param query: Query with one placeholder for the id.
+        :param order_id: The order id.
+        :return: The row, or None if there is none.
+        """
+        try:
+            return self.__connection().execute(query, (order_id,)).fetchone()
+        except OverflowError:  # Too big to be a stored id
+            return None
+
+    def __connection(self) -> sqlite3.Connection:
+        """
+        Gets this thread's connection, opening it on first use.
+        :return: The connection.
+        """
+        connection: sqlite3.Connection | None = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.__uri, uri=True)
+            self.__local.connection = connection
+        return connection
+
+
+def import_orders(json_path: str, db_path: str) -> int:
+    """
+    Builds an SQLite order database from an orders JSON file. The database is written next to its final path and
+    moved into place at the end, so a crash never leaves a half imported database behind.
+    :param json_path: Path to the orders JSON file.
+    :param db_path: Path of the database to create or replace.
+    :return: Number of orders imported.
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        raw_orders: dict = json.load(f)
+
+    temp_path: str = db_path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection: sqlite3.Connection = sqlite3.connect(temp_path)
+    try:
+        with connection:
+            connection.execute(_SCHEMA)
+            connection.executemany(
+                'INSERT INTO orders (id, customer_name, order_date, eta_hours, item, quantity) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((int(order_id), data['customer_name'], data['order_date'], data['eta_hours'], data['item'],
+                  data['quantity']) for order_id, data in raw_orders.items()))
+    finally:
+        connection.close()
+    os.replace(temp_path, db_path)
+    return len(raw_orders)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import orders from JSON into the SQLite order database.')
+    parser.add_argument('--json', default='Databases/orders.json')
+    parser.add_argument('--db', default='Databases/orders.db')
+    args = parser.parse_args()
+    print(f'Imported {import_orders(args.json, args.db)} orders into {args.db}')
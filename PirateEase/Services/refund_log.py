@@ -0,0 +1,218 @@
+import json, os, threading
+from pathlib import Path
+
+"""
+OOP Principles
+- Encapsulation: The file descriptor, pending records, and compaction state are private to RefundLog.
+- Abstraction: RefundService appends refunds and replays them without knowing how they are batched or compacted.
+
+Behavioral Pattern
+- Leader/Followers: Whichever appender finds no flush running writes and fsyncs every pending record at once while
+                    the others wait for it, so one fsync covers many refunds.
+
+SOLID Principles
+- Single Responsibility: Only makes refunds durable and reads them back.
+- Open/Closed: The compaction threshold is a parameter, so callers tune it without changing the log.
+- Interface Segregation: Exposes replay, append, compact, and close.
+"""
+
+
+def _read_records(path: Path) -> list[int]:
+    """
+    Reads the order ids in a log file. A torn last record from a crash mid-write has no newline and is skipped.
+    :param path: Path to the log file.
+    :return: Order ids in the order they were logged.
+    """
+    if not path.exists():
+        return []
+    order_ids: list[int] = []
+    for line in path.read_bytes().split(b'\n')[:-1]:  # Everything after the last newline is incomplete
+        try:
+            order_ids.append(int(line))
+        except ValueError:  # Garbage from a torn write
+            continue
+    return order_ids
+
+
+def _sync_directory(path: Path) -> None:
+    """
+    Makes a file's creation or rename durable. Fsyncing the file only covers its contents, after a crash its entry in
+    the directory could still be missing.
+    :param path: Path to the file.
+    :return: None
+    """
+    if os.name == 'nt':  # Directories cannot be opened on Windows, which makes renames durable itself
+        return
+    fd: int = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_durably(path: Path, data: bytes) -> None:
+    """
+    Replaces a file with new contents so that either the old or the new contents survive a crash.
+    :param path: Path to the file.
+    :param data: The new contents.
+    :return: None
+    """
+    temp_path: Path = path.with_name(path.name + '.tmp')
+    fd: int = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(temp_path, path)
+    _sync_directory(path)
+
+
+class RefundLog:
+    """
+    Append-only log of refunded order ids with a snapshot it is compacted into in the background.
+    """
+
+    def __init__(self, path: str, snapshot_path: str, compact_after: int = 10000):
+        """
+        :param path: Path to the log file.
+        :param snapshot_path: Path to the snapshot the log is compacted into.
+        :param compact_after: Number of records in the log that triggers a background compaction.
+        """
+        self.__path: Path = Path(path)
+        self.__compacting_path: Path = self.__path.with_name(self.__path.name + '.compacting')
+        self.__snapshot_path: Path = Path(snapshot_path)
+        self.__compact_after: int = compact_after
+        self.__condition: threading.Condition = threading.Condition()
+        self.__fd: int | None = None
+        self.__pending: list[bytes] = []  # Records waiting for the next flush
+        self.__appended: int = 0  # Sequence number of the last appended record
+        self.__durable: int = 0  # Sequence number of the last record known to be on disk
+        self.__flushing: bool = False
+        self.__records: int = 0  # Records in the current log file
+        self.__compactor: threading.Thread | None = None
+
+    def replay(self) -> set[int]:
+        """
+        Reads back every refund that was made durable and opens the log for appending.
+        Must be called before the first append.
+        :return: Ids of every refunded order.
+        """
+        refunded: set[int] = set()
+        if self.__snapshot_path.exists():
+            refunded.update(json.loads(self.__snapshot_path.read_text(encoding='utf-8')))
+        refunded.update(_read_records(self.__compacting_path))  # Left behind if we crashed while compacting
+        logged: list[int] = _read_records(self.__path)
+        refunded.update(logged)
+        with self.__condition:
+            self.__records = len(logged)
+            self.__fd = self.__open_log()
+        return refunded
+
+    def append(self, order_id: int) -> None:
+        """
+        Logs a refund and returns once it is on disk. Concurrent appends share one write and fsync.
+        :param order_id: Id of the refunded order.
+        :return: None
+        """
+        with self.__condition:
+            self.__pending.append(b'%d\n' % order_id)
+            self.__appended += 1
+            sequence: int = self.__appended
+            while self.__durable < sequence:
+                if self.__flushing:  # Someone else is writing, our record goes in their batch or the next one
+                    self.__condition.wait()
+                else:
+                    self.__flush()
+            compact: bool = self.__records >= self.__compact_after and not self.__compaction_running()
+        if compact:
+            self.compact()
+
+    def compact(self, wait: bool = False) -> None:
+        """
+        Starts folding the log into the snapshot on a background thread. Appends carry on in a fresh log meanwhile.
+        :param wait: Block until compaction is done, mostly for tests and shutdown.
+        :return: None
+        """
+        with self.__condition:
+            while self.__flushing:
+                self.__condition.wait()
+            if not self.__compaction_running() and not self.__compacting_path.exists():
+                # Swap in an empty log, the old one is only read from now on
+                os.close(self.__fd)
+                os.replace(self.__path, self.__compacting_path)
+                self.__fd = self.__open_log()  # Also makes the rename durable, they share a directory
+                self.__records = 0
+            if not self.__compaction_running() and self.__compacting_path.exists():
+                self.__compactor = threading.Thread(target=self.__compact, name='refund-log-compactor', daemon=True)
+                self.__compactor.start()
+            compactor: threading.Thread | None = self.__compactor
+        if wait and compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        """
+        Waits for any compaction to finish and closes the log.
+        :return: None
+        """
+        compactor: threading.Thread | None = self.__compactor
+        if compactor is not None:
+            compactor.join()
+        with self.__condition:
+            if self.__fd is not None:
+                os.close(self.__fd)
+                self.__fd = None
+
+    def __flush(self) -> None:
+        """
+        Writes and fsyncs every pending record. Called with the condition held, releases it while on disk.
+        :return: None
+        """
+        batch: list[bytes] = self.__pending
+        last: int = self.__appended
+        self.__pending = []
+        self.__flushing = True
+        self.__condition.release()
+        try:
+            os.write(self.__fd, b''.join(batch))
+            os.fsync(self.__fd)
+        except BaseException:
+            self.__condition.acquire()
+            self.__pending = batch + self.__pending  # Keep the records for the next leader to retry
+            self.__flushing = False
+            self.__condition.notify_all()
+            raise
+        self.__condition.acquire()
+        self.__flushing = False
+        self.__durable = last
+        self.__records += len(batch)
+        self.__condition.notify_all()
+
+    def __compact(self) -> None:
+        """
+        Writes a new snapshot with the refunds in the retired log, then deletes the retired log.
+        :return: None
+        """
+        refunded: set[int] = set()
+        if self.__snapshot_path.exists():
+            refunded.update(json.loads(self.__snapshot_path.read_text(encoding='utf-8')))
+        refunded.update(_read_records(self.__compacting_path))
+        _write_durably(self.__snapshot_path, json.dumps(sorted(refunded)).encode('utf-8'))
+        os.remove(self.__compacting_path)
+
+    def __compaction_running(self) -> bool:
+        return self.__compactor is not None and self.__compactor.is_alive()
+
+    def __open_log(self) -> int:
+        """
+        Opens the log for appending, creating it if needed. Its directory is synced before any append is acknowledged,
+        so a fresh log cannot vanish in a crash with its records.
+        :return: The file descriptor.
+        """
+        fd: int = os.open(self.__path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            _sync_directory(self.__path)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
@@ -1,5 +1,9 @@
-import json
+from collections.abc import Mapping
 
+from PirateEase.Services.refund_log import RefundLog
+from PirateEase.Services.transport import HTTPTransport, RemoteMapping
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.keyed_lock import KeyedLock
 from PirateEase.Utils.response_factory import ResponseFactory
 from PirateEase.Utils.singleton import Singleton
 
@@ -10,7 +14,7 @@ OOP Principles
     - RefundService contains logic for retrieving and updating refund status.
 - Abstraction: Clients can just call refund_past_order and receive a response w/o needing to know how it works.
 - Inheritance: RefundService inherits from Singleton.
-- Composition: RefundService contains PastOrder objects.
+- Composition: RefundService contains PastOrder objects and a RefundLog that makes refunds durable.
 
 Creational Pattern
 - Singleton: Ensures only one RefundService exists so customers don't get refunded twice or more times.
@@ -24,6 +28,8 @@ SOLID Principles
 - Interface Segregation: Only exposes one high level behavior to refund a past order.
 """
 
+PAST_ORDERS: str = 'Databases/past_orders.json'
+
 
 class PastOrder:
     """
@@ -43,41 +49,103 @@ class RefundService(Singleton):
     """
     Singleton class for processing refunds of past orders.
     """
+    # Refunds are appended to the log and periodically compacted into the snapshot
+    log_path: str = 'Databases/refunds.log'
+    snapshot_path: str = 'Databases/refunds_snapshot.json'
+    # Base URL of a remote order system serving GET and POST /past_orders/<id>, e.g. stub_backend_server.py. Used
+    # instead of the JSON file and the refund log if set, the remote system keeps refunds durable.
+    url: str | None = None
 
     def __init__(self):
         # If already initialized, skip
         if self._initialized:
             return
-        # Load past orders from DB
-        with open('Databases/past_orders.json', 'r', encoding='utf-8') as f:
-            raw_orders: dict = json.load(f)
-            self.__orders: dict[int, PastOrder] = {
-                int(order_id): PastOrder(
-                    id=int(order_id),
-                    customer_name=data["customer_name"],
-                    delivery_date=data["delivery_date"],
-                    item=data["item"],
-                    quantity=data["quantity"],
-                    refunded=data["refunded"]
-                )
-                for order_id, data in raw_orders.items()
-            }
+        # Refunds of one order take turns, refunds of different orders run side by side
+        self.__locks: KeyedLock = KeyedLock()
+        self.__orders: Mapping[int, PastOrder]
+        self.__transport: HTTPTransport | None = None
+        self.__log: RefundLog | None = None
+        if self.url:  # Past orders live in another system, look each one up over HTTP
+            self.__transport = HTTPTransport(self.url)
+            self.__orders = RemoteMapping(self.__transport, '/past_orders', self.__past_order, make_key=int)
+            self._initialized = True
+            return
+        # Load past orders from DB, or from the snapshot of them if the DB has not changed
+        self.__orders = DataLoader.derive('past_orders', (PAST_ORDERS,), self.__load_orders)
+        # Reapply the refunds made since past_orders.json was written
+        self.__log = RefundLog(self.log_path, self.snapshot_path)
+        for order_id in self.__log.replay():
+            order: PastOrder | None = self.__orders.get(order_id)
+            if order is not None:
+                order.refunded = True
         # Mark as initialized
         self._initialized = True
 
+    @classmethod
+    def __load_orders(cls) -> dict[int, PastOrder]:
+        """
+        Builds every past order from the JSON DB, before the refund log is replayed.
+        :return: Order id -> past order.
+        """
+        raw_orders: dict = DataLoader.load(PAST_ORDERS, cache=False)
+        return {int(order_id): cls.__past_order(order_id, data) for order_id, data in raw_orders.items()}
+
+    @staticmethod
+    def __past_order(order_id: str | int, data: dict) -> PastOrder:
+        """
+        Builds a past order from its JSON record.
+        :param order_id: The order's id.
+        :param data: The order's record.
+        :return: The past order.
+        """
+        return PastOrder(
+            id=int(order_id),
+            customer_name=data["customer_name"],
+            delivery_date=data["delivery_date"],
+            item=data["item"],
+            quantity=data["quantity"],
+            refunded=data["refunded"]
+        )
+
     def refund_past_order(self, order_id: str) -> str:
         """
         Refunds a past order if it exists and has not already been refunded.
         :param order_id: The order ID corresponding to the past order that needs to be refunded.
         :return: Message explaining if the refund was successful, has already happened, or empty if the order did not exist.
         """
-        # Lookup the order from the DB
-        order: PastOrder = self.__orders.get(int(order_id))
-        if order is not None:  # If the order was found
-            if order.refunded:  # If the order was already refunded
-                return ResponseFactory.get_response('refund_already_processed').format(order_id=order_id)
-            else:  # The order was not already refunded
-                order.refunded = True
-                return ResponseFactory.get_response('refund_submitted').format(order_id=order_id)
-        else:  # Else the order was not found
+        try:  # Looks the order up once, a remote order is a request
+            refunded: bool = self.try_refund(int(order_id))
+        except KeyError:  # The order was not found
             return ''
+        if refunded:  # If we were the ones to refund it
+            return ResponseFactory.get_response('refund_submitted').format(order_id=order_id)
+        else:  # The order was already refunded
+            return ResponseFactory.get_response('refund_already_processed').format(order_id=order_id)
+
+    def try_refund(self, order_id: int) -> bool:
+        """
+        Atomically refunds an order unless it was already refunded, so an order can never be refunded twice.
+        :param order_id: Id of an existing past order.
+        :return: True if this call refunded the order, False if it had already been refunded.
+        :raises KeyError: If there is no past order with that id.
+        """
+        with self.__locks.hold(order_id):
+            order: PastOrder = self.__orders[order_id]  # Read under the lock, a remote order is fetched fresh
+            if order.refunded:
+                return False
+            if self.__transport is not None:  # The remote system records it
+                self.__transport.post_json(f'/past_orders/{order_id}', {'refunded': True})
+            else:
+                self.__log.append(order_id)  # Durable before we tell the customer
+            order.refunded = True
+            return True
+
+    def close(self) -> None:
+        """
+        Finishes any compaction and closes the refund log, or the connections to the remote system.
+        :return: None
+        """
+        if self.__transport is not None:
+            self.__transport.close()
+        else:
+            self.__log.close()
@@ -0,0 +1,282 @@
+import http.client, json, threading, time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from urllib.parse import quote, urlsplit
+
+"""
+OOP Principles
+- Encapsulation: Open connections, how many are allowed, and how failures are retried are private to the transport.
+- Abstraction: Services get and post JSON by path without knowing about sockets, keep-alive, or retries.
+- Inheritance: RemoteMapping inherits from Mapping.
+- Polymorphism: RemoteMapping can be used anywhere a dict loaded from a JSON file is.
+- Composition: HTTPTransport is composed of one ConnectionPool per host.
+
+Creational Pattern
+- Object Pool: Connections are kept open and reused instead of paying for a new connection on every request.
+
+Structural Pattern
+- Adapter: RemoteMapping adapts a remote JSON collection to the Mapping interface services already use.
+
+SOLID Principles
+- Single Responsibility: ConnectionPool only hands out connections, HTTPTransport only sends requests, RemoteMapping
+                         only looks records up.
+- Dependency Inversion: Services depend on a Mapping of records, not on where the records live.
+"""
+
+# Methods that are safe to send again if the first attempt failed part way
+_IDEMPOTENT: frozenset[str] = frozenset({'GET', 'HEAD', 'PUT', 'DELETE'})
+# Statuses that mean the server could not handle the request right now
+_RETRY_STATUSES: frozenset[int] = frozenset({502, 503, 504})
+
+
+class TransportError(Exception):
+    """
+    Raised when a request fails for good, after all its retries.
+    """
+
+
+class ConnectionPool:
+    """
+    Keep-alive connections to one host. At most max_connections are open at once, callers wait for a free one.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int | None, max_connections: int = 8, timeout: float = 2.0):
+        """
+        :param scheme: 'http' or 'https'.
+        :param host: Host name.
+        :param port: Port, None for the scheme's default.
+        :param max_connections: Most connections open to the host at once.
+        :param timeout: Seconds to wait to connect, for a response, or for a free connection.
+        """
+        self.__connection_class: type = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        self.__host: str = host
+        self.__port: int | None = port
+        self.__timeout: float = timeout
+        self.__slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_connections)
+        self.__idle: list[http.client.HTTPConnection] = []  # Most recently used last
+        self.__lock: threading.Lock = threading.Lock()
+        self.opened: int = 0  # Connections opened so far
+
+    @contextmanager
+    def connection(self) -> Iterator[tuple[http.client.HTTPConnection, bool]]:
+        """
+        Borrows a connection until the block exits. It goes back to the pool if the block succeeds and is closed if
+        the block raises, since it may be half way through a response.
+        :return: The connection, and whether it was used before and so may have been closed by the server.
+        :raises TransportError: If no connection frees up within the timeout.
+        """
+        if not self.__slots.acquire(timeout=self.__timeout):
+            raise TransportError(f'No free connection to {self.__host} within {self.__timeout}s')
+        try:
+            with self.__lock:
+                connection: http.client.HTTPConnection | None = self.__idle.pop() if self.__idle else None
+            reused: bool = connection is not None
+            if connection is None:
+                connection = self.__connection_class(self.__host, self.__port, timeout=self.__timeout)
+                with self.__lock:
+                    self.opened += 1
+            try:
+                yield connection, reused
+            except BaseException:
+                connection.close()
+                raise
+            if connection.sock is not None:  # Still open, keep it for the next request
+                with self.__lock:
+                    self.__idle.append(connection)
+        finally:
+            self.__slots.release()
+
+    def close(self) -> None:
+        """
+        Closes every idle connection.
+        :return: None
+        """
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+
+class HTTPTransport:
+    """
+    JSON over HTTP client with pooled keep-alive connections, a connection limit per host, timeouts, and retries with
+    exponential backoff. Idempotent requests are retried on network errors and 502, 503, and 504 responses, other
+    requests are only sent once. Thread-safe, so services talking to the same host should share one.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 8, timeout: float = 2.0, retries: int = 2,
+                 backoff: float = 0.05):
+        """
+        :param base_url: URL that request paths are relative to, e.g. 'http://orders.internal:8080'.
+        :param max_connections: Most connections open to each host at once.
+        :param timeout: Seconds to wait to connect, for a response, or for a free connection.
+        :param retries: Times an idempotent request is tried again after a failure.
+        :param backoff: Seconds to wait before the first retry, doubled for each retry after it.
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'Not an HTTP URL: {base_url!r}')
+        self.__scheme: str = parts.scheme
+        self.__base: tuple[str, int | None] = (parts.hostname, parts.port)
+        self.__prefix: str = parts.path.rstrip('/')
+        self.__max_connections: int = max_connections
+        self.__timeout: float = timeout
+        self.__retries: int = retries
+        self.__backoff: float = backoff
+        self.__pools: dict[tuple[str, int | None], ConnectionPool] = {}
+        self.__lock: threading.Lock = threading.Lock()
+
+    @property
+    def connections_opened(self) -> int:
+        """
+        :return: Connections opened so far across every host, a pooled transport opens far fewer than it sends requests.
+        """
+        return sum(pool.opened for pool in list(self.__pools.values()))
+
+    def get_json(self, path: str):
+        """
+        Gets a JSON document.
+        :param path: Path relative to the base URL, or an absolute URL.
+        :return: The decoded document, or None if there is none (404).
+        :raises TransportError: If the request failed.
+        """
+        return self.request('GET', path)[1]
+
+    def post_json(self, path: str, body):
+        """
+        Posts a JSON document.
+        :param path: Path relative to the base URL, or an absolute URL.
+        :param body: Anything json.dumps accepts.
+        :return: The decoded response, or None if it was empty or the path does not exist (404).
+        :raises TransportError: If the request failed.
+        """
+        return self.request('POST', path, body)[1]
+
+    def request(self, method: str, path: str, body=None) -> tuple[int, object]:
+        """
+        Sends a request, retrying it if it is idempotent and failed in a way that might not happen again.
+        :param method: HTTP method.
+        :param path: Path relative to the base URL, or an absolute URL.
+        :param body: Optional JSON body, anything json.dumps accepts.
+        :return: The status and the decoded response, None if it was empty or the status was 404.
+        :raises TransportError: If the request failed or got an error status other than 404.
+        """
+        pool, target = self.__route(path)
+        payload: bytes | None = None if body is None else json.dumps(body).encode('utf-8')
+        headers: dict[str, str] = {'Accept': 'application/json'}
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+        attempts: int = 1 + (self.__retries if method in _IDEMPOTENT else 0)
+        attempt: int = 0
+        while True:
+            try:
+                status, data = self.__send(pool, method, target, payload, headers)
+            except (OSError, http.client.HTTPException) as error:
+                failure: str = f'{method} {target} failed: {error!r}'
+            else:
+                if status not in _RETRY_STATUSES:
+                    return self.__decode(method, target, status, data)
+                failure = f'{method} {target} got {status}'
+            attempt += 1
+            if attempt >= attempts:
+                raise TransportError(failure)
+            time.sleep(self.__backoff * 2 ** (attempt - 1))
+
+    def close(self) -> None:
+        """
+        Closes every idle connection.
+        :return: None
+        """
+        for pool in list(self.__pools.values()):
+            pool.close()
+
+    def __send(self, pool: ConnectionPool, method: str, target: str, payload: bytes | None,
+               headers: dict[str, str]) -> tuple[int, bytes]:
+        """
+        Sends a request once over a pooled connection. A reused connection the server has already closed is
+        replaced by a fresh one without counting as a retry.
+        :return: The status and the raw response body.
+        """
+        while True:
+            reused: bool = False
+            try:
+                with pool.connection() as (connection, reused):
+                    connection.request(method, target, body=payload, headers=headers)
+                    response: http.client.HTTPResponse = connection.getresponse()
+                    data: bytes = response.read()  # Read it all so the connection can be reused
+                    if response.will_close:
+                        connection.close()
+                    return response.status, data
+            except (ConnectionError, http.client.RemoteDisconnected, http.client.CannotSendRequest):
+                if not reused:
+                    raise
+                # Went stale while idle and the pool dropped it, try again on a fresh connection
+
+    def __decode(self, method: str, target: str, status: int, data: bytes) -> tuple[int, object]:
+        """
+        Decodes a final response.
+        :return: The status and the decoded JSON, None if it was empty or the status was 404.
+        :raises TransportError: If the status is an error other than 404 or the body is not JSON.
+        """
+        if status == 404:
+            return status, None
+        if status >= 400:
+            raise TransportError(f'{method} {target} got {status}')
+        try:
+            return status, json.loads(data) if data else None
+        except ValueError as error:
+            raise TransportError(f'{method} {target} did not return JSON: {error}') from error
+
+    def __route(self, path: str) -> tuple[ConnectionPool, str]:
+        """
+        Finds the pool for a request's host and the target to send.
+        :param path: Path relative to the base URL, or an absolute URL.
+        :return: The pool and the request target.
+        """
+        if '://' in path:
+            parts = urlsplit(path)
+            host: tuple[str, int | None] = (parts.hostname, parts.port)
+            target: str = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        else:
+            host = self.__base
+            target = f'{self.__prefix}/{path.lstrip("/")}'
+        pool: ConnectionPool | None = self.__pools.get(host)
+        if pool is None:
+            with self.__lock:
+                pool = self.__pools.setdefault(host, ConnectionPool(self.__scheme, host[0], host[1],
+                                                                    self.__max_connections, self.__timeout))
+        return pool, target
+
+
+class RemoteMapping(Mapping):
+    """
+    Read-only mapping over a remote JSON collection, where GET <path> lists the collection and GET <path>/<key>
+    returns one record. Every lookup is a request, nothing is cached.
+    """
+
+    def __init__(self, transport: HTTPTransport, path: str, make_value: Callable[[object, object], object],
+                 make_key: Callable[[str], object] = str):
+        """
+        :param transport: The transport to the remote system.
+        :param path: Path of the collection, e.g. '/orders'.
+        :param make_value: Builds a value from its key and its decoded record.
+        :param make_key: Builds a key from its string form in the collection, e.g. int.
+        """
+        self.__transport: HTTPTransport = transport
+        self.__path: str = path.rstrip('/')
+        self.__make_value: Callable[[object, object], object] = make_value
+        self.__make_key: Callable[[str], object] = make_key
+
+    def __getitem__(self, key):
+        record = self.__transport.get_json(f'{self.__path}/{quote(str(key), safe="")}')
+        if record is None:
+            raise KeyError(key)
+        return self.__make_value(key, record)
+
+    def __iter__(self) -> Iterator:
+        collection = self.__transport.get_json(self.__path) or {}
+        return (self.__make_key(key) for key in collection)
+
+    def __len__(self) -> int:
+        return len(self.__transport.get_json(self.__path) or {})
@@ -1,12 +1,22 @@
+import contextvars, threading, time
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from typing import Callable
+
 from PirateEase.Services.exit_service import ExitService
 from PirateEase.Services.inventory_service import InventoryService
 from PirateEase.Services.live_agent_notifier import LiveAgentService
 from PirateEase.Services.order_service import OrderService
 from PirateEase.Services.refund_service import RefundService
+from PirateEase.Services.transport import TransportError
+from PirateEase.Utils.circuit_breaker import CircuitBreaker
+from PirateEase.Utils.request_coalescer import RequestCoalescer
+from PirateEase.Utils.response_factory import ResponseFactory
 from PirateEase.Utils.singleton import Singleton
 
 """
 OOP Principles:
+- Encapsulation: The dispatch table, the endpoints bound so far, and the call counters are private.
 - Abstraction: BackendManager exposes a simple method process_request which hides the complexity of interacting
                with various services.
 - Inheritance: Inherits from Singleton
@@ -14,38 +24,528 @@ OOP Principles:
 Creational Pattern:
 - Singleton: Ensures there is only one instance of BackendManager across the program for central coordination 
              and to avoid duplication.
+- Lazy Initialization: Each endpoint is bound to its service the first time its request type arrives, so a service
+                       only loads its data once somebody needs it.
              
 Behavioral Pattern:
 - Facade: process_request acts a single unified interface for multiple subsystems which simplifies client 
           interaction. This also decouples client code from the internal services which makes adding/changing
           services easier. For example, if there was a bug in one of the services, this code would not need
           to be changed.
+- Command: Every request type maps to a callable endpoint registered in a dispatch table.
+- Leader/Followers: Concurrent requests of idempotent types are coalesced, see RequestCoalescer.
+- Circuit Breaker: Services that keep failing or running over their latency budget are skipped for a while, callers
+                   get a canned reply straight away instead of waiting on them.
           
 SOLID Principles:
 - Single Responsibility: BackendManager just coordinates request routing while each service handles its own logic.
+- Open/Closed: New request types are registered, process_request does not change.
 """
 
+# Builds a request type's endpoint, a callable taking the request data
+EndpointFactory = Callable[[], Callable[[str], object]]
+# Builds a request type's batch endpoint, a callable taking a list of request data and returning a list of results
+BatchFactory = Callable[[], Callable[[list[str]], list]]
+# Failures that mean a service is unhealthy rather than that the request was bad
+SERVICE_FAILURES: tuple[type[Exception], ...] = (TimeoutError, OSError, TransportError)
+
+
+class DegradedResponse(str):
+    """
+    Canned reply given instead of a service's response when the service is degraded. Handlers can tell it apart from
+    a real response with isinstance.
+    """
+
+
+class PendingResponse(str):
+    """
+    Reply given instead of a write's response when the write ran over its budget. Unlike a DegradedResponse the write
+    was sent and is still running, so it may well go through and must not be retried as if it failed.
+    """
+
 
 class BackendManager(Singleton):
     """
     Singleton class that manages requests to the backend.
     """
+    # Request type -> (builds its endpoint, builds its batch endpoint or None)
+    __registry: dict[str, tuple[EndpointFactory, BatchFactory | None]] = {}
+    __endpoints: dict[str, Callable[[str], object]] = {}  # Endpoints bound so far
+    __batch_endpoints: dict[str, Callable[[list[str]], list]] = {}  # Batch endpoints bound so far
+    __calls: Counter = Counter()  # Request type -> requests served
+    __seconds: defaultdict = defaultdict(float)  # Request type -> seconds spent serving them
+    __idempotent: set[str] = set()  # Request types whose concurrent identical requests can share one answer
+    __coalescer: RequestCoalescer | None = None
+    __budgets: dict[str, float] = {}  # Request type -> seconds a caller waits for its response at most
+    __hedges: dict[str, float] = {}  # Request type -> seconds after which a second identical request is sent
+    __breakers: dict[str, CircuitBreaker] = {}  # Service -> its breaker, shared by the request types it answers
+    __service_of: dict[str, str] = {}  # Request type -> the service answering it
+    __degraded: Counter = Counter()  # Request type -> requests answered with a canned reply
+    __pending: Counter = Counter()  # Request type -> writes answered as still processing
+    __hedged: Counter = Counter()  # Request type -> requests that were sent twice
+    __executor: ThreadPoolExecutor | None = None
+    __lock: threading.Lock = threading.Lock()
+    # Seconds a coalescing leader waits for more requests to join its batch, 0 serves at once
+    coalesce_window: float = 0.0
+    # Failures or timeouts in a row that open a service's breaker, and seconds until a trial request is let through
+    failure_threshold: int = 5
+    reset_after: float = 30.0
+    # Most budgeted requests running at once, including ones that ran over budget and were abandoned
+    max_workers: int = 32
 
-    @staticmethod
-    def process_request(request_type: str, data: str = ''):
+    @classmethod
+    def register(cls, request_type: str, endpoint: EndpointFactory, batch: BatchFactory | None = None,
+                 idempotent: bool = False, budget: float | None = None, hedge_after: float | None = None,
+                 service: str | None = None) -> None:
+        """
+        Registers the service endpoint that answers a request type, replacing any endpoint registered before.
+        :param request_type: The type of request.
+        :param endpoint: Builds the callable that answers one request, e.g. lambda: OrderService().retrieve_order.
+        :param batch: Optionally builds a callable that answers a list of requests in one go.
+        :param idempotent: True if identical requests always get the same answer and change nothing, so concurrent
+                           ones can share a single backend call.
+        :param budget: Seconds a caller waits for a response at most before getting a canned reply. Budgeted requests
+                       also go through their service's circuit breaker. None waits as long as the service takes.
+        :param hedge_after: Seconds after which an idempotent request that has not been answered is sent again, the
+                            first response wins. Only used with a budget.
+        :param service: Name of the service answering the request, request types with the same service share a
+                        circuit breaker. Defaults to the request type.
+        :return: None
         """
-        Maps request types to their respective services in the backend.
+        if hedge_after is not None and not idempotent:
+            raise ValueError(f'Only idempotent requests can be hedged: {request_type!r}')
+        with cls.__lock:
+            cls.__registry[request_type] = (endpoint, batch)
+            service = service or request_type
+            cls.__service_of[request_type] = service
+            if budget is None:
+                cls.__budgets.pop(request_type, None)
+            else:
+                cls.__budgets[request_type] = budget
+                cls.__breakers.setdefault(service, CircuitBreaker(cls.failure_threshold, cls.reset_after))
+            if hedge_after is None:
+                cls.__hedges.pop(request_type, None)
+            else:
+                cls.__hedges[request_type] = hedge_after
+            if idempotent:
+                cls.__idempotent.add(request_type)
+            else:
+                cls.__idempotent.discard(request_type)
+            cls.__endpoints.pop(request_type, None)
+            cls.__batch_endpoints.pop(request_type, None)
+
+    @classmethod
+    def request_types(cls) -> list[str]:
+        """
+        Gets the registered request types.
+        :return: List of request types.
+        """
+        return list(cls.__registry)
+
+    @classmethod
+    def process_request(cls, request_type: str, data: str = ''):
+        """
+        Routes a request to the service endpoint registered for its type. Identical requests of idempotent types made
+        by other sessions at the same time share one backend call.
         :param request_type: The type of service you are routing a request to.
         :param data: Optional data if service you are routing to requires it.
         :return: Response from the respective service.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        if request_type in cls.__idempotent:
+            coalescer: RequestCoalescer | None = cls.__coalescer
+            if coalescer is None:
+                coalescer = cls.__make_coalescer()
+            return coalescer.request(request_type, data)
+        return cls.__call(request_type, data)
+
+    @classmethod
+    def process_requests(cls, requests: list[tuple[str, str]]) -> list:
+        """
+        Routes many requests at once, in order. Each run of idempotent requests between two non-idempotent ones is
+        grouped by type, and identical requests in it are answered by one backend call per unique data, using the
+        type's batch endpoint if it has one. So a lookup listed before a refund never sees it, and one listed after
+        always does.
+        :param requests: (request type, data) pairs.
+        :return: List of responses, in the same order as requests.
+        :raises ValueError: If nothing is registered for one of the request types.
+        """
+        responses: list = [None] * len(requests)
+        groups: dict[str, dict[str, list[int]]] = {}  # request type -> data -> positions asking for it
+        for position, (request_type, data) in enumerate(requests):
+            if request_type in cls.__idempotent:
+                groups.setdefault(request_type, {}).setdefault(data, []).append(position)
+            else:  # Every one of these has to reach its service, after the lookups before it
+                cls.__serve_groups(groups, responses)
+                responses[position] = cls.__call(request_type, data)
+        cls.__serve_groups(groups, responses)
+        return responses
+
+    @classmethod
+    def __serve_groups(cls, groups: dict[str, dict[str, list[int]]], responses: list) -> None:
+        """
+        Serves grouped idempotent requests, one call per type, and empties the groups.
+        :param groups: Request type -> data -> positions asking for it.
+        :param responses: Responses to fill in at those positions.
+        :return: None
+        """
+        for request_type, positions in groups.items():
+            items: list[str] = list(positions)
+            for data, response in zip(items, cls.__serve(request_type, items)):
+                for position in positions[data]:
+                    responses[position] = response
+        groups.clear()
+
+    @classmethod
+    def process_batch(cls, request_type: str, items: list[str]) -> list:
+        """
+        Routes a list of requests of one type to the service. Uses the type's batch endpoint if it has one, otherwise
+        answers them one by one. Each request in the batch gets its own budget, hedge, and say in its service's
+        circuit breaker, as if it had been sent alone, so only the ones that were not answered get a canned reply.
+        :param request_type: The type of service you are routing the requests to.
+        :param items: The data of each request.
+        :return: List of responses, in the same order as items.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        batch: Callable[[list[str]], list] | None = cls.__batch_endpoints.get(request_type)
+        if batch is None:
+            batch = cls.__bind_batch(request_type)
+        start: float = time.perf_counter()
+        try:
+            budget: float | None = cls.__budgets.get(request_type)
+            if budget is None:  # Local and cheap, call it right here
+                return batch(items)
+            breaker: CircuitBreaker = cls.__breakers[cls.__service_of[request_type]]
+            if not breaker.allow():  # Fail fast while the service recovers
+                return [cls.__degrade(request_type) for _ in items]
+            responses: list = []
+            bad_request: Exception | None = None
+            for response, error in cls.__batch_within_budget(request_type, batch, items, budget):
+                if isinstance(error, SERVICE_FAILURES):
+                    breaker.record_failure()
+                    responses.append(cls.__fail(request_type, error))
+                else:  # The service answered, even if the request itself was bad
+                    breaker.record_success()
+                    bad_request = bad_request or error
+                    responses.append(response)
+            if bad_request is not None:
+                raise bad_request
+            return responses
+        finally:
+            cls.__record(request_type, len(items), time.perf_counter() - start)
+
+    @classmethod
+    def stats(cls) -> dict[str, dict]:
+        """
+        Gets how many requests of each type were served, how long they took, and how their service is doing.
+        :return: Dictionary mapping request types to their calls, total seconds, mean milliseconds per call, requests
+                 answered with a canned reply, writes answered as still processing, requests sent twice, and the state
+                 of their service's breaker if any.
+        """
+        with cls.__lock:
+            stats: dict[str, dict] = {}
+            for request_type, calls in cls.__calls.items():
+                if not calls:
+                    continue
+                stats[request_type] = {'calls': calls, 'seconds': cls.__seconds[request_type],
+                                       'mean_ms': cls.__seconds[request_type] * 1000 / calls,
+                                       'degraded': cls.__degraded[request_type], 'pending': cls.__pending[request_type],
+                                       'hedged': cls.__hedged[request_type]}
+                breaker: CircuitBreaker | None = cls.__breakers.get(cls.__service_of.get(request_type))
+                if breaker is not None:
+                    stats[request_type]['breaker'] = breaker.state
+            return stats
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        For testing purposes. Also forgets bound endpoints, so they are bound again to fresh services, and the stats.
+        :return: None
+        """
+        super().reset()
+        with cls.__lock:
+            cls.__endpoints.clear()
+            cls.__batch_endpoints.clear()
+            cls.__coalescer = None
+            cls.__calls.clear()
+            cls.__seconds.clear()
+            cls.__degraded.clear()
+            cls.__pending.clear()
+            cls.__hedged.clear()
+            for service in cls.__breakers:  # Close every breaker
+                cls.__breakers[service] = CircuitBreaker(cls.failure_threshold, cls.reset_after)
+
+    @classmethod
+    def __call(cls, request_type: str, data: str):
+        """
+        Calls a request type's endpoint and counts the call.
+        :param request_type: The type of request.
+        :param data: The request's data.
+        :return: The endpoint's response.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        endpoint: Callable[[str], object] | None = cls.__endpoints.get(request_type)
+        if endpoint is None:
+            endpoint = cls.__bind(request_type)
+        return cls.__invoke(request_type, endpoint, data)
+
+    @classmethod
+    def __invoke(cls, request_type: str, call: Callable[[str], object], data: str):
+        """
+        Calls an endpoint within its request type's latency budget and its service's circuit breaker, and counts it.
+        :param request_type: The type of request.
+        :param call: The endpoint.
+        :param data: The request's data.
+        :return: The endpoint's response, or the canned or processing reply.
+        """
+        start: float = time.perf_counter()
+        try:
+            budget: float | None = cls.__budgets.get(request_type)
+            if budget is None:  # Local and cheap, call it right here
+                return call(data)
+            breaker: CircuitBreaker = cls.__breakers[cls.__service_of[request_type]]
+            if not breaker.allow():  # Fail fast while the service recovers
+                return cls.__degrade(request_type)
+            try:
+                response = cls.__within_budget(request_type, call, data, budget)
+            except SERVICE_FAILURES as error:
+                breaker.record_failure()
+                return cls.__fail(request_type, error)
+            except Exception:  # The service answered, the request itself was bad
+                breaker.record_success()
+                raise
+            breaker.record_success()
+            return response
+        finally:
+            cls.__record(request_type, 1, time.perf_counter() - start)
+
+    @classmethod
+    def __within_budget(cls, request_type: str, call: Callable, argument, budget: float):
+        """
+        Runs a call on the worker pool and waits for it no longer than the budget. Hedged request types send the call
+        again if it is still running after their hedge delay, and take whichever answers first.
+        :return: The first successful response.
+        :raises TimeoutError: If nothing answered within the budget.
+        """
+        executor: ThreadPoolExecutor = cls.__executor or cls.__make_executor()
+        deadline: float = time.monotonic() + budget
+        # Copy the caller's context so the call still sees the current session
+        futures: list[Future] = [executor.submit(contextvars.copy_context().run, call, argument)]
+        hedge_after: float | None = cls.__hedges.get(request_type)
+        if hedge_after is not None and hedge_after < budget and not wait(futures, timeout=hedge_after).done:
+            futures.append(executor.submit(contextvars.copy_context().run, call, argument))
+            with cls.__lock:
+                cls.__hedged[request_type] += 1
+        error: BaseException | None = None
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
+        except FuturesTimeoutError:
+            raise TimeoutError(f'{request_type!r} took longer than its {budget}s budget') from None
+        raise error
+
+    @classmethod
+    def __batch_within_budget(cls, request_type: str, batch: Callable[[list[str]], list], items: list[str],
+                              budget: float) -> list[tuple[object, Exception | None]]:
+        """
+        Runs a batch call on the worker pool and waits for each of its requests no longer than the budget. Hedged
+        request types send every request still unanswered after their hedge delay again on its own, and each takes
+        whichever answers first, so a slow batch holds no request up for longer than a request of its own.
+        :return: (response, None) or (None, why it failed) for each item, in the same order.
+        """
+        executor: ThreadPoolExecutor = cls.__executor or cls.__make_executor()
+        deadline: float = time.monotonic() + budget
+        whole: Future = executor.submit(contextvars.copy_context().run, batch, items)
+        candidates: list[list[Future]] = [[whole] for _ in items]  # What may answer each request
+        hedge_after: float | None = cls.__hedges.get(request_type)
+        if hedge_after is not None and hedge_after < budget and not wait([whole], timeout=hedge_after).done:
+            single: Callable[[str], object] = cls.__endpoints.get(request_type) or cls.__bind(request_type)
+            for data, futures in zip(items, candidates):
+                futures.append(executor.submit(contextvars.copy_context().run, single, data))
+            with cls.__lock:
+                cls.__hedged[request_type] += len(items)
+        outcomes: list[tuple[object, Exception | None]] = []
+        for position, futures in enumerate(candidates):
+            error: Exception | None = None
+            try:
+                for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                    if future.exception() is None:
+                        outcomes.append((future.result()[position] if future is whole else future.result(), None))
+                        break
+                    error = error or future.exception()
+                else:
+                    outcomes.append((None, error))
+            except FuturesTimeoutError:
+                outcomes.append((None, TimeoutError(f'{request_type!r} took longer than its {budget}s budget')))
+        return outcomes
+
+    @classmethod
+    def __fail(cls, request_type: str, error: Exception):
         """
-        if request_type == "order":
-            return OrderService().retrieve_order(data)
-        elif request_type == "refund":
-            return RefundService().refund_past_order(data)
-        elif request_type == "inventory":
-            return InventoryService().check_availability(data)
-        elif request_type == "agent":
-            return LiveAgentService().get_available_agent()
-        elif request_type == "exit":
-            return ExitService().get_exit_response()
\ No newline at end of file
+        Answers a request its service failed. A write that ran over its budget keeps running, and the caller is told
+        it is processing rather than that it failed.
+        :param request_type: The type of request.
+        :param error: Why it failed.
+        :return: The processing or canned reply.
+        """
+        if isinstance(error, TimeoutError) and request_type not in cls.__idempotent:
+            with cls.__lock:  # Its outcome is unknown, it may already have gone through
+                cls.__pending[request_type] += 1
+            return cls.__pending_response()
+        return cls.__degrade(request_type)
+
+    @classmethod
+    def __degrade(cls, request_type: str) -> DegradedResponse:
+        """
+        Counts a request answered with a canned reply and builds it.
+        :return: The canned reply.
+        """
+        with cls.__lock:
+            cls.__degraded[request_type] += 1
+        return cls.__degraded_response()
+
+    @staticmethod
+    def __degraded_response() -> DegradedResponse:
+        """
+        :return: A canned reply for a degraded service.
+        """
+        return DegradedResponse(ResponseFactory.get_response('service_degraded'))
+
+    @staticmethod
+    def __pending_response() -> PendingResponse:
+        """
+        :return: A reply for a write that is still processing.
+        """
+        return PendingResponse(ResponseFactory.get_response('request_processing'))
+
+    @classmethod
+    def __make_executor(cls) -> ThreadPoolExecutor:
+        """
+        Builds the worker pool budgeted requests run on.
+        :return: The pool.
+        """
+        with cls.__lock:
+            if cls.__executor is None:
+                cls.__executor = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix='backend')
+            return cls.__executor
+
+    @classmethod
+    def __serve(cls, request_type: str, items: list[str]) -> list:
+        """
+        Serves unique requests of one type, a single one through the plain endpoint.
+        :param request_type: The type of request.
+        :param items: The data of each request.
+        :return: List of responses, in the same order as items.
+        """
+        if len(items) == 1:
+            return [cls.__call(request_type, items[0])]
+        return cls.process_batch(request_type, items)
+
+    @classmethod
+    def __has_batch(cls, request_type: str) -> bool:
+        """
+        :param request_type: The type of request.
+        :return: True if the request type has a batch endpoint, so its concurrent requests are worth batching.
+        """
+        return cls.__factories(request_type)[1] is not None
+
+    @classmethod
+    def __make_coalescer(cls) -> RequestCoalescer:
+        """
+        Builds the coalescer shared by every idempotent request.
+        :return: The coalescer.
+        """
+        with cls.__lock:
+            if cls.__coalescer is None:
+                cls.__coalescer = RequestCoalescer(cls.__serve, cls.__has_batch, cls.coalesce_window)
+            return cls.__coalescer
+
+    @classmethod
+    def __bind(cls, request_type: str) -> Callable[[str], object]:
+        """
+        Binds a request type's endpoint to its service.
+        :param request_type: The type of request.
+        :return: The endpoint answering one request.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        with cls.__lock:
+            endpoint: Callable[[str], object] | None = cls.__endpoints.get(request_type)
+            if endpoint is None:  # Otherwise another thread got here first
+                endpoint = cls.__factories(request_type)[0]()
+                cls.__endpoints[request_type] = endpoint
+            return endpoint
+
+    @classmethod
+    def __bind_batch(cls, request_type: str) -> Callable[[list[str]], list]:
+        """
+        Binds a request type's batch endpoint to its service. Types without one answer each request in turn.
+        :param request_type: The type of request.
+        :return: The endpoint answering a list of requests.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        batch_factory: BatchFactory | None = cls.__factories(request_type)[1]
+        if batch_factory is None:
+            endpoint: Callable[[str], object] = cls.__endpoints.get(request_type) or cls.__bind(request_type)
+            batch: Callable[[list[str]], list] = lambda items: [endpoint(data) for data in items]
+        else:
+            batch = batch_factory()
+        with cls.__lock:
+            return cls.__batch_endpoints.setdefault(request_type, batch)
+
+    @classmethod
+    def __factories(cls, request_type: str) -> tuple[EndpointFactory, BatchFactory | None]:
+        """
+        Gets what builds a request type's endpoints.
+        :param request_type: The type of request.
+        :return: Builder of its endpoint and builder of its batch endpoint or None.
+        :raises ValueError: If nothing is registered for the request type.
+        """
+        factories: tuple[EndpointFactory, BatchFactory | None] | None = cls.__registry.get(request_type)
+        if factories is None:
+            raise ValueError(f'Unknown request type: {request_type!r}')
+        return factories
+
+    @classmethod
+    def __record(cls, request_type: str, calls: int, seconds: float) -> None:
+        """
+        Adds to a request type's counters.
+        :param request_type: The type of request.
+        :param calls: Requests served.
+        :param seconds: Time spent serving them.
+        :return: None
+        """
+        with cls.__lock:
+            cls.__calls[request_type] += calls
+            cls.__seconds[request_type] += seconds
+
+
+def _agent_endpoint() -> Callable[[str], object]:
+    """
+    Binds the agent request, whose data is 'urgent' for escalations caused by negative sentiment.
+    :return: The endpoint.
+    """
+    get_available_agent = LiveAgentService().get_available_agent
+    return lambda data='': get_available_agent(urgent=data == 'urgent')
+
+
+def _exit_endpoint() -> Callable[[str], str]:
+    """
+    Binds the exit request, which takes no data.
+    :return: The endpoint.
+    """
+    get_exit_response = ExitService().get_exit_response
+    return lambda data='': get_exit_response()
+
+
+# Agents and exit are answered in process, the rest are budgeted since they may live in other systems
+BackendManager.register('order', lambda: OrderService().retrieve_order, batch=lambda: OrderService().retrieve_orders,
+                        idempotent=True, budget=1.0, hedge_after=0.25)
+BackendManager.register('refund', lambda: RefundService().refund_past_order, budget=2.0, service='refunds')
+BackendManager.register('refund_id', lambda: RefundService().refund_past_order,  # Refund already asked for this chat
+                        budget=2.0, service='refunds')
+BackendManager.register('inventory', lambda: InventoryService().check_availability, idempotent=True, budget=1.0,
+                        hedge_after=0.25)
+BackendManager.register('agent', _agent_endpoint)
+BackendManager.register('exit', _exit_endpoint)
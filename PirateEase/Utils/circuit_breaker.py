@@ -0,0 +1,83 @@
+import threading, time
+from typing import Callable
+
+"""
+OOP Principles
+- Encapsulation: The failure count, the state, and when the breaker opened are private.
+- Abstraction: Callers ask whether a call is allowed and report how it went, the state machine stays hidden.
+
+Behavioral Pattern
+- State: The breaker moves between closed, open, and half open, and allows calls differently in each.
+- Strategy: The clock is injected, so tests can open and close the breaker without waiting.
+
+SOLID Principles
+- Single Responsibility: Only decides whether a service looks healthy enough to call.
+- Interface Segregation: Exposes allow, record_success, and record_failure.
+"""
+
+CLOSED: str = 'closed'  # Healthy, every call goes through
+OPEN: str = 'open'  # Failing, calls fail fast until reset_after has passed
+HALF_OPEN: str = 'half_open'  # One trial call decides whether to close again
+
+
+class CircuitBreaker:
+    """
+    Stops calling a service after it fails failure_threshold times in a row. Once reset_after seconds have passed a
+    single trial call is let through, closing the breaker if it succeeds and opening it again if it fails.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param failure_threshold: Failures in a row that open the breaker.
+        :param reset_after: Seconds the breaker stays open before letting a trial call through.
+        :param clock: Returns the current time in seconds.
+        """
+        self.__failure_threshold: int = failure_threshold
+        self.__reset_after: float = reset_after
+        self.__clock: Callable[[], float] = clock
+        self.__lock: threading.Lock = threading.Lock()
+        self.__state: str = CLOSED
+        self.__failures: int = 0
+        self.__opened_at: float = 0.0
+
+    @property
+    def state(self) -> str:
+        """
+        :return: CLOSED, OPEN, or HALF_OPEN.
+        """
+        return self.__state
+
+    def allow(self) -> bool:
+        """
+        Checks whether a call may go through. Once the breaker has been open long enough, the first caller to ask gets
+        the trial call and everybody else keeps failing fast until it reports back.
+        :return: True if the call may go through.
+        """
+        with self.__lock:
+            if self.__state == CLOSED:
+                return True
+            if self.__state == OPEN and self.__clock() - self.__opened_at >= self.__reset_after:
+                self.__state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Reports a call that succeeded, closing the breaker.
+        :return: None
+        """
+        with self.__lock:
+            self.__state = CLOSED
+            self.__failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Reports a call that failed or ran out of time, opening the breaker if it was the trial call or one too many.
+        :return: None
+        """
+        with self.__lock:
+            self.__failures += 1
+            if self.__state == HALF_OPEN or self.__failures >= self.__failure_threshold:
+                self.__state = OPEN
+                self.__opened_at = self.__clock()
@@ -0,0 +1,243 @@
+import hashlib, json, mmap, os, pickle, threading
+from typing import Callable, TypeVar
+
+"""
+OOP Principles
+- Encapsulation: The parsed file cache and the snapshot format are private to DataLoader.
+- Abstraction: Callers ask for a file's contents or a structure built from files, without knowing whether it was
+               parsed, built, or read back from a snapshot.
+
+Creational Pattern
+- Lazy Initialization: Nothing is parsed or built until somebody asks for it.
+
+Structural Pattern
+- Proxy: derive stands in front of expensive builders and answers from a snapshot when the sources have not changed.
+
+SOLID Principles
+- Single Responsibility: Only reads databases and caches what is built from them.
+- Open/Closed: Any structure can be snapshotted by passing its builder, nothing here changes.
+- Dependency Inversion: Classes that need data depend on DataLoader, not on file formats or caching.
+"""
+
+T = TypeVar('T')
+
+# Bump when the snapshot layout changes, every old snapshot is then rebuilt
+SNAPSHOT_FORMAT: int = 1
+
+
+class DataLoader:
+    """
+    Central loader for the JSON databases. load parses each file once and shares the result until the file changes.
+    derive builds a structure from one or more files and saves it to a versioned binary snapshot keyed by the SHA-256
+    of every source and of the package's code, so a warm restart maps the snapshot instead of parsing and building
+    again. Files that cannot be
+    found are read and built every time without caching, e.g. when tests stand in for them.
+    """
+    # Where snapshots are written, relative to the working directory like the databases
+    snapshot_dir: str = 'Databases/.snapshots'
+    # Set to False to always build, e.g. on a read-only deployment
+    snapshots: bool = True
+    __parsed: dict[str, tuple[tuple[int, int, int], object]] = {}  # Path -> (file identity when parsed, contents)
+    __lock: threading.Lock = threading.Lock()
+    __code: str | None = None  # SHA-256 of the package's source, hashed on first use
+
+    @classmethod
+    def load(cls, path: str, cache: bool = True):
+        """
+        Gets the parsed contents of a JSON file, parsing it only if it changed since it was last parsed. Callers share
+        the result and must not modify it.
+        :param path: Path of the JSON file.
+        :param cache: False to parse without keeping the result, for big files only read once to build something.
+        :return: The parsed contents.
+        """
+        identity: tuple[int, int, int] | None = cls.identity(path)
+        if identity is None or not cache:
+            return cls.__parse(path)
+        cached: tuple[tuple[int, int, int], object] | None = cls.__parsed.get(path)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+        data = cls.__parse(path)
+        with cls.__lock:
+            cls.__parsed[path] = (identity, data)
+        return data
+
+    @classmethod
+    def derive(cls, name: str, sources: tuple[str, ...], build: Callable[[], T], version: int = 1) -> T:
+        """
+        Gets a structure built from source files, from its snapshot if every source is unchanged. Otherwise builds it
+        and saves a new snapshot. Every call returns a new object, so callers may modify it.
+        :param name: Name of the snapshot, unique per structure.
+        :param sources: Paths of every file the structure is built from.
+        :param build: Builds the structure.
+        :param version: Bump when build changes, so snapshots of the old structure are rebuilt. Snapshots are also
+                        rebuilt whenever any code in the package changes, in case nobody bumped it.
+        :return: The structure.
+        """
+        if not cls.snapshots:
+            return build()
+        identities: list[tuple[int, int, int] | None] = [cls.identity(path) for path in sources]
+        if None in identities:  # Cannot be snapshotted, build it every time
+            return build()
+        digests: dict[str, str] = {path: cls.__digest(path) for path in sources}
+        header: dict = {'format': SNAPSHOT_FORMAT, 'version': version, 'code': cls.__fingerprint(), 'sources': digests}
+        snapshot: str = os.path.join(cls.snapshot_dir, f'{name}.pickle')
+        try:
+            with open(snapshot, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if pickle.load(mapped) == header:  # Only unpickle the structure if it is still current
+                    return pickle.load(mapped)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            pass  # Missing, empty, corrupt, or written by code that no longer exists
+        value: T = build()
+        if cls.__unchanged(sources, identities):  # Otherwise the value may not match the digests
+            cls.__save(snapshot, header, value)
+        return value
+
+    @classmethod
+    def compile(cls, source: str, snapshot: str) -> None:
+        """
+        Parses a JSON file into a snapshot that can be shipped and read with read_snapshot, e.g. by workers that should
+        not parse JSON on startup.
+        :param source: Path of the JSON file.
+        :param snapshot: Path to write the snapshot to.
+        :return: None
+        :raises OSError: If the file cannot be read or the snapshot cannot be written.
+        """
+        header: dict = {'format': SNAPSHOT_FORMAT, 'version': 1, 'sources': {source: cls.__digest(source)}}
+        cls.__write(snapshot, header, cls.load(source, cache=False))
+
+    @classmethod
+    def read_snapshot(cls, snapshot: str, source: str | None = None):
+        """
+        Reads a snapshot written by compile. If the file it was compiled from can be found, it must not have changed.
+        :param snapshot: Path of the snapshot.
+        :param source: Optional path of the file it was compiled from.
+        :return: The parsed contents.
+        :raises OSError: If the snapshot cannot be read.
+        :raises ValueError: If it is not a snapshot, or is older than its source.
+        """
+        with open(snapshot, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            try:
+                header = pickle.load(mapped)
+                if not isinstance(header, dict) or header.get('format') != SNAPSHOT_FORMAT:
+                    raise ValueError(f'{snapshot} is not a snapshot of this format')
+                if source is not None and cls.identity(source) is not None and \
+                        cls.__digest(source) not in header['sources'].values():
+                    raise ValueError(f'{snapshot} is older than {source}, compile it again')
+                return pickle.load(mapped)
+            except (EOFError, pickle.UnpicklingError, AttributeError, ImportError) as error:
+                raise ValueError(f'{snapshot} is not a snapshot of this format') from error
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Forgets every parsed file. Snapshots on disk are kept.
+        :return: None
+        """
+        with cls.__lock:
+            cls.__parsed.clear()
+
+    @staticmethod
+    def identity(path: str) -> tuple[int, int, int] | None:
+        """
+        Gets what identifies a version of a file without reading it.
+        :param path: Path of the file.
+        :return: Its modification time, size, and inode, or None if it cannot be found.
+        """
+        try:
+            stat: os.stat_result = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @classmethod
+    def __unchanged(cls, sources: tuple[str, ...], identities: list[tuple[int, int, int]]) -> bool:
+        """
+        Checks that no source changed while it was being hashed and built from, and that every cached parse a builder
+        may have used is of the hashed version.
+        :param sources: Paths of the source files.
+        :param identities: Identity of each source before it was hashed.
+        :return: True if a structure built from them matches their digests.
+        """
+        for path, identity in zip(sources, identities):
+            cached: tuple[tuple[int, int, int], object] | None = cls.__parsed.get(path)
+            if cls.identity(path) != identity or (cached is not None and cached[0] != identity):
+                return False
+        return True
+
+    @staticmethod
+    def __parse(path: str):
+        """
+        Parses a JSON file.
+        :param path: Path of the file.
+        :return: The parsed contents.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def __fingerprint(cls) -> str:
+        """
+        Hashes the source of every module in the package, once per process. Snapshots pickle instances of the
+        package's classes, so one saved by different code must not be read back.
+        :return: Hex SHA-256 of the package's code.
+        """
+        if cls.__code is None:
+            package: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            digest = hashlib.sha256()
+            for directory, subdirectories, files in os.walk(package):
+                subdirectories[:] = sorted(name for name in subdirectories if name != '__pycache__')  # Stable order
+                for file_name in sorted(name for name in files if name.endswith('.py')):
+                    path: str = os.path.join(directory, file_name)
+                    digest.update(os.path.relpath(path, package).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+            cls.__code = digest.hexdigest()
+        return cls.__code
+
+    @staticmethod
+    def __digest(path: str) -> str:
+        """
+        Hashes a file's contents.
+        :param path: Path of the file.
+        :return: Hex SHA-256 of the file.
+        """
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @classmethod
+    def __save(cls, snapshot: str, header: dict, value) -> None:
+        """
+        Writes a snapshot, ignoring failures. Failing to write it only means the next start builds again.
+        :param snapshot: Path of the snapshot.
+        :param header: Describes the sources the value was built from.
+        :param value: The structure.
+        :return: None
+        """
+        try:
+            cls.__write(snapshot, header, value)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            pass
+
+    @staticmethod
+    def __write(snapshot: str, header: dict, value) -> None:
+        """
+        Writes a snapshot next to its final path and moves it into place, so readers never see half of one.
+        :param snapshot: Path of the snapshot.
+        :param header: Describes the sources the value was built from.
+        :param value: The structure.
+        :return: None
+        :raises OSError: If it cannot be written.
+        """
+        temp_path: str = f'{snapshot}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(snapshot) or '.', exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,157 @@
+import threading, weakref
+from typing import Callable, Generic, TypeVar
+
+from PirateEase.Utils.data_loader import DataLoader
+
+"""
+OOP Principles
+- Encapsulation: The current version and the file versions it was built from are private to Reloadable.
+- Abstraction: Callers read current and never see a rebuild happen.
+
+Behavioral Pattern
+- Observer: HotReloader polls the files behind every watched Reloadable and has each one rebuild when they change.
+
+Structural Pattern
+- Proxy: Reloadable stands in for whatever it was built into and hands out the latest complete version of it.
+
+SOLID Principles
+- Single Responsibility: Reloadable swaps versions of one structure, HotReloader only decides when to check them.
+- Open/Closed: Anything built from files can be reloaded by passing its builder, nothing here changes.
+- Dependency Inversion: Consumers depend on a builder callable, not on how or when files are watched.
+"""
+
+T = TypeVar('T')
+
+
+class Reloadable(Generic[T]):
+    """
+    Copy-on-write reference to a structure built from files. A reload builds a whole new version off to the side and
+    then swaps the reference in one assignment, so readers only ever see a complete version. Someone holding the old
+    version keeps using it until they read current again. A build that fails, e.g. on a half-saved file, leaves the
+    current version in place and is retried on the next reload.
+    """
+
+    def __init__(self, sources: tuple[str, ...], build: Callable[[], T], current: T | None = None):
+        """
+        :param sources: Paths of every file the structure is built from.
+        :param build: Builds a new version from the files.
+        :param current: Optional first version, if it should be made differently from later ones. Built if omitted.
+        """
+        self.__sources: tuple[str, ...] = sources
+        self.__build: Callable[[], T] = build
+        self.__lock: threading.Lock = threading.Lock()  # One rebuild at a time
+        # Taken before building, so a file saved while building is picked up by the next reload
+        self.__versions: tuple = self.__stat()
+        self.__current: T = build() if current is None else current
+        self.reloads: int = 0  # Versions swapped in after the first
+        self.error: Exception | None = None  # Why the last rebuild failed, None if it did not
+
+    @property
+    def current(self) -> T:
+        """
+        :return: The latest complete version. Read it once and use that for a whole unit of work.
+        """
+        return self.__current
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuilds and swaps in a new version if any source file changed since the current one was built.
+        :param force: True to rebuild even if nothing changed.
+        :return: True if a new version was swapped in.
+        """
+        with self.__lock:
+            versions: tuple = self.__stat()
+            if versions == self.__versions and not force:
+                return False
+            try:
+                value: T = self.__build()
+            except Exception as error:  # Keep serving the version that works
+                self.error = error
+                return False
+            self.__current = value
+            self.__versions = versions
+            self.reloads += 1
+            self.error = None
+            return True
+
+    def __stat(self) -> tuple:
+        """
+        :return: What identifies the version of each source file, without reading them.
+        """
+        return tuple(DataLoader.identity(path) for path in self.__sources)
+
+
+class HotReloader:
+    """
+    Polls the files behind every watched structure from one background thread and rebuilds the ones that changed,
+    so databases can be edited without a restart dropping live conversations. Rebuilds never run on a request's
+    thread. Structures nobody uses any more stop being watched on their own.
+    """
+    # Seconds between checks
+    interval: float = 1.0
+    __watched: weakref.WeakSet = weakref.WeakSet()
+    __lock: threading.Lock = threading.Lock()
+    __thread: threading.Thread | None = None
+    __stopping: threading.Event = threading.Event()
+
+    @classmethod
+    def watch(cls, sources: tuple[str, ...], build: Callable[[], T], current: T | None = None) -> Reloadable[T]:
+        """
+        Makes a structure reloadable and has it checked on every poll.
+        :param sources: Paths of every file the structure is built from.
+        :param build: Builds a new version from the files.
+        :param current: Optional first version, built if omitted.
+        :return: The reference to read the structure through.
+        """
+        reloadable: Reloadable[T] = Reloadable(sources, build, current)
+        with cls.__lock:
+            cls.__watched.add(reloadable)
+        return reloadable
+
+    @classmethod
+    def poll(cls) -> int:
+        """
+        Checks every watched structure once and rebuilds the ones whose files changed.
+        :return: How many were reloaded.
+        """
+        with cls.__lock:
+            watched: list[Reloadable] = list(cls.__watched)
+        return sum(reloadable.reload() for reloadable in watched)
+
+    @classmethod
+    def start(cls, interval: float | None = None) -> None:
+        """
+        Starts polling in a daemon thread. Does nothing if it is already polling.
+        :param interval: Optional seconds between checks, defaults to the class's interval.
+        :return: None
+        """
+        with cls.__lock:
+            if cls.__thread is not None and cls.__thread.is_alive():
+                return
+            if interval is not None:
+                cls.interval = interval
+            cls.__stopping.clear()
+            cls.__thread = threading.Thread(target=cls.__run, name='hot-reload', daemon=True)
+            cls.__thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stops polling and waits for a rebuild in progress to finish.
+        :return: None
+        """
+        with cls.__lock:
+            thread: threading.Thread | None = cls.__thread
+            cls.__thread = None
+        cls.__stopping.set()
+        if thread is not None:
+            thread.join()
+
+    @classmethod
+    def __run(cls) -> None:
+        """
+        Polls until stopped.
+        :return: None
+        """
+        while not cls.__stopping.wait(cls.interval):
+            cls.poll()
@@ -1,4 +1,7 @@
-import json
+from typing import Iterator
+
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.phrase_matcher import PhraseMatcher
 
 """
 OOP Principles:
@@ -10,6 +13,8 @@ SOLID Principles:
 - Interface Segregation: Only exposes what is needed, namely recognize_intent
 """
 
+INTENT_PHRASES: str = 'Databases/intent_phrases.json'
+
 
 class IntentRecognizer:
     """
@@ -20,19 +25,34 @@ class IntentRecognizer:
         """
         Loads a database that contains various words and phrases associated with a certain intent.
         """
-        with open('Databases/intent_phrases.json', 'r', encoding='utf-8') as f:
-            self.__intent_phrases: dict[str, str] = json.load(f)
+        self.__intent_phrases: dict[str, list[str]] = DataLoader.load(INTENT_PHRASES)
+        # Compile every phrase once, labeled by its category, so a query is scanned a single time
+        self.__categories: list[str] = list(self.__intent_phrases)
+        self.__matcher: PhraseMatcher = DataLoader.derive('intent_matcher', (INTENT_PHRASES,), lambda: PhraseMatcher(
+            (phrase, category) for category, phrases in self.__intent_phrases.items() for phrase in phrases
+        ))
+
+    def labeled_phrases(self) -> Iterator[tuple[str, tuple[str, str]]]:
+        """
+        Tags each intent phrase with its category so it can be compiled into a shared PhraseMatcher.
+        :return: Pairs of (phrase, ('intent', category)).
+        """
+        return ((phrase, ('intent', category))
+                for category, phrases in self.__intent_phrases.items() for phrase in phrases)
 
-    def recognize_intent(self, query: str) -> str:
+    def recognize_intent(self, query: str, scan: set[tuple] | None = None) -> str:
         """
         Recognizes intent from the given query based on the mappings from the database.
         :param query: The user-inputted query to match an intent to.
+        :param scan: Optional labels already found in the query by a shared PhraseMatcher.
         :return: The intent category or unknown if there were no matches.
         """
-        for category, phrase in self.__intent_phrases.items():
-            # If any phrase in a substring of the query
-            if any(phrase in query.lower() for phrase in phrase):
-                return category
+        # Categories are checked in database order so the first matching category wins
+        if scan is not None:  # The query was already scanned, just read the answer
+            matched: set[str] = {category for source, category in scan if source == 'intent'}
+            category: str | None = next((c for c in self.__categories if c in matched), None)
+        else:
+            category: str | None = self.__matcher.first_label(query.lower(), self.__categories)
 
         # Fallback if nothing matched
-        return 'unknown'
+        return category if category is not None else 'unknown'
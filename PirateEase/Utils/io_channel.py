@@ -0,0 +1,225 @@
+import asyncio, queue, socket
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from PirateEase.Utils.slow_print import StreamRenderer, slow_print
+
+"""
+OOP Principles
+- Encapsulation: How messages reach the user (terminal, queues, socket) is private to each channel.
+- Abstraction: UserInterface just writes and reads messages without knowing where the user actually is.
+- Inheritance: Every channel inherits from IOChannel.
+- Polymorphism: Any channel can be activated for a conversation and used interchangeably.
+
+Behavioral Pattern
+- Strategy: The active channel decides how a conversation talks to its user.
+- Producer/Consumer: QueueChannel and AsyncChannel let whoever owns the connection feed user messages that the
+                     conversation consumes when it needs them.
+
+SOLID Principles
+- Single Responsibility: Each channel only moves messages between a conversation and its user.
+- Open/Closed: New transports are added by subclassing IOChannel.
+- Liskov Substitution: Every channel can stand in for IOChannel.
+- Dependency Inversion: UserInterface depends on the IOChannel abstraction, not on input() or print().
+"""
+
+
+class IOChannel(ABC):
+    """
+    Abstract two-way channel between a conversation and its user.
+    """
+
+    @abstractmethod
+    def write(self, message: str) -> None:
+        """
+        Sends a message to the user.
+        :param message: The message to send.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def read(self) -> str:
+        """
+        Gets the user's next message.
+        :return: The user's message.
+        :raises EOFError: If the user has nothing more to say.
+        """
+        pass
+
+    async def send(self, message: str) -> None:
+        """
+        Async version of write. Channels that can wait without blocking override this.
+        :param message: The message to send.
+        :return: None
+        """
+        self.write(message)
+
+    async def receive(self) -> str:
+        """
+        Async version of read. Channels that can wait without blocking override this.
+        :return: The user's message.
+        """
+        return self.read()
+
+    async def drain(self) -> None:
+        """
+        Waits until everything sent so far has reached the user. Channels that send in the background override this.
+        :return: None
+        """
+        pass
+
+
+class TerminalChannel(IOChannel):
+    """
+    Talks to a user at the terminal with the typing effect.
+    """
+
+    def __init__(self):
+        self.__renderer: StreamRenderer = StreamRenderer()
+
+    def write(self, message: str) -> None:
+        slow_print(message)
+
+    def read(self) -> str:
+        return input('User: ')
+
+    async def send(self, message: str) -> None:
+        self.__renderer.render(message)  # Types out on its own task while the conversation carries on
+
+    async def receive(self) -> str:
+        await self.__renderer.drain()  # Finish typing before prompting
+        return self.read()
+
+    async def drain(self) -> None:
+        await self.__renderer.drain()
+
+
+class QueueChannel(IOChannel):
+    """
+    In-memory channel for batch replay and tests. Reads never block, so a script that runs out raises EOFError.
+    """
+
+    def __init__(self, messages: list[str] | None = None):
+        """
+        :param messages: Optional user messages to replay, in order.
+        """
+        self.__inbox: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self.__outputs: list[str] = []
+        for message in messages or []:
+            self.feed(message)
+
+    @property
+    def outputs(self) -> list[str]:
+        """
+        Every message written to the user so far.
+        """
+        return self.__outputs
+
+    def feed(self, message: str) -> None:
+        """
+        Queues a message from the user.
+        :param message: The user's message.
+        :return: None
+        """
+        self.__inbox.put(message)
+
+    def write(self, message: str) -> None:
+        self.__outputs.append(message)
+
+    def read(self) -> str:
+        try:
+            return self.__inbox.get_nowait()
+        except queue.Empty:
+            raise EOFError('No more queued user messages') from None
+
+
+class SocketChannel(IOChannel):
+    """
+    Line based channel over a connected socket, for thread-per-connection servers.
+    """
+
+    def __init__(self, sock: socket.socket):
+        """
+        :param sock: A connected socket.
+        """
+        self.__file = sock.makefile('rw', encoding='utf-8', newline='\n')
+
+    def write(self, message: str) -> None:
+        self.__file.write(message + '\n')
+        self.__file.flush()
+
+    def read(self) -> str:
+        line: str = self.__file.readline()
+        if not line:  # The other side hung up
+            raise EOFError('Socket closed')
+        return line.rstrip('\r\n')
+
+
+class AsyncChannel(IOChannel):
+    """
+    Async inbox and outbox for one conversation, so waiting on the user suspends a task instead of a thread.
+    """
+
+    def __init__(self):
+        self.__inbox: asyncio.Queue[str] = asyncio.Queue()
+        self.__outbox: asyncio.Queue[str] = asyncio.Queue()
+
+    def deliver(self, message: str) -> None:
+        """
+        Hands a message from the user to the conversation.
+        :param message: The user's message.
+        :return: None
+        """
+        self.__inbox.put_nowait(message)
+
+    def write(self, message: str) -> None:
+        self.__outbox.put_nowait(message)
+
+    def read(self) -> str:
+        raise RuntimeError('AsyncChannel cannot be read synchronously, await receive() instead')
+
+    async def receive(self) -> str:
+        return await self.__inbox.get()
+
+    async def send(self, message: str) -> None:
+        await self.__outbox.put(message)
+
+    async def next_output(self) -> str:
+        """
+        Waits for the next message the conversation sent to the user.
+        :return: The message.
+        """
+        return await self.__outbox.get()
+
+
+# Used by conversations that never activated a channel, like main.py
+_terminal: TerminalChannel = TerminalChannel()
+
+# Channel of the conversation being served by the current thread or asyncio task
+_active_channel: ContextVar[IOChannel | None] = ContextVar('active_channel', default=None)
+
+
+def active_channel() -> IOChannel:
+    """
+    Gets the channel of the conversation being served by the current thread or asyncio task.
+    :return: The active channel, or the terminal if none was activated.
+    """
+    channel: IOChannel | None = _active_channel.get()
+    return channel if channel is not None else _terminal
+
+
+@contextmanager
+def use_channel(channel: IOChannel) -> Iterator[IOChannel]:
+    """
+    Makes the given channel the active one until the block exits.
+    :param channel: The channel to activate.
+    :return: The activated channel.
+    """
+    token = _active_channel.set(channel)
+    try:
+        yield channel
+    finally:
+        _active_channel.reset(token)
@@ -0,0 +1,48 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+
+"""
+OOP Principles
+- Encapsulation: The table of per-key locks and their reference counts is private.
+- Abstraction: Callers just hold a key, they never see the locks behind it.
+
+SOLID Principles
+- Single Responsibility: Only hands out one lock per key and forgets it once nobody holds it.
+- Interface Segregation: Exposes just hold.
+"""
+
+
+class KeyedLock:
+    """
+    One lock per key, created on demand and dropped when unused. Work on different keys never waits on each other,
+    only the bookkeeping around each acquire and release is briefly shared.
+    """
+
+    def __init__(self):
+        self.__guard: threading.Lock = threading.Lock()
+        self.__locks: dict[Hashable, list] = {}  # key -> [lock, number of threads holding or waiting for it]
+
+    def __len__(self) -> int:
+        return len(self.__locks)
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        """
+        Holds the lock for a key until the block exits.
+        :param key: The key to lock, e.g. an order id.
+        :return: None
+        """
+        with self.__guard:
+            entry: list = self.__locks.get(key)
+            if entry is None:
+                entry = self.__locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self.__guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self.__locks[key]
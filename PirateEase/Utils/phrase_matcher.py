@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Hashable, Iterable
+
+"""
+OOP Principles
+- Encapsulation: The automaton's transition, failure, and output tables are private and only built once.
+- Abstraction: find_labels hides how every phrase is located in a single pass over the text.
+
+SOLID Principles
+- Single Responsibility: Only finds which known phrases occur in a piece of text.
+- Open/Closed: Any hashable label can be attached to a phrase, so new kinds of phrases need no changes here.
+- Interface Segregation: Exposes just find_labels and first_label.
+"""
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton that finds every labeled phrase contained in a text with one linear pass.
+    """
+
+    def __init__(self, phrases: Iterable[tuple[str, Hashable]]):
+        """
+        Compiles the given phrases into an automaton.
+        :param phrases: Pairs of (phrase, label). A label is reported whenever its phrase is a substring of the text.
+        """
+        self.__goto: list[dict[str, int]] = [{}]  # Transitions for each state
+        self.__fail: list[int] = [0]  # Failure link for each state
+        self.__output: list[tuple] = [()]  # Labels of every phrase ending at each state
+        self.__always: set = set()  # Labels of empty phrases, which are in every text
+
+        outputs: list[set] = [set()]
+        for phrase, label in phrases:
+            if not phrase:  # An empty phrase is a substring of everything
+                self.__always.add(label)
+                continue
+            state: int = 0
+            for c in phrase:  # Walk/extend the trie one character at a time
+                nxt: int | None = self.__goto[state].get(c)
+                if nxt is None:
+                    nxt = len(self.__goto)
+                    self.__goto[state][c] = nxt
+                    self.__goto.append({})
+                    self.__fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(label)
+
+        # Breadth first so every failure link points at an already finished state
+        queue: deque[int] = deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self.__goto[state].items():
+                queue.append(nxt)
+                fallback: int = self.__fail[state]
+                while fallback and c not in self.__goto[fallback]:
+                    fallback = self.__fail[fallback]
+                self.__fail[nxt] = self.__goto[fallback].get(c, 0)
+                outputs[nxt] |= outputs[self.__fail[nxt]]
+
+        self.__output = [tuple(labels) for labels in outputs]
+
+    def find_labels(self, text: str) -> set:
+        """
+        Finds the labels of every phrase that occurs in the given text.
+        :param text: The text to scan.
+        :return: Set of labels whose phrase is a substring of the text.
+        """
+        goto, fail, output = self.__goto, self.__fail, self.__output
+        found: set = set(self.__always)
+        state: int = 0
+        for c in text:
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def first_label(self, text: str, order: list[Hashable]) -> Hashable | None:
+        """
+        Finds the earliest label in the given order whose phrase occurs in the text.
+        :param text: The text to scan.
+        :param order: Labels in order of precedence.
+        :return: First matching label from order, or None if nothing matched.
+        """
+        found: set = self.find_labels(text)
+        for label in order:
+            if label in found:
+                return label
+        return None
@@ -0,0 +1,146 @@
+import threading, time
+from concurrent.futures import Future
+from typing import Callable
+
+"""
+OOP Principles
+- Encapsulation: Which requests are waiting, which are being served, and who is serving them is private.
+- Abstraction: Callers make a request and get its response, they never see that it was shared or batched.
+
+Behavioral Pattern
+- Leader/Followers: For types served in batches, whichever waiting caller finds nobody serving its type serves
+                    everything of that type queued so far, everybody else waits for their response. There is no
+                    background thread.
+
+SOLID Principles
+- Single Responsibility: Only groups and deduplicates concurrent requests, serving them is left to the callable it
+                         is given.
+- Dependency Inversion: Depends on a callable that serves a list of requests of one type, not on any service.
+"""
+
+
+class RequestCoalescer:
+    """
+    Merges concurrent requests for the same key into one backend call. Different keys go to the backend side by side,
+    each on its caller's thread. Types that can be served in batches instead have one call running per type at a
+    time, and everything of that type arriving meanwhile is served as its next batch. A lone request is served
+    straight away, so serial traffic pays nothing. Only use it for requests whose answer does not depend on who asks
+    or how often, e.g. looking up an order.
+    """
+
+    def __init__(self, serve: Callable[[str, list[str]], list], batched: Callable[[str], bool] = lambda _: False,
+                 window: float = 0.0):
+        """
+        :param serve: Serves a list of unique requests of one type and returns their responses in the same order.
+        :param batched: Tells whether a request type has a real batch endpoint, so queueing its requests to serve
+                        them together is worth it. Other types are only deduplicated.
+        :param window: Seconds a batch leader waits before serving, so more requests can join its batch.
+        """
+        self.__serve: Callable[[str, list[str]], list] = serve
+        self.__batched: Callable[[str], bool] = batched
+        self.__window: float = window
+        self.__condition: threading.Condition = threading.Condition()
+        self.__pending: dict[str, dict[str, Future]] = {}  # Request type -> data -> response, waiting for a batch
+        self.__in_flight: dict[tuple[str, str], Future] = {}  # (request type, data) -> response, being served now
+        self.__serving: set[str] = set()  # Batched types with a leader serving them
+        self.requests: int = 0  # Requests made
+        self.served: int = 0  # Unique requests that reached the backend
+
+    def request(self, request_type: str, data: str):
+        """
+        Gets the response to a request, sharing it with identical requests that are waiting or being served.
+        :param request_type: The type of request.
+        :param data: The request's data, its key.
+        :return: The response.
+        :raises Exception: Whatever serving this request raised.
+        """
+        key: tuple[str, str] = (request_type, data)
+        batched: bool = self.__batched(request_type)
+        with self.__condition:
+            self.requests += 1
+            future: Future | None = self.__in_flight.get(key) or self.__pending.get(request_type, {}).get(data)
+            if future is None and not batched:  # Nobody is asking for it, serve it alongside any other keys
+                future = self.__in_flight[key] = Future()
+                self.served += 1
+                owner: bool = True
+            else:
+                owner = False
+                if future is None:
+                    future = self.__pending.setdefault(request_type, {})[data] = Future()
+            lead: bool = False
+            if batched:
+                while request_type in self.__serving and not future.done():
+                    self.__condition.wait()
+                lead = not future.done()  # Still waiting and nobody is serving its type, so serve it ourselves
+                if lead:
+                    self.__serving.add(request_type)
+        if owner:
+            self.__serve_one(request_type, data, future)
+        elif lead:
+            self.__serve_pending(request_type)
+        return future.result()
+
+    def __serve_one(self, request_type: str, data: str, future: Future) -> None:
+        """
+        Serves a request on its own and hands the response to everybody sharing it.
+        :param request_type: The type of request.
+        :param data: The request's data.
+        :param future: Its response.
+        :return: None
+        """
+        try:
+            future.set_result(self.__serve(request_type, [data])[0])
+        except Exception as error:
+            future.set_exception(error)
+        finally:
+            if not future.done():  # Serving was interrupted
+                future.set_exception(RuntimeError('Request was not served'))
+            with self.__condition:
+                del self.__in_flight[(request_type, data)]
+
+    def __serve_pending(self, request_type: str) -> None:
+        """
+        Serves every pending request of a type in one batch, and wakes everybody waiting.
+        :param request_type: The type of request.
+        :return: None
+        """
+        batch: dict[str, Future] = {}
+        try:
+            if self.__window:
+                time.sleep(self.__window)
+            with self.__condition:
+                batch = self.__pending.pop(request_type, {})
+                for data, future in batch.items():
+                    self.__in_flight[(request_type, data)] = future
+                self.served += len(batch)
+            self.__serve_group(request_type, list(batch), batch)
+        finally:
+            for future in batch.values():
+                if not future.done():  # Serving was interrupted
+                    future.set_exception(RuntimeError('Request was not served'))
+            with self.__condition:
+                for data in batch:
+                    del self.__in_flight[(request_type, data)]
+                self.__serving.discard(request_type)
+                self.__condition.notify_all()
+
+    def __serve_group(self, request_type: str, items: list[str], batch: dict[str, Future]) -> None:
+        """
+        Serves the requests of one type. If serving them together fails, each is retried alone so one bad request
+        only fails its own callers.
+        :param request_type: The type of request.
+        :param items: The unique data of each request.
+        :param batch: The futures of the batch being served, by data.
+        :return: None
+        """
+        try:
+            responses: list = self.__serve(request_type, items)
+        except Exception as error:
+            if len(items) == 1:
+                batch[items[0]].set_exception(error)
+                return
+            for data in items:
+                self.__serve_group(request_type, [data], batch)
+            return
+        for data, response in zip(items, responses):
+            batch[data].set_result(response)
@@ -1,6 +1,9 @@
-import json, random
+import os, random, threading
 from pathlib import Path
 
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.hot_reload import HotReloader, Reloadable
+
 """
 OOP Principles
 - Encapsulation: Encapsulates the logic of fetching and returning responses from a JSON file
@@ -9,6 +12,7 @@ OOP Principles
 Creational Pattern
 - Factory: Centralizes response creation logic which keeps response logic in one place making updates, upgrades,
            and management easier.
+- Lazy Initialization: Responses are only read when the first one is needed.
            
 SOLID Principles
 - Single Responsibility: Has one job which is to create responses based on a category.
@@ -17,18 +21,67 @@ SOLID Principles
 """
 
 
-class ResponseFactory:
+class ResponseCatalog(type):
     """
-    Factory for generating random responses based on the given category."
+    Metaclass that exposes the current version of the responses as ResponseFactory.responses.
     """
-    import os
 
+    @property
+    def responses(cls) -> dict[str, list[str]]:
+        """
+        :return: Category -> possible responses, as of the latest reload of responses.json.
+        """
+        return cls.catalog().current
+
+
+class ResponseFactory(metaclass=ResponseCatalog):
+    """
+    Factory for generating random responses based on the given category. Responses are loaded on first use, so
+    importing this module reads nothing from disk.
+    """
     current_dir = os.path.dirname(os.path.abspath(__file__))
     responses_path = os.path.join(current_dir, '..', 'Databases', 'responses.json')
+    # Snapshot made by `python -m PirateEase.Utils.response_factory`. Read instead of responses.json if set, unless
+    # responses.json has changed since it was made.
+    snapshot: str | None = None
+    __catalog: Reloadable[dict[str, list[str]]] | None = None
+    __lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def catalog(cls) -> Reloadable[dict[str, list[str]]]:
+        """
+        Gets the responses, loading them the first time. They are reloaded in the background when their file changes.
+        :return: Reference to the current responses.
+        """
+        if cls.__catalog is None:
+            with cls.__lock:
+                if cls.__catalog is None:
+                    sources: tuple[str, ...] = (cls.snapshot, cls.responses_path) if cls.snapshot else \
+                        (cls.responses_path,)
+                    cls.__catalog = HotReloader.watch(sources, cls.__load)
+        return cls.__catalog
 
-    with open(responses_path, 'r', encoding='utf-8') as f:
-        responses: dict[str, list[str]] = json.load(f)
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Forgets the loaded responses, so the next response loads them again, e.g. after setting snapshot.
+        :return: None
+        """
+        with cls.__lock:
+            cls.__catalog = None
 
+    @classmethod
+    def __load(cls) -> dict[str, list[str]]:
+        """
+        Reads the responses from the snapshot if one is set and still current, otherwise from responses.json.
+        :return: Category -> possible responses.
+        """
+        if cls.snapshot:
+            try:
+                return DataLoader.read_snapshot(cls.snapshot, cls.responses_path)
+            except (OSError, ValueError):  # Missing, or older than an edit to responses.json
+                pass
+        return DataLoader.load(cls.responses_path)
 
     @classmethod
     def get_response(cls, category: str) -> str:
@@ -38,3 +91,15 @@ class ResponseFactory:
         :return: Random response for the given category.
         """
         return random.choice(cls.responses[category])
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile responses.json into a snapshot for ResponseFactory.snapshot.')
+    parser.add_argument('snapshot', nargs='?',
+                        default=os.path.join(ResponseFactory.current_dir, '..', 'Databases', '.snapshots',
+                                             'responses.compiled.pickle'))
+    args = parser.parse_args()
+    DataLoader.compile(ResponseFactory.responses_path, args.snapshot)
+    print(f'Wrote {os.path.abspath(args.snapshot)}')
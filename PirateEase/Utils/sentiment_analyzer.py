@@ -1,4 +1,6 @@
-import json
+from typing import Iterator
+
+from PirateEase.Utils.data_loader import DataLoader
 
 """
 OOP Principles
@@ -12,6 +14,8 @@ SOLID Principles
 - Interface Segregation: Provides only one clear method.
 """
 
+NEGATIVE_PHRASES: str = 'Databases/negative_phrases.json'
+
 
 class SentimentAnalyzer:
     """
@@ -22,13 +26,22 @@ class SentimentAnalyzer:
         """
         Loads a list of phrases with negative or aggressive intent.
         """
-        with open('Databases/negative_phrases.json', 'r', encoding='utf-8') as f:
-            self.negative_phrases: list[str] = json.load(f)
+        self.negative_phrases: list[str] = DataLoader.load(NEGATIVE_PHRASES)
+
+    def labeled_phrases(self) -> Iterator[tuple[str, tuple[str, None]]]:
+        """
+        Tags each negative phrase so it can be compiled into a shared PhraseMatcher.
+        :return: Pairs of (phrase, ('negative', None)).
+        """
+        return ((phrase, ('negative', None)) for phrase in self.negative_phrases)
 
-    def negative_sentiment_detected(self, query: str) -> bool:
+    def negative_sentiment_detected(self, query: str, scan: set[tuple] | None = None) -> bool:
         """
         Detects negative sentiment in user queries.
         :param query: The query to detect negative sentiment in.
+        :param scan: Optional labels already found in the query by a shared PhraseMatcher.
         :return: True if negative sentiment is detected, False otherwise.
         """
+        if scan is not None:  # The query was already scanned, just read the answer
+            return any(source == 'negative' for source, _ in scan)
         return any(phrase in query.lower() for phrase in self.negative_phrases)
@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
 from PirateEase.Utils.singleton import Singleton
 
 """
@@ -7,7 +11,10 @@ OOP Principles
 - Inheritance: Inherits from Singleton
 
 Creation Pattern
-- Singleton: Ensures a global and centralized state for consistency across services and handlers.
+- Singleton: Keyed by session id, so each conversation has exactly one centralized state shared by its handlers.
+
+Structural Pattern
+- Proxy: CurrentSession forwards to whichever session is active, so shared handlers never hold onto one conversation.
 
 SOLID Principles
 - Single Responsibility: Manages session state and history only.
@@ -17,21 +24,76 @@ SOLID Principles
 """
 
 
+DEFAULT_SESSION: str = 'default'
+
+# Id of the session being served by the current thread or asyncio task
+_active_session: ContextVar[str] = ContextVar('active_session', default=DEFAULT_SESSION)
+
+
 class SessionManager(Singleton):
     """
-    Singleton class for managing the history of chats and any information gathered during the conversation.
+    Per-session singleton class for managing the history of chats and any information gathered during the conversation.
     """
 
-    def __init__(self):
+    def __new__(cls, session_id: str = DEFAULT_SESSION):
+        """
+        Makes a new instance if this session does not exist yet.
+        Else returns the instance that already belongs to this session.
+        """
+        key: tuple = (cls, session_id)
+        if key not in cls._instances:
+            instance = object.__new__(cls)
+            instance._initialized = False
+            cls._instances[key] = instance
+        return cls._instances[key]
+
+    def __init__(self, session_id: str = DEFAULT_SESSION):
         """
         If not already initialized, a new session will be created with an empty dictionary.
+        :param session_id: Id of the conversation this session belongs to.
         """
         if self._initialized:
             return
+        self.__session_id: str = session_id
         self.__state: dict[str, str] = {}
         self.__history: list[str] = []
         self._initialized = True
 
+    @classmethod
+    def current(cls) -> 'SessionManager':
+        """
+        Gets the session being served by the current thread or asyncio task.
+        :return: The active session.
+        """
+        return cls(_active_session.get())
+
+    @classmethod
+    @contextmanager
+    def activate(cls, session_id: str) -> Iterator['SessionManager']:
+        """
+        Makes the given session the active one until the block exits.
+        :param session_id: Id of the session to activate.
+        :return: The activated session.
+        """
+        token = _active_session.set(session_id)
+        try:
+            yield cls(session_id)
+        finally:
+            _active_session.reset(token)
+
+    @classmethod
+    def end_session(cls, session_id: str) -> None:
+        """
+        Forgets a finished session so its state and history can be freed.
+        :param session_id: Id of the session to end.
+        :return: None
+        """
+        cls._instances.pop((cls, session_id), None)
+
+    @property
+    def session_id(self) -> str:
+        return self.__session_id
+
     @property
     def state(self) -> dict[str, any]:
         return self.__state
@@ -74,3 +136,29 @@ class SessionManager(Singleton):
         :return: None
         """
         self.__history.append(message)
+
+
+class CurrentSession:
+    """
+    Stand-in for the active SessionManager. Long-lived handlers hold one of these instead of a specific session.
+    """
+
+    @property
+    def state(self) -> dict[str, any]:
+        return SessionManager.current().state
+
+    @property
+    def history(self) -> list[str]:
+        return SessionManager.current().history
+
+    def __contains__(self, item: str) -> bool:
+        return item in SessionManager.current()
+
+    def get(self, key: str, default=None) -> str | None:
+        return SessionManager.current().get(key, default)
+
+    def set(self, key: str, value) -> None:
+        SessionManager.current().set(key, value)
+
+    def append_history(self, message: str) -> None:
+        SessionManager.current().append_history(message)
@@ -1,4 +1,29 @@
-import time
+import asyncio, sys, time
+from typing import Callable
+
+# None lets the output stream decide, True or False forces the typing effect on or off (e.g. batch and server modes)
+_typing_effect: bool | None = None
+
+
+def set_typing_effect(enabled: bool | None) -> None:
+    """
+    Forces the typing effect on or off, or hands the decision back to the output stream with None.
+    :param enabled: True, False, or None for automatic.
+    :return: None
+    """
+    global _typing_effect
+    _typing_effect = enabled
+
+
+def typing_effect_enabled() -> bool:
+    """
+    Determines if text should be typed out. Unless forced, this is only worth it when a person is watching a terminal.
+    :return: True if the typing effect should be used, False otherwise.
+    """
+    if _typing_effect is not None:
+        return _typing_effect
+    return sys.stdout.isatty()
+
 
 def slow_print(s: str, delay: float = 0.02) -> None:
     """
@@ -7,7 +32,74 @@ def slow_print(s: str, delay: float = 0.02) -> None:
     :param delay: Delay in seconds between each character being printed
     :return: None
     """
+    if not typing_effect_enabled():  # Nobody to watch it type, print it at once
+        print(s)
+        return
     for c in s:
         print(c, end='', flush=True)
         time.sleep(delay)
-    print()
\ No newline at end of file
+    print()
+
+
+def _write_stdout(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class StreamRenderer:
+    """
+    Types out text in timed chunks on its own asyncio task, so whoever renders it can carry on immediately.
+    """
+
+    def __init__(self, chunk_size: int = 4, chars_per_second: float = 50.0,
+                 write: Callable[[str], None] = _write_stdout):
+        """
+        :param chunk_size: Characters written at a time.
+        :param chars_per_second: Typing speed.
+        :param write: Where the text goes, stdout by default.
+        """
+        self.chunk_size: int = chunk_size
+        self.chars_per_second: float = chars_per_second
+        self.__write: Callable[[str], None] = write
+        self.__pending: asyncio.Queue[str] | None = None
+        self.__typist: asyncio.Task | None = None
+
+    def render(self, s: str) -> None:
+        """
+        Queues the string to be typed out, followed by a newline, and returns immediately.
+        Must be called from a running event loop.
+        :param s: The string to render.
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        if self.__typist is None or self.__typist.done() or self.__typist.get_loop() is not loop:
+            self.__pending = asyncio.Queue()
+            self.__typist = loop.create_task(self.__type_out())
+        self.__pending.put_nowait(s)
+
+    async def drain(self) -> None:
+        """
+        Waits until everything rendered so far has been written.
+        :return: None
+        """
+        if self.__pending is not None and self.__typist is not None and not self.__typist.done():
+            await self.__pending.join()
+
+    async def __type_out(self) -> None:
+        """
+        Writes queued strings one after another so they never interleave.
+        :return: None
+        """
+        while True:
+            s: str = await self.__pending.get()
+            try:
+                if typing_effect_enabled():
+                    for i in range(0, len(s), self.chunk_size):
+                        chunk: str = s[i:i + self.chunk_size]
+                        self.__write(chunk)
+                        await asyncio.sleep(len(chunk) / self.chars_per_second)
+                else:  # Nobody to watch it type, write it at once
+                    self.__write(s)
+                self.__write('\n')
+            finally:
+                self.__pending.task_done()
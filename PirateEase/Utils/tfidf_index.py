@@ -0,0 +1,161 @@
+import math, zlib
+from typing import Hashable, Iterable
+
+from PirateEase.Utils.trigram_index import normalize, trigrams
+
+try:  # Optional, scores with sparse matrix products when installed
+    from scipy import sparse
+except ImportError:  # Pure Python sparse products
+    sparse = None
+
+"""
+OOP Principles
+- Encapsulation: The feature hashing, the weights, and the matrix are private, callers only search.
+- Abstraction: search and search_many hide whether SciPy or plain Python does the matrix products.
+
+SOLID Principles
+- Single Responsibility: Only scores texts against a fixed collection by TF-IDF cosine similarity.
+- Open/Closed: How text is turned into features is one method, a subclass can swap it.
+- Interface Segregation: Exposes search and search_many.
+"""
+
+
+class TfidfIndex:
+    """
+    Sparse matrix with one L2 normalized TF-IDF row per text over hashed features: words, word pairs, and character
+    trigrams. Scoring a query is one sparse matrix-vector product, and scoring a batch of queries one sparse matrix
+    product, so texts that share few exact words but many words and word pieces still score highly. Uses SciPy when
+    it is installed and a pure Python sparse product otherwise, both give the same scores.
+    """
+    # Queries scored per SciPy product, the score matrix has up to this many rows times the number of texts entries
+    batch_rows: int = 256
+
+    def __init__(self, entries: Iterable[tuple[Hashable, str]], features: int = 1 << 18):
+        """
+        :param entries: Pairs of (key, text) to index. The collection is fixed once built.
+        :param features: Number of hashed feature columns, more means fewer collisions.
+        """
+        self.__features: int = features
+        self.__keys: list[Hashable] = []
+        counts: list[dict[int, int]] = []
+        frequency: dict[int, int] = {}  # Feature -> texts it occurs in
+        for key, text in entries:
+            self.__keys.append(key)
+            row: dict[int, int] = self.__count(text)
+            counts.append(row)
+            for feature in row:
+                frequency[feature] = frequency.get(feature, 0) + 1
+        total: int = len(counts)
+        self.__idf: dict[int, float] = {feature: math.log((1 + total) / (1 + df)) + 1
+                                        for feature, df in frequency.items()}
+        rows: list[dict[int, float]] = [self.__weigh(row) for row in counts]
+        if sparse is not None:
+            self.__matrix = self.__to_csr(rows)
+        else:
+            # Column -> (row, weight) pairs, so a product only reads the columns a query uses
+            self.__columns: dict[int, list[tuple[int, float]]] = {}
+            for index, row in enumerate(rows):
+                for feature, weight in row.items():
+                    self.__columns.setdefault(feature, []).append((index, weight))
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def search(self, text: str, threshold: float = 0.0) -> tuple[Hashable, float] | None:
+        """
+        Finds the indexed text most similar to the given text.
+        :param text: The text to look up.
+        :param threshold: Lowest cosine similarity that counts as a match.
+        :return: The key of the best match and its similarity, or None if nothing reaches the threshold.
+        """
+        return self.search_many([text], threshold)[0]
+
+    def search_many(self, texts: list[str], threshold: float = 0.0) -> list[tuple[Hashable, float] | None]:
+        """
+        Finds the most similar indexed text for every given text with one sparse matrix product.
+        :param texts: The texts to look up.
+        :param threshold: Lowest cosine similarity that counts as a match.
+        :return: For each text, the key of its best match and its similarity, or None if nothing reaches the threshold.
+        """
+        queries: list[dict[int, float]] = [self.__weigh(self.__count(text)) for text in texts]
+        if not self.__keys or not queries:
+            return [None] * len(queries)
+        best: list[tuple[int, float]] = self.__best_scipy(queries) if sparse is not None else self.__best_python(queries)
+        return [(self.__keys[row], score) if score > 0 and score >= threshold else None for row, score in best]
+
+    def _features(self, text: str) -> list[str]:
+        """
+        Turns text into the features it is scored on.
+        :param text: The text.
+        :return: Words, adjacent word pairs, and character trigrams, each tagged with its kind.
+        """
+        normalized: str = normalize(text)
+        words: list[str] = normalized.split()
+        return ([f'w:{word}' for word in words] + [f'b:{first} {second}' for first, second in zip(words, words[1:])]
+                + [f'c:{gram}' for gram in trigrams(normalized)])
+
+    def __count(self, text: str) -> dict[int, int]:
+        """
+        Counts a text's hashed features.
+        :param text: The text.
+        :return: Dictionary mapping feature columns to counts.
+        """
+        counts: dict[int, int] = {}
+        for feature in self._features(text):
+            column: int = zlib.crc32(feature.encode('utf-8')) % self.__features
+            counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def __weigh(self, counts: dict[int, int]) -> dict[int, float]:
+        """
+        Turns feature counts into an L2 normalized TF-IDF row. Features no indexed text has are dropped.
+        :param counts: Dictionary mapping feature columns to counts.
+        :return: Dictionary mapping feature columns to weights.
+        """
+        row: dict[int, float] = {feature: (1 + math.log(count)) * self.__idf[feature]
+                                 for feature, count in counts.items() if feature in self.__idf}
+        norm: float = math.sqrt(sum(weight * weight for weight in row.values()))
+        return {feature: weight / norm for feature, weight in row.items()} if norm else {}
+
+    def __to_csr(self, rows: list[dict[int, float]]):
+        """
+        Packs rows into a SciPy CSR matrix.
+        :param rows: Dictionaries mapping feature columns to weights.
+        :return: The matrix, one row per dictionary.
+        """
+        data: list[float] = []
+        indices: list[int] = []
+        indptr: list[int] = [0]
+        for row in rows:
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), self.__features))
+
+    def __best_scipy(self, queries: list[dict[int, float]]) -> list[tuple[int, float]]:
+        """
+        Scores every query against every text with one sparse product.
+        :param queries: Weighted query rows.
+        :return: For each query, the best row and its score.
+        """
+        best: list[tuple[int, float]] = []
+        for start in range(0, len(queries), self.batch_rows):  # Bounds the memory the score matrix takes
+            scores = (self.__to_csr(queries[start:start + self.batch_rows]) @ self.__matrix.T).tocsr()
+            rows = scores.argmax(axis=1).A1
+            best.extend((int(row), float(scores[index, row])) for index, row in enumerate(rows))
+        return best
+
+    def __best_python(self, queries: list[dict[int, float]]) -> list[tuple[int, float]]:
+        """
+        Scores every query against every text, reading only the columns each query uses.
+        :param queries: Weighted query rows.
+        :return: For each query, the best row and its score.
+        """
+        best: list[tuple[int, float]] = []
+        for query in queries:
+            scores: dict[int, float] = {}
+            for feature, weight in query.items():
+                for row, row_weight in self.__columns.get(feature, ()):
+                    scores[row] = scores.get(row, 0.0) + weight * row_weight
+            best.append(max(scores.items(), key=lambda item: item[1]) if scores else (0, 0.0))
+        return best
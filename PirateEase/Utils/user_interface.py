@@ -1,6 +1,6 @@
+from PirateEase.Utils.io_channel import active_channel
 from PirateEase.Utils.response_factory import ResponseFactory
-from PirateEase.Utils.session_manager import SessionManager
-from PirateEase.Utils.slow_print import slow_print
+from PirateEase.Utils.session_manager import CurrentSession
 
 """
 OOP Principles
@@ -9,7 +9,8 @@ OOP Principles
 - Inheritance: Uses composition to manage session information.
 
 Structural Pattern
-- Facade: Provides a simple interface that interfaces with things like ResponseFactory and SessionManager.
+- Facade: Provides a simple interface that interfaces with things like ResponseFactory, SessionManager, and the
+          active IOChannel.
 
 SOLID Principles
 - Single Responsibility: Handles user interaction only.
@@ -22,7 +23,29 @@ class UserInterface:
     """
     Class for collecting and validating input from the user.
     """
-    session: SessionManager = SessionManager()
+    session: CurrentSession = CurrentSession()
+
+    @classmethod
+    def say(cls, message: str) -> None:
+        """
+        Records a message in the history and sends it to the user over the active channel.
+        :param message: The message to send.
+        :return: None
+        """
+        cls.session.append_history(message)
+        active_channel().write(message)
+
+    @classmethod
+    def ask(cls, message: str) -> str:
+        """
+        Sends a prompt to the user and reads their reply from the active channel.
+        :param message: The prompt to send.
+        :return: The user's stripped reply.
+        """
+        cls.say(message)
+        reply: str = active_channel().read().strip()
+        cls.session.append_history(f'User: {reply}')  # Store as string
+        return reply
 
     @classmethod
     def get_order_id(cls, order_or_refund_id: str) -> str:
@@ -32,18 +55,12 @@ class UserInterface:
         :return: The collected order ID.
         """
         while True:
-            message: str = 'PirateEase: ' + ResponseFactory.get_response(order_or_refund_id)
-            slow_print(message)
-            cls.session.append_history(message)
-            order_id: str = input('User: ').strip()
+            order_id: str = cls.ask('PirateEase: ' + ResponseFactory.get_response(order_or_refund_id))
             try:
-                cls.session.append_history(f'User: {order_id}')  # Store as string
                 int(order_id)  # Validate it's numeric
                 return order_id
             except ValueError:
-                error_msg: str = ResponseFactory.get_response('invalid_order_id')
-                cls.session.append_history(error_msg)
-                slow_print(error_msg)
+                cls.say(ResponseFactory.get_response('invalid_order_id'))
 
     @classmethod
     def get_item_name(cls) -> str:
@@ -51,22 +68,65 @@ class UserInterface:
         Gets an item name from the user.
         :return: The collected item name.
         """
-        message: str = 'PirateEase: ' + ResponseFactory.get_response('product')
-        slow_print(message)
-        cls.session.append_history(message)
-        item_name: str = input('User: ').strip()
-        cls.session.append_history(f'User: {item_name}')
-        return item_name
+        return cls.ask('PirateEase: ' + ResponseFactory.get_response('product'))
 
     @classmethod
-    def get_refund_reason(cls):
+    def get_refund_reason(cls) -> str:
         """
         Gets a refund reason from the user.
         :return: The collected refund reason.
         """
-        message: str = 'PirateEase: ' + ResponseFactory.get_response('refund_reason')
-        slow_print(message)
+        return cls.ask('PirateEase: ' + ResponseFactory.get_response('refund_reason'))
+
+    @classmethod
+    async def say_async(cls, message: str) -> None:
+        """
+        Records a message in the history and sends it to the user over the active channel.
+        :param message: The message to send.
+        :return: None
+        """
         cls.session.append_history(message)
-        refund_reason: str = input('User: ').strip()
-        cls.session.append_history(f'User: {refund_reason}')
-        return refund_reason
+        await active_channel().send(message)
+
+    @classmethod
+    async def ask_async(cls, message: str) -> str:
+        """
+        Sends a prompt to the user and waits for their reply without blocking the event loop.
+        :param message: The prompt to send.
+        :return: The user's stripped reply.
+        """
+        await cls.say_async(message)
+        reply: str = (await active_channel().receive()).strip()
+        cls.session.append_history(f'User: {reply}')
+        return reply
+
+    @classmethod
+    async def get_order_id_async(cls, order_or_refund_id: str) -> str:
+        """
+        Async version of get_order_id.
+        :param order_or_refund_id: either 'order_id' or 'refund_id'
+        :return: The collected order ID.
+        """
+        while True:
+            order_id: str = await cls.ask_async('PirateEase: ' + ResponseFactory.get_response(order_or_refund_id))
+            try:
+                int(order_id)  # Validate it's numeric
+                return order_id
+            except ValueError:
+                await cls.say_async(ResponseFactory.get_response('invalid_order_id'))
+
+    @classmethod
+    async def get_item_name_async(cls) -> str:
+        """
+        Async version of get_item_name.
+        :return: The collected item name.
+        """
+        return await cls.ask_async('PirateEase: ' + ResponseFactory.get_response('product'))
+
+    @classmethod
+    async def get_refund_reason_async(cls) -> str:
+        """
+        Async version of get_refund_reason.
+        :return: The collected refund reason.
+        """
+        return await cls.ask_async('PirateEase: ' + ResponseFactory.get_response('refund_reason'))
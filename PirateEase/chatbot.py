@@ -1,12 +1,16 @@
-import json
+from itertools import chain
+from typing import NamedTuple
 
 from PirateEase.QueryHandlers.abc_handler import QueryHandler
 from PirateEase.QueryHandlers.query_manager import QueryManager
-from PirateEase.Services.live_agent_notifier import LiveAgentService
-from PirateEase.Utils.intent_recognizer import IntentRecognizer
+from PirateEase.Services.live_agent_notifier import AGENTS, LiveAgentService
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.hot_reload import HotReloader, Reloadable
+from PirateEase.Utils.intent_recognizer import INTENT_PHRASES, IntentRecognizer
+from PirateEase.Utils.phrase_matcher import PhraseMatcher
 from PirateEase.Utils.response_factory import ResponseFactory
-from PirateEase.Utils.sentiment_analyzer import SentimentAnalyzer
-from PirateEase.Utils.session_manager import SessionManager
+from PirateEase.Utils.sentiment_analyzer import NEGATIVE_PHRASES, SentimentAnalyzer
+from PirateEase.Utils.session_manager import CurrentSession, SessionManager
 
 """
 OOP Principles
@@ -27,6 +31,24 @@ SOLID Principles
 - Interface Segregation: Depends only on small, well-defined interfaces like QueryHandler.
 """
 
+# Lines that open every conversation
+GREETING: tuple[str, ...] = (
+    'PirateEase: Hello! Welcome to the PirateEase support bot!',
+    'PirateEase: You can ask me about the status of your order, '
+    'have me refund a purchase, have me check the availability of a product, or I can connect you with one of our '
+    'live agents.'
+)
+
+
+class PhraseModel(NamedTuple):
+    """
+    One version of everything built from the phrase databases. A turn reads one and uses it throughout, so a reload
+    never mixes phrases from two versions.
+    """
+    intent_recognizer: IntentRecognizer
+    sentiment_analyzer: SentimentAnalyzer
+    matcher: PhraseMatcher  # Every phrase source, so each text is only scanned once
+
 
 class ChatBot:
     """
@@ -35,41 +57,97 @@ class ChatBot:
 
     def __init__(self):
         self.__query_manager: QueryManager = QueryManager()
-        self.__intent_recognizer: IntentRecognizer = IntentRecognizer()
-        self.__sentiment_analyzer: SentimentAnalyzer = SentimentAnalyzer()
-        self.__session_manager: SessionManager = SessionManager()
+        self.__session_manager: CurrentSession = CurrentSession()
         self.__agent_service: LiveAgentService = LiveAgentService()
-        with open('Databases/intent_phrases.json', 'r', encoding='utf-8') as f:
-            self.__exit_phrases = json.load(f).get('exit')
+        # Rebuilt in the background when a phrase database changes
+        self.__phrases: Reloadable[PhraseModel] = HotReloader.watch((INTENT_PHRASES, NEGATIVE_PHRASES),
+                                                                    self.__build_phrases)
+
+    def __build_phrases(self) -> PhraseModel:
+        """
+        Builds every phrase structure from the current phrase databases.
+        :return: The new version.
+        """
+        intent_recognizer: IntentRecognizer = IntentRecognizer()
+        sentiment_analyzer: SentimentAnalyzer = SentimentAnalyzer()
+        # Shares the parse IntentRecognizer already made
+        exit_phrases: list[str] = DataLoader.load(INTENT_PHRASES).get('exit')
+        matcher: PhraseMatcher = DataLoader.derive(
+            'chat_matcher', (NEGATIVE_PHRASES, INTENT_PHRASES, AGENTS), lambda: PhraseMatcher(chain(
+                sentiment_analyzer.labeled_phrases(),
+                intent_recognizer.labeled_phrases(),
+                ((phrase.lower(), ('exit', None)) for phrase in exit_phrases),
+                self.__agent_service.labeled_phrases()
+            ))
+        )
+        return PhraseModel(intent_recognizer, sentiment_analyzer, matcher)
 
-    def process_query(self, query: str) -> str:
+    def process_query(self, query: str, session_id: str | None = None) -> str:
         """
         Processes a query by routing it to specific handlers and returns the response.
         :param query: The query to process.
+        :param session_id: Optional id of the conversation the query belongs to. Defaults to the active session.
         :return: Response to the query.
         """
+        if session_id is not None:  # Serve this turn from the given conversation's session
+            with SessionManager.activate(session_id):
+                return self.process_query(query)
         # Add the query to the history
         self.__session_manager.append_history('User: ' + query)
-        # Setup up global variables to be used later
-        response: str = ''
+        response, handler = self.__route(query)
+        if handler is not None:  # Route it to a handler
+            response = handler.handle(query.lower().strip())
+        # Add the response to the history and return it
+        self.__session_manager.append_history(f'PirateEase: {response}')
+        return response
+
+    async def process_query_async(self, query: str, session_id: str | None = None) -> str:
+        """
+        Async version of process_query. Handlers that need more from the user await the active channel, so one event
+        loop can hold many conversations that are each waiting on their customer.
+        :param query: The query to process.
+        :param session_id: Optional id of the conversation the query belongs to. Defaults to the active session.
+        :return: Response to the query.
+        """
+        if session_id is not None:  # Serve this turn from the given conversation's session
+            with SessionManager.activate(session_id):
+                return await self.process_query_async(query)
+        # Add the query to the history
+        self.__session_manager.append_history('User: ' + query)
+        response, handler = self.__route(query)
+        if handler is not None:  # Route it to a handler
+            response = await handler.handle_async(query.lower().strip())
+        # Add the response to the history and return it
+        self.__session_manager.append_history(f'PirateEase: {response}')
+        return response
+
+    def __route(self, query: str) -> tuple[str, QueryHandler | None]:
+        """
+        Answers the query directly when possible, otherwise picks the handler for its intent.
+        :param query: The query to route.
+        :return: The direct response and None, or an empty response and the handler that should answer.
+        """
+        # If an agent freed up for this session while it was waiting, hand it over
+        agent_connection: str = self.__agent_service.pending_connection()
+        if agent_connection:
+            return agent_connection, None
         db_response: str = self.__query_manager.get_handler('db').handle(query)
+        phrases: PhraseModel = self.__phrases.current  # This turn finishes on this version even if one is swapped in
+        # Find every sentiment and intent phrase in the query in a single pass
+        scan: set[tuple] = phrases.matcher.find_labels(query.lower())
         # If negative sentiment is detected
-        if self.__sentiment_analyzer.negative_sentiment_detected(query):
+        if phrases.sentiment_analyzer.negative_sentiment_detected(query, scan):
             negative_sentiment_response: str = ResponseFactory.get_response('negative')
             live_agent_connection_response: str = \
-            self.__query_manager.get_handler('live_agent').handle(query).split('\n', 1)[1]
-            response = negative_sentiment_response + '\n' + live_agent_connection_response
+            self.__query_manager.get_handler('live_agent').handle(query, urgent=True).split('\n', 1)[1]
+            return negative_sentiment_response + '\n' + live_agent_connection_response, None
         # Else if the database returned a response
         elif db_response:
-            response = db_response
+            return db_response, None
         # Else determine the intent and route it to a handler.
         else:
-            intent: str = self.__intent_recognizer.recognize_intent(query)
-            handler: QueryHandler = self.__query_manager.get_handler(intent)
-            response = handler.handle(query.lower().strip())
-        # Add the response to the history and return it
-        self.__session_manager.append_history(f'PirateEase: {response}')
-        return response
+            intent: str = phrases.intent_recognizer.recognize_intent(query, scan)
+            return '', self.__query_manager.get_handler(intent)
 
     def should_disconnect(self, response: str) -> bool:
         """
@@ -77,5 +155,6 @@ class ChatBot:
         :param response: The response to check.
         :return: True if a live agent connection was initiated or if the user used a farewell phrase, False otherwise.
         """
-        return (self.__agent_service.agent_name_in_string(response) or
-                any(word in response for word in self.__exit_phrases))
+        scan: set[tuple] = self.__phrases.current.matcher.find_labels(response.lower())
+        return (self.__agent_service.agent_name_in_string(response, scan) or
+                any(source == 'exit' for source, _ in scan))
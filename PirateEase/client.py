@@ -0,0 +1,46 @@
+import argparse, asyncio, os, sys
+
+"""
+Minimal terminal client for server.py. Lines typed by the user are sent to the server and every line the server sends
+is printed as it arrives.
+"""
+
+
+async def chat(host: str, port: int) -> None:
+    """
+    Connects to a PirateEase server and relays lines between the terminal and the server until either side hangs up.
+    :param host: Server host.
+    :param port: Server port.
+    :return: None
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+
+    async def print_server_lines() -> None:
+        while line := await reader.readline():
+            print(line.decode('utf-8').rstrip('\n'), flush=True)
+
+    async def send_user_lines() -> None:
+        while line := await loop.run_in_executor(None, sys.stdin.readline):
+            writer.write(line.encode('utf-8'))
+            await writer.drain()
+
+    printer: asyncio.Task = asyncio.create_task(print_server_lines())
+    sender: asyncio.Task = asyncio.create_task(send_user_lines())
+    await asyncio.wait({printer, sender}, return_when=asyncio.FIRST_COMPLETED)
+    sender.cancel()
+    writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Chat with a PirateEase server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(chat(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    # The stdin reader thread may still be blocked, so do not wait for it
+    sys.stdout.flush()
+    os._exit(0)
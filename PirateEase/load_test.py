@@ -0,0 +1,76 @@
+import argparse, asyncio, statistics, time
+
+from PirateEase.chatbot import ChatBot, GREETING
+from PirateEase.server import ChatServer
+
+"""
+Load test for server.py. Opens many idle sessions that only read the greeting and stay connected, then runs active
+sessions that ask a question and say goodbye, and reports how many sessions were held and how long turns took.
+Run from the PirateEase directory, like main.py. Large runs may need a higher open file limit (ulimit -n).
+"""
+
+QUESTIONS: tuple[str, ...] = ('how do i reset my password', 'what payment methods do you accept', 'bye')
+
+
+async def open_session(host: str, port: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Connects and reads the greeting.
+    :return: The connection's reader and writer.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in GREETING:
+        await reader.readline()
+    return reader, writer
+
+
+async def active_session(host: str, port: int, latencies: list[float]) -> None:
+    """
+    Asks every question in QUESTIONS and records how long each answer took.
+    """
+    reader, writer = await open_session(host, port)
+    for question in QUESTIONS:
+        start: float = time.perf_counter()
+        writer.write((question + '\n').encode('utf-8'))
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run(host: str, port: int | None, idle: int, active: int) -> None:
+    server: ChatServer | None = None
+    if port is None:  # Serve in process on a free port
+        server = ChatServer(ChatBot(), host, 0, max_sessions=idle + active)
+        await server.start()
+        port = server.port
+
+    start: float = time.perf_counter()
+    idle_sessions = await asyncio.gather(*(open_session(host, port) for _ in range(idle)))
+    print(f'{len(idle_sessions)} idle sessions open after {time.perf_counter() - start:.2f}s')
+    if server is not None:
+        print(f'server reports {server.active_sessions} active sessions')
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(active_session(host, port, latencies) for _ in range(active)))
+    elapsed: float = time.perf_counter() - start
+    latencies.sort()
+    print(f'{active} active sessions finished {len(latencies)} turns in {elapsed:.2f}s '
+          f'({len(latencies) / elapsed:.0f} turns/s) while {idle} idle sessions stayed connected')
+    print(f'turn latency p50={statistics.median(latencies) * 1000:.2f}ms '
+          f'p99={latencies[int(len(latencies) * 0.99)] * 1000:.2f}ms max={latencies[-1] * 1000:.2f}ms')
+
+    for _, writer in idle_sessions:
+        writer.close()
+    if server is not None:
+        await server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test a PirateEase server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='Existing server to test. Omit to serve in process.')
+    parser.add_argument('--idle', type=int, default=3000)
+    parser.add_argument('--active', type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.idle, args.active))
@@ -1,15 +1,31 @@
-from chatbot import ChatBot
-from PirateEase.Utils.slow_print import slow_print
+import asyncio
+
+from PirateEase.chatbot import ChatBot, GREETING
+from PirateEase.Utils.io_channel import IOChannel, TerminalChannel, use_channel
+
+"""
+Chats with a single user at the terminal. Responses are typed out in the background while the next turn carries on.
+"""
+
+
+async def chat(chatbot: ChatBot, channel: IOChannel) -> None:
+    """
+    Holds one conversation over the given channel until the user says goodbye.
+    :param chatbot: The chatbot answering the user.
+    :param channel: The channel the user talks through.
+    :return: None
+    """
+    with use_channel(channel):
+        for line in GREETING:
+            print(line)
+        user_input: str = ''
+        response: str = ''
+        while not chatbot.should_disconnect(response + user_input):
+            user_input = await channel.receive()
+            response = await chatbot.process_query_async(user_input)
+            await channel.send(f'PirateEase: {response}')
+        await channel.drain()  # Finish typing the goodbye before the loop shuts down
+
 
 if __name__ == '__main__':
-    chatbot: ChatBot = ChatBot()
-    print('PirateEase: Hello! Welcome to the PirateEase support bot!')
-    print('PirateEase: You can ask me about the status of your order, '
-          'have me refund a purchase, have me check the availability of a product, or I can connect you with one of our '
-          'live agents.')
-    user_input: str = ''
-    response: str = ''
-    while not chatbot.should_disconnect(response + user_input):
-        user_input= input('User: ')
-        response = chatbot.process_query(user_input)
-        slow_print(f'PirateEase: {response}')
\ No newline at end of file
+    asyncio.run(chat(ChatBot(), TerminalChannel()))
@@ -0,0 +1,196 @@
+import argparse, asyncio, itertools
+
+from PirateEase.chatbot import ChatBot, GREETING
+from PirateEase.Services.live_agent_notifier import LiveAgentService
+from PirateEase.Utils.hot_reload import HotReloader
+from PirateEase.Utils.io_channel import AsyncChannel, use_channel
+from PirateEase.Utils.session_manager import SessionManager
+from PirateEase.Utils.slow_print import set_typing_effect
+
+"""
+OOP Principles
+- Encapsulation: Connection bookkeeping and session limits are private to ChatServer.
+- Abstraction: Clients only see a line based chat, not the sessions and channels behind it.
+- Composition: ChatServer is composed of one shared ChatBot that serves every connection.
+
+Structural Pattern
+- Adapter: Adapts TCP streams to the AsyncChannel the handlers already talk to.
+
+SOLID Principles
+- Single Responsibility: Only accepts connections and runs one conversation per connection.
+- Dependency Inversion: Depends on ChatBot's async interface rather than on any handler.
+"""
+
+# Sent to a client that connects while the server is full
+BUSY_MESSAGE: str = 'PirateEase: All hands are on deck right now. Please try again shortly.'
+
+
+class ChatServer:
+    """
+    Line based TCP chat server that gives every connection its own session.
+    """
+
+    def __init__(self, chatbot: ChatBot, host: str = '127.0.0.1', port: int = 8765, max_sessions: int = 10000):
+        """
+        :param chatbot: The ChatBot shared by every session.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free port.
+        :param max_sessions: Maximum number of concurrent sessions. Extra connections are turned away.
+        """
+        self.__chatbot: ChatBot = chatbot
+        self.__host: str = host
+        self.__port: int = port
+        self.__max_sessions: int = max_sessions
+        self.__active_sessions: int = 0
+        self.__session_ids = itertools.count(1)
+        self.__server: asyncio.Server | None = None
+        self.__writers: set[asyncio.StreamWriter] = set()  # Open connections, closed on shutdown
+        self.__drained: asyncio.Event | None = None  # Set whenever no session is active
+
+    @property
+    def active_sessions(self) -> int:
+        return self.__active_sessions
+
+    @property
+    def port(self) -> int:
+        """
+        The port actually being listened on, useful when the server was started on port 0.
+        """
+        return self.__server.sockets[0].getsockname()[1] if self.__server else self.__port
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+        :return: None
+        """
+        self.__drained = asyncio.Event()
+        self.__drained.set()
+        self.__server = await asyncio.start_server(self.__handle_connection, self.__host, self.__port,
+                                                   backlog=min(self.__max_sessions, 4096))
+
+    async def serve_forever(self) -> None:
+        """
+        Starts the server if needed and serves connections until cancelled.
+        :return: None
+        """
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops accepting connections, hangs up on every client, and waits for their sessions to end.
+        :return: None
+        """
+        if self.__server is not None:
+            self.__server.close()
+            for writer in list(self.__writers):
+                writer.close()
+            await self.__drained.wait()
+            await self.__server.wait_closed()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Runs one conversation for the lifetime of a connection.
+        :param reader: Stream of lines from the client.
+        :param writer: Stream of lines to the client.
+        :return: None
+        """
+        if self.__active_sessions >= self.__max_sessions:  # Turn the client away if we are full
+            writer.write((BUSY_MESSAGE + '\n').encode('utf-8'))
+            await self.__close_writer(writer)
+            return
+
+        self.__active_sessions += 1
+        self.__drained.clear()
+        self.__writers.add(writer)
+        session_id: str = f'tcp-{next(self.__session_ids)}'
+        channel: AsyncChannel = AsyncChannel()
+        conversation: asyncio.Task = asyncio.create_task(self.__converse(channel, session_id))
+        sender: asyncio.Task = asyncio.create_task(self.__send_outputs(channel, writer))
+        receiver: asyncio.Task = asyncio.create_task(self.__receive_inputs(channel, reader))
+        try:
+            # The connection lasts until the conversation ends or the client hangs up
+            await asyncio.wait({conversation, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if conversation.done():
+                await channel.send('')  # Sentinel so the sender flushes everything before we hang up
+                await sender
+        finally:
+            for task in (conversation, sender, receiver):
+                task.cancel()
+            LiveAgentService().cancel(session_id)  # Give up its place in line, or free its agent
+            SessionManager.end_session(session_id)
+            self.__writers.discard(writer)
+            await self.__close_writer(writer)
+            self.__active_sessions -= 1
+            if not self.__active_sessions:
+                self.__drained.set()
+
+    async def __converse(self, channel: AsyncChannel, session_id: str) -> None:
+        """
+        The same loop as main.py, but reading from and writing to the connection's channel.
+        :param channel: The connection's channel.
+        :param session_id: The connection's session id.
+        :return: None
+        """
+        with use_channel(channel), SessionManager.activate(session_id):
+            for line in GREETING:
+                await channel.send(line)
+            user_input: str = ''
+            response: str = ''
+            while not self.__chatbot.should_disconnect(response + user_input):
+                user_input = await channel.receive()
+                response = await self.__chatbot.process_query_async(user_input)
+                await channel.send(f'PirateEase: {response}')
+
+    @staticmethod
+    async def __send_outputs(channel: AsyncChannel, writer: asyncio.StreamWriter) -> None:
+        """
+        Writes everything the conversation sends to the client, one message per line.
+        :param channel: The connection's channel.
+        :param writer: Stream of lines to the client.
+        :return: None
+        """
+        while message := await channel.next_output():
+            writer.write((message + '\n').encode('utf-8'))
+            await writer.drain()
+
+    @staticmethod
+    async def __receive_inputs(channel: AsyncChannel, reader: asyncio.StreamReader) -> None:
+        """
+        Delivers every line the client sends to the conversation.
+        :param channel: The connection's channel.
+        :param reader: Stream of lines from the client.
+        :return: None
+        """
+        while line := await reader.readline():
+            channel.deliver(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+
+    @staticmethod
+    async def __close_writer(writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve PirateEase over TCP, one session per connection.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help='seconds between checks for edited phrase, FAQ, and response databases, 0 to never reload')
+    args = parser.parse_args()
+
+    set_typing_effect(False)  # Clients render replies themselves
+    chat_server: ChatServer = ChatServer(ChatBot(), args.host, args.port, args.max_sessions)
+    if args.reload_interval > 0:
+        HotReloader.start(args.reload_interval)
+    print(f'PirateEase server listening on {args.host}:{args.port}')
+    try:
+        asyncio.run(chat_server.serve_forever())
+    except KeyboardInterrupt:
+        pass
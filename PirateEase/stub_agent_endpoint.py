@@ -0,0 +1,90 @@
+import argparse, json, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PirateEase.Services.live_agent_notifier import LiveAgentNotifier, WebhookAgent
+
+"""
+Stub of an agent's desk app that takes alerts over HTTP after a configurable delay. Run it from the PirateEase
+directory to compare alerting agents one after another with LiveAgentNotifier's parallel fan-out.
+"""
+
+
+class StubAgentEndpoint:
+    """
+    Local HTTP server that acknowledges every alert posted to it after a delay and remembers what it received.
+    """
+
+    def __init__(self, delay: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        """
+        :param delay: Seconds to wait before acknowledging an alert.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free port.
+        """
+        self.delay: float = delay
+        self.received: list[dict] = []
+        self.connections: int = 0  # Connections accepted so far
+        endpoint: StubAgentEndpoint = self
+        lock: threading.Lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep connections open between alerts
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                with lock:
+                    endpoint.connections += 1
+
+            def do_POST(self):
+                body: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                endpoint.received.append(json.loads(body))
+                time.sleep(endpoint.delay)
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):  # Keep the demo output readable
+                pass
+
+        self.__server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self.__server.daemon_threads = True
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}/alert'
+
+    def __enter__(self) -> 'StubAgentEndpoint':
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare serial and parallel agent alerts against a slow endpoint.')
+    parser.add_argument('--agents', type=int, default=10)
+    parser.add_argument('--delay', type=float, default=0.3, help='seconds the endpoint takes to acknowledge')
+    args = parser.parse_args()
+
+    history: list[str] = ['User: my order never arrived', 'PirateEase: Let me get someone to help']
+    with StubAgentEndpoint(args.delay) as stub:
+        agents: list[WebhookAgent] = [WebhookAgent(f'Agent {i}', True, stub.url) for i in range(args.agents)]
+
+        start: float = time.perf_counter()
+        for agent in agents:
+            agent.alert(LiveAgentNotifier.snapshot(history))
+        serial: float = time.perf_counter() - start
+        print(f'serial: customer waited {serial * 1000:.0f}ms for {args.agents} alerts')
+
+        LiveAgentNotifier.observers[:] = agents
+        start = time.perf_counter()
+        outcome = LiveAgentNotifier.notify_agents(history)
+        returned: float = time.perf_counter() - start
+        outcome.result()
+        done: float = time.perf_counter() - start
+        print(f'fan-out: customer waited {returned * 1000:.1f}ms, every agent alerted after {done * 1000:.0f}ms')
@@ -0,0 +1,157 @@
+import argparse, json, os, random, threading, time, urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from PirateEase.Services.transport import HTTPTransport
+
+"""
+Local stand-in for the remote order, refund, inventory, and agent systems. Serves every JSON file in the Databases
+directory over HTTP with keep-alive and an optional delay per request, so the transport can be measured against
+network-shaped latency without any outside services. Run it from the PirateEase directory.
+
+GET /<file>                 Whole file, e.g. /orders
+GET /<file>/<key>           One record: the value under key for objects, the entry with that name for lists
+POST /<file>/<key>          Merges the JSON body into one record, kept in memory only
+"""
+
+
+class StubBackendServer:
+    """
+    Local HTTP server that serves the JSON databases and counts the connections it accepts.
+    """
+
+    def __init__(self, databases: str = 'Databases', latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        """
+        :param databases: Directory holding the JSON files to serve.
+        :param latency: Seconds added to every request.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free port.
+        """
+        self.latency: float = latency
+        self.connections: int = 0  # Connections accepted so far
+        self.requests: int = 0  # Requests answered so far
+        self.__lock: threading.Lock = threading.Lock()
+        self.__data: dict[str, object] = {}
+        for file_name in os.listdir(databases):
+            if file_name.endswith('.json'):
+                with open(os.path.join(databases, file_name), 'r', encoding='utf-8') as f:
+                    self.__data[file_name[:-len('.json')]] = json.load(f)
+        server: StubBackendServer = self
+        lock: threading.Lock = self.__lock
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep connections open between requests
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                with lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                self.__reply(server.lookup(self.path))
+
+            def do_POST(self):
+                time.sleep(server.latency)
+                body: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self.__reply(server.update(self.path, json.loads(body or b'{}')))
+
+            def __reply(self, record) -> None:
+                with lock:
+                    server.requests += 1
+                body: bytes = b'' if record is None else json.dumps(record).encode('utf-8')
+                self.send_response(404 if record is None else 200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # Keep the benchmark output readable
+                pass
+
+        self.__server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+        self.__server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def lookup(self, path: str):
+        """
+        Finds the document a path refers to.
+        :param path: /<file> or /<file>/<key>.
+        :return: The document, or None if there is none.
+        """
+        parts: list[str] = [unquote(part) for part in urlsplit(path).path.strip('/').split('/', 1)]
+        document = self.__data.get(parts[0])
+        if document is None or len(parts) == 1:
+            return document
+        if isinstance(document, dict):
+            return document.get(parts[1])
+        return next((entry for entry in document if isinstance(entry, dict) and entry.get('name') == parts[1]), None)
+
+    def update(self, path: str, changes: dict):
+        """
+        Merges changes into the record a path refers to.
+        :param path: /<file>/<key>.
+        :param changes: Fields to set.
+        :return: The updated record, or None if there is none.
+        """
+        with self.__lock:
+            record = self.lookup(path)
+            if not isinstance(record, dict) or record is self.__data.get(urlsplit(path).path.strip('/')):
+                return None
+            record.update(changes)
+            return record
+
+    def __enter__(self) -> 'StubBackendServer':
+        threading.Thread(target=self.__server.serve_forever, args=(0.05,), daemon=True).start()  # Quick to shut down
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare a new connection per request with the pooled transport.')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.002, help='seconds the stand-in adds to every request')
+    args = parser.parse_args()
+
+    with StubBackendServer(latency=args.latency) as stub:
+        order_ids: list[str] = list(stub.lookup('/orders'))
+        paths: list[str] = [f'/orders/{random.choice(order_ids)}' for _ in range(args.requests)]
+
+        def run(fetch) -> float:
+            """
+            Fetches every path across the threads.
+            :param fetch: Fetches one path.
+            :return: Seconds taken.
+            """
+            chunks: list[list[str]] = [paths[i::args.threads] for i in range(args.threads)]
+            threads: list[threading.Thread] = [threading.Thread(target=lambda c=chunk: [fetch(p) for p in c])
+                                               for chunk in chunks]
+            start: float = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return time.perf_counter() - start
+
+        def fetch_unpooled(path: str):
+            with urllib.request.urlopen(stub.url + path, timeout=5) as response:
+                return json.load(response)
+
+        before: int = stub.connections
+        unpooled: float = run(fetch_unpooled)
+        print(f'new connection per request: {unpooled * 1000:.0f}ms, {stub.connections - before} connections')
+
+        transport: HTTPTransport = HTTPTransport(stub.url, max_connections=args.threads)
+        before = stub.connections
+        pooled: float = run(transport.get_json)
+        print(f'pooled keep-alive:          {pooled * 1000:.0f}ms, {stub.connections - before} connections')
+        transport.close()
@@ -9,7 +9,7 @@ def handler_with_mocks():
 
     # Mock session state
     handler._session = MagicMock()
-    handler._session.state = ["previous message", "another message"]
+    handler._session.history = ["previous message", "another message"]
 
     # Mock backend
     handler._backend = MagicMock()
@@ -38,3 +38,11 @@ def test_handle_triggers_agent_connection(mock_notifier, mock_factory, handler_w
     # Check response factory usage
     mock_factory.get_response.assert_called_once_with("live_agent")
     handler_with_mocks._backend.process_request.assert_called_once_with("agent")
+
+
+@patch("PirateEase.QueryHandlers.live_agent_handler.ResponseFactory")
+@patch("PirateEase.QueryHandlers.live_agent_handler.LiveAgentNotifier")
+def test_urgent_escalation(mock_notifier, mock_factory, handler_with_mocks):
+    mock_factory.get_response.return_value = "A live agent will be with you shortly."
+    handler_with_mocks.handle("This is awful", urgent=True)
+    handler_with_mocks._backend.process_request.assert_called_once_with("agent", "urgent")
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from PirateEase.QueryHandlers.order_tracking_handler import OrderTrackingHandler
+from PirateEase.Utils.backend_manager import DegradedResponse
 
 
 @pytest.fixture
@@ -30,10 +32,7 @@ def test_handle_with_existing_order_id(handler_with_mocks):
 
 @patch("PirateEase.QueryHandlers.order_tracking_handler.UserInterface")
 @patch("PirateEase.QueryHandlers.order_tracking_handler.ResponseFactory")
-@patch("PirateEase.QueryHandlers.order_tracking_handler.slow_print")
-def test_handle_with_missing_order_id_and_retry(
-    mock_slow_print, mock_response_factory, mock_user_interface
-):
+def test_handle_with_missing_order_id_and_retry(mock_response_factory, mock_user_interface):
     handler = OrderTrackingHandler()
 
     handler._session = MagicMock()
@@ -58,13 +57,38 @@ def test_handle_with_missing_order_id_and_retry(
     # Confirm prompt was called twice
     assert mock_user_interface.get_order_id.call_count == 2
 
-    # Confirm slow_print got the fallback
-    mock_slow_print.assert_called_once_with("PirateEase: Order #99 not found.")
-
-    # Check session history was updated in order
-    history_calls = handler._session.append_history.call_args_list
-    assert len(history_calls) == 1
-    assert history_calls[0][0][0] == "PirateEase: Order #99 not found."
+    # Confirm the user was told about the fallback
+    mock_user_interface.say.assert_called_once_with("PirateEase: Order #99 not found.")
 
     # Confirm session was updated with final successful ID
     handler._session.set.assert_called_once_with("order_id", "99")
+
+
+@patch("PirateEase.QueryHandlers.order_tracking_handler.UserInterface")
+@patch("PirateEase.QueryHandlers.order_tracking_handler.ResponseFactory")
+def test_handle_async_awaits_order_id_until_found(mock_response_factory, mock_user_interface):
+    handler = OrderTrackingHandler()
+    handler._session = MagicMock()
+    handler._session.__contains__.return_value = False
+    handler._backend = MagicMock()
+    handler._backend.process_request.side_effect = ['', 'Order #99 is on the way!']
+
+    mock_user_interface.get_order_id_async = AsyncMock(side_effect=["98", "99"])
+    mock_user_interface.say_async = AsyncMock()
+    mock_response_factory.get_response.return_value = "Order #{order_id} not found."
+
+    result = asyncio.run(handler.handle_async("any query"))
+
+    assert result == "Order #99 is on the way!"
+    mock_user_interface.say_async.assert_awaited_once_with("PirateEase: Order #98 not found.")
+    handler._session.set.assert_called_once_with("order_id", "99")
+
+
+@patch("PirateEase.QueryHandlers.order_tracking_handler.UserInterface")
+def test_handle_degraded_backend_keeps_nothing(mock_user_interface, handler_with_mocks):
+    handler_with_mocks._session.__contains__.side_effect = lambda key: False
+    handler_with_mocks._backend.process_request.return_value = DegradedResponse("Try again later.")
+    mock_user_interface.get_order_id.return_value = "42"
+
+    assert handler_with_mocks.handle("any query") == "Try again later."
+    handler_with_mocks._session.set.assert_not_called()
@@ -1,5 +1,7 @@
+import asyncio
+import threading
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from PirateEase.QueryHandlers.product_availability_handler import ProductAvailabilityHandler
 
 
@@ -31,4 +33,29 @@ def test_handle_product_availability(mock_user_interface, handler_with_mocks):
     handler_with_mocks._session.set.assert_called_once_with("item_name", test_item)
 
     # Assert final response
-    assert response == "We have 5 Golden Compasses in stock."
\ No newline at end of file
+    assert response == "We have 5 Golden Compasses in stock."
+
+
+@patch("PirateEase.QueryHandlers.product_availability_handler.UserInterface")
+def test_slow_lookup_does_not_stall_other_sessions(mock_user_interface, handler_with_mocks):
+    mock_user_interface.get_item_name_async = AsyncMock(side_effect=["rum", "compass"])
+    answered = threading.Event()
+
+    def process_request(request_type, item):
+        if item == "rum":  # Slow until the other session has been answered
+            return "rum in stock" if answered.wait(5) else "stalled"
+        return f"{item} in stock"
+
+    handler_with_mocks._backend.process_request.side_effect = process_request
+
+    async def other_session():
+        result = await handler_with_mocks.handle_async("Doesn't matter")
+        answered.set()
+        return result
+
+    async def both():
+        slow = asyncio.create_task(handler_with_mocks.handle_async("Doesn't matter"))
+        await asyncio.sleep(0)  # The slow lookup is under way
+        return await asyncio.gather(slow, other_session())
+
+    assert asyncio.run(both()) == ["rum in stock", "compass in stock"]
@@ -31,3 +31,37 @@ def test_unknown_query_returns_empty_string(mock_queries_file):
     handler = QueryDatabase()
     result = handler.handle("Do you sell parrots?")
     assert result == ''
+
+
+@pytest.mark.parametrize("query", ["how do i order", "  How   do I order!!", "HOW DO I ORDER ?"])
+def test_normalized_query_returns_response(mock_queries_file, query):
+    assert QueryDatabase().handle(query) == "To order, simply type what you want!"
+
+
+def test_apostrophes_are_folded(mock_queries_file):
+    handler = QueryDatabase()
+    expected = "Refunds are available within 30 days of delivery."
+    assert handler.handle("What's your refund policy?") == expected
+    assert handler.handle("whats your refund policy") == expected
+
+
+def test_similar_query_returns_nearest_response(mock_queries_file):
+    handler = QueryDatabase()
+    assert handler.handle("what is your refund policy?") == "Refunds are available within 30 days of delivery."
+    assert handler.handle("how do i ordr") == "To order, simply type what you want!"
+    assert handler.handle("how do i refund") == ''
+
+
+def test_tfidf_retrieval_matches_paraphrase(mock_queries_file, monkeypatch):
+    monkeypatch.setattr(QueryDatabase, "retrieval", "tfidf")
+    handler = QueryDatabase()
+    assert handler.handle("what is the refund policy") == "Refunds are available within 30 days of delivery."
+    assert handler.handle("Do you sell parrots?") == ''
+
+
+@pytest.mark.parametrize("retrieval", ["trigram", "tfidf"])
+def test_handle_many(mock_queries_file, monkeypatch, retrieval):
+    monkeypatch.setattr(QueryDatabase, "retrieval", retrieval)
+    handler = QueryDatabase()
+    responses = handler.handle_many(["hello!", "Do you sell parrots?", "how do i ordr"])
+    assert responses == ["Ahoy there, matey!", "", "To order, simply type what you want!"]
@@ -38,3 +38,27 @@ def test_get_handler_returns_correct_instance(manager, query_type, expected_type
 def test_get_handler_invalid_type_returns_none(manager):
     handler = manager.get_handler("parrot")
     assert handler is None
+
+
+def test_handlers_are_built_on_first_use(manager):
+    assert manager.handlers == {}
+    handler = manager.get_handler("order")
+    assert list(manager.handlers) == ["order"]
+    assert manager.get_handler("ORDER") is handler
+
+
+def test_faq_only_conversation_loads_nothing_else():
+    with patch('builtins.open', mock_open(read_data='{"hi": "Ahoy!"}')) as mock_file:
+        manager = QueryManager()
+        assert manager.get_handler("db").handle("hi") == "Ahoy!"
+        assert manager.get_handler("db").handle("what?") == ""
+
+    opened = [call.args[0] for call in mock_file.call_args_list]
+    assert opened == ['Databases/queries.json']
+    assert list(manager.handlers) == ["db"]
+
+
+def test_register_custom_handler(monkeypatch):
+    monkeypatch.setattr(QueryManager, "registry", dict(QueryManager.registry))
+    QueryManager.register("Parrot", lambda: "squawk handler")
+    assert QueryManager().get_handler("parrot") == "squawk handler"
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from PirateEase.QueryHandlers.refund_handler import RefundHandler
+from PirateEase.Utils.backend_manager import DegradedResponse
 
 
 @pytest.fixture
@@ -23,10 +25,7 @@ def test_handle_uses_existing_refund_id(handler_with_mocks):
 
 @patch("PirateEase.QueryHandlers.refund_handler.ResponseFactory")
 @patch("PirateEase.QueryHandlers.refund_handler.UserInterface")
-@patch("PirateEase.QueryHandlers.refund_handler.slow_print")
-def test_handle_prompts_until_valid_refund_id(
-    mock_slow_print, mock_user_interface, mock_response_factory, handler_with_mocks
-):
+def test_handle_prompts_until_valid_refund_id(mock_user_interface, mock_response_factory, handler_with_mocks):
     handler_with_mocks._session.__contains__.return_value = False
     handler_with_mocks._session.append_history = MagicMock()
     handler_with_mocks._session.set = MagicMock()
@@ -57,10 +56,32 @@ def test_handle_prompts_until_valid_refund_id(
     # Refund reason asked
     mock_user_interface.get_refund_reason.assert_called_once()
 
-    # Check session history entries
-    history_calls = handler_with_mocks._session.append_history.call_args_list
-    assert len(history_calls) == 1
-    assert history_calls[0][0][0] == "PirateEase: Order #999 not found."
+    # The user was told the order was not found
+    mock_user_interface.say.assert_called_once_with("PirateEase: Order #999 not found.")
 
-    # slow_print called with correct message
-    mock_slow_print.assert_called_once_with("PirateEase: Order #999 not found.")
+
+@patch("PirateEase.QueryHandlers.refund_handler.UserInterface")
+def test_handle_async_collects_refund_id_and_reason(mock_user_interface, handler_with_mocks):
+    handler_with_mocks._session.__contains__.return_value = False
+    handler_with_mocks._backend.process_request.return_value = "Refund complete!"
+    mock_user_interface.get_order_id_async = AsyncMock(return_value="999")
+    mock_user_interface.get_refund_reason_async = AsyncMock(return_value="Item was damaged")
+
+    result = asyncio.run(handler_with_mocks.handle_async("any query"))
+
+    assert result == "Refund complete!"
+    handler_with_mocks._backend.process_request.assert_called_once_with("refund", "999")
+    handler_with_mocks._session.set.assert_called_once_with("refund_id", "999")
+    mock_user_interface.get_refund_reason_async.assert_awaited_once()
+
+
+@patch("PirateEase.QueryHandlers.refund_handler.UserInterface")
+def test_handle_degraded_backend_keeps_nothing(mock_user_interface, handler_with_mocks):
+    handler_with_mocks._session.__contains__.return_value = False
+    handler_with_mocks._backend.process_request.return_value = DegradedResponse("Try again later.")
+    mock_user_interface.get_order_id.return_value = "999"
+
+    assert handler_with_mocks.handle("any query") == "Try again later."
+    handler_with_mocks._backend.process_request.assert_called_once_with("refund", "999")
+    handler_with_mocks._session.set.assert_not_called()
+    mock_user_interface.get_refund_reason.assert_not_called()
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from PirateEase.Services.agent_pool import LRUAgentPool, RandomAgentPool
+
+
+@pytest.mark.parametrize("pool", [RandomAgentPool(random.Random(7)), LRUAgentPool()])
+def test_checkout_empties_pool(pool):
+    for agent in "abcde":
+        pool.add(agent)
+    pool.add("a")  # Already in the pool
+    assert len(pool) == 5
+
+    pool.remove("c")
+    pool.remove("z")  # Not in the pool
+    taken = [pool.checkout() for _ in range(4)]
+    assert sorted(taken) == ["a", "b", "d", "e"]
+    assert pool.checkout() is None
+    assert len(pool) == 0
+
+
+def test_random_pool_keeps_positions_after_removal():
+    pool = RandomAgentPool(random.Random(1))
+    for agent in range(100):
+        pool.add(agent)
+    for agent in range(0, 100, 2):
+        pool.remove(agent)
+    assert all(agent in pool for agent in range(1, 100, 2))
+    assert sorted(pool.checkout() for _ in range(50)) == list(range(1, 100, 2))
+
+
+def test_lru_pool_hands_out_longest_free_first():
+    pool = LRUAgentPool()
+    for agent in "abc":
+        pool.add(agent)
+    assert pool.checkout() == "a"
+    pool.add("a")
+    assert [pool.checkout() for _ in range(3)] == ["b", "c", "a"]
@@ -0,0 +1,49 @@
+from PirateEase.Services.escalation_queue import NORMAL, URGENT, EscalationQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_urgent_first_then_longest_waiting():
+    clock = Clock()
+    queue = EscalationQueue(clock)
+    for name, priority in [("calm-1", NORMAL), ("upset-1", URGENT), ("calm-2", NORMAL), ("upset-2", URGENT)]:
+        queue.push(name, priority)
+        clock.now += 1
+
+    assert queue.position("upset-1") == 1
+    assert queue.position("calm-2") == 4
+    assert queue.waited("calm-1") == 4
+    assert [queue.pop() for _ in range(5)] == ["upset-1", "upset-2", "calm-1", "calm-2", None]
+
+
+def test_reprioritizing_keeps_waiting_time():
+    clock = Clock()
+    queue = EscalationQueue(clock)
+    queue.push("a", NORMAL)
+    clock.now = 1
+    queue.push("b", URGENT)
+    clock.now = 2
+    queue.push("a", URGENT)  # Got upset while waiting, but still started waiting first
+
+    assert len(queue) == 2
+    assert queue.pop() == "a"
+    assert queue.pop() == "b"
+    assert queue.pop() is None
+
+
+def test_remove():
+    queue = EscalationQueue()
+    for i in range(100):
+        queue.push(i)
+    for i in range(0, 100, 2):
+        queue.remove(i)
+    queue.remove("missing")
+    assert 1 in queue and 2 not in queue
+    assert queue.position(1) == 1 and queue.position(2) == 0
+    assert [queue.pop() for _ in range(50)] == list(range(1, 100, 2))
@@ -0,0 +1,76 @@
+from PirateEase.Services.inventory_index import InventoryIndex
+
+
+def build_index() -> InventoryIndex:
+    index = InventoryIndex()
+    index.add(0, 'gold coin', ['doubloon'], ['currency'])
+    index.add(1, 'silver cup', ['goblet'], ['tableware'])
+    index.add(2, 'gold goblet', ['chalice'], ['tableware', 'treasure'])
+    return index
+
+
+def test_matches_name_and_synonym_substrings():
+    index = build_index()
+    assert index.matches('coin') == [0]
+    assert index.matches('a shiny doubloon') == [0]
+    assert index.matches('diamond') == []
+
+
+def test_matches_ranks_best_match_first():
+    index = build_index()
+    # 'goblet' is a synonym of the silver cup but the gold goblet's name contains it, which ranks higher
+    assert index.matches('goblet') == [2, 1]
+    assert index.matches('gold goblet')[0] == 2
+
+
+def test_search_includes_shared_words_and_tags():
+    index = build_index()
+    assert index.matches('gold ring') == []
+    assert set(index.search('gold ring')) == {0, 2}
+    assert index.search('tableware') == [1, 2]
+    assert index.search('goblet', limit=1) == [2]
+
+
+def test_incremental_add_and_remove():
+    index = build_index()
+    index.remove(0)
+    assert 0 not in index
+    assert index.matches('coin') == []
+    assert index.search('currency') == []
+
+    index.add(3, 'copper coin', ['penny'], ['currency'])
+    index.add(2, 'gold plate', [], ['tableware'])  # Re-adding an id replaces it
+    assert index.matches('coin') == [3]
+    assert index.matches('goblet') == [1]
+    assert len(index) == 3
+
+
+def test_empty_synonym_matches_everything():
+    index = InventoryIndex()
+    index.add(0, 'mystery box', [''], [])
+    assert index.matches('anything') == [0]
+
+
+class CountingEntries(dict):
+    """Counts how many entries a lookup scores."""
+    reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super().__getitem__(key)
+
+
+def test_lookup_on_large_catalog_only_scores_candidates():
+    index = InventoryIndex()
+    for i in range(20000):
+        index.add(i, f'item {i} widget', [f'gizmo{i}'], ['bulk', f'batch{i % 100}'])
+    entries = index._InventoryIndex__entries = CountingEntries(index._InventoryIndex__entries)
+
+    assert index.matches('gizmo12345')[0] == 12345  # gizmo1, gizmo12, ... match too but rank lower
+    assert entries.reads < 50  # Only products sharing a key with the item, not all 20000
+
+
+def test_empty_name_does_not_divide_by_zero():
+    index = InventoryIndex()
+    index.add(0, '', ['mystery'], [])
+    assert index.matches('') == [0]
@@ -28,6 +28,13 @@ def mock_inventory_file():
         yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_service():
+    InventoryService.reset()
+    yield
+    InventoryService.reset()
+
+
 @pytest.fixture
 def mock_response_factory():
     """Fixture to mock ResponseFactory"""
@@ -110,4 +117,54 @@ def test_reset_behavior(mock_inventory_file):
     instance1 = InventoryService()
     InventoryService.reset()
     instance2 = InventoryService()
-    assert instance1 is not instance2
\ No newline at end of file
+    assert instance1 is not instance2
+
+def test_get_matching_items_returns_best_match(mock_inventory_file):
+    service = InventoryService()
+    service.add_product(InventoryProduct("gold goblet", 1, 99.99, ["chalice"], ["tableware"]))
+    # The silver cup comes first but only matches on a synonym
+    assert service.get_matching_items("goblet").name == "gold goblet"
+
+
+def test_search_items(mock_inventory_file):
+    service = InventoryService()
+    assert [p.name for p in service.search_items("tableware")] == ["silver cup"]
+    assert [p.name for p in service.search_items("gold ring")] == ["gold coin"]
+    assert service.search_items("diamond") == []
+
+
+def test_incremental_product_changes(mock_inventory_file):
+    service = InventoryService()
+    service.update_product("silver cup", InventoryProduct("silver chalice", 0, 29.99, ["goblet"], ["tableware"]))
+    assert service.get_matching_items("chalice").name == "silver chalice"
+    assert service.get_matching_items("silver cup") is None
+
+    assert service.remove_product("gold coin").name == "gold coin"
+    assert service.remove_product("gold coin") is None
+    assert service.get_matching_items("doubloon") is None
+
+
+def test_stock_changes_write_through(mock_inventory_file):
+    service = InventoryService()
+    service.get_matching_items("gold coin").quantity = 0
+    assert service.get_matching_items("doubloon").quantity == 0
+    assert {p.name for p in service.out_of_stock()} == {"gold coin", "silver cup"}
+
+
+def test_stock_reports(mock_inventory_file):
+    service = InventoryService()
+    service.add_product(InventoryProduct("gold goblet", 2, 50.0, [], ["tableware", "treasure"]))
+    assert [p.name for p in service.out_of_stock()] == ["silver cup"]
+    assert service.total_value() == pytest.approx(10 * 1.99 + 2 * 50.0)
+    assert service.value_by_tag() == pytest.approx({"currency": 19.9, "tableware": 100.0, "treasure": 100.0})
+
+    service.remove_product("gold coin")
+    assert "currency" not in service.value_by_tag()
+    assert service.total_value() == pytest.approx(100.0)
+
+
+def test_adjust_stock(mock_inventory_file):
+    service = InventoryService()
+    assert service.adjust_stock("gold coin", -4)
+    assert not service.adjust_stock("gold coin", -7)
+    assert service.get_matching_items("gold coin").quantity == 6
@@ -0,0 +1,98 @@
+import threading
+
+from PirateEase.Services.inventory_store import InventoryProduct, InventoryStore, ProductView
+
+
+def build_store() -> InventoryStore:
+    store = InventoryStore()
+    store.append(InventoryProduct("gold coin", 10, 1.99, ["doubloon"], ["currency", "treasure"]))
+    store.append(InventoryProduct("silver cup", 0, 29.99, ["goblet"], ["tableware"]))
+    store.append(InventoryProduct("ruby", 1, 100.0, [], ["treasure"]))
+    return store
+
+
+def test_views_read_and_write_columns():
+    store = build_store()
+    view = store.view(0)
+    assert isinstance(view, InventoryProduct)
+    assert (view.name, view.quantity, view.price) == ("gold coin", 10, 1.99)
+    assert view.synonyms == ("doubloon",)
+    assert view.item_matches_product("gold doubloon")
+
+    view.quantity = 3
+    view.price = 2.5
+    assert store.quantity(0) == 3
+    assert store.price(0) == 2.5
+    assert store.view(0) == view
+    assert not hasattr(view, "__dict__")
+
+
+def test_strings_are_interned():
+    store = build_store()
+    other = InventoryProduct("".join(["gold", " coin"]), 1, 1.0, [], ["".join(["curr", "ency"])])
+    row = store.append(other)
+    assert store.name(row) is store.name(0)
+    assert store.tags(row)[0] is store.tags(0)[0]
+
+
+def test_delete_leaves_stable_rows():
+    store = build_store()
+    store.delete(1)
+    store.delete(1)  # Deleting an empty row is a no-op
+    assert len(store) == 2
+    assert list(store.rows()) == [0, 2]
+    assert [view.name for view in store] == ["gold coin", "ruby"]
+
+    store.replace(1, InventoryProduct("bronze bell", 4, 5.0, [], []))
+    assert store.view(1).name == "bronze bell"
+    assert len(store) == 3
+
+
+def test_reports():
+    store = build_store()
+    assert store.out_of_stock() == [1]
+    assert store.total_value() == 10 * 1.99 + 100.0
+    assert store.value_by_tag() == {"currency": 10 * 1.99, "treasure": 10 * 1.99 + 100.0, "tableware": 0.0}
+
+    store.delete(1)
+    assert store.out_of_stock() == []
+    assert "tableware" not in store.value_by_tag()
+
+
+def test_concurrent_stock_changes_never_oversell():
+    store = build_store()
+    store.set_quantity(2, 50)
+    taken = []
+
+    def take():
+        for _ in range(10):
+            taken.append(store.adjust_quantity(2, -1))
+
+    threads = [threading.Thread(target=take) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert taken.count(True) == 50
+    assert store.quantity(2) == 0
+    assert store.adjust_quantity(2, 5) and store.quantity(2) == 5
+
+
+def test_writing_a_view_quantity_waits_for_stock_changes():
+    store = build_store()
+    view = store.view(2)
+    written = threading.Event()
+
+    def write():
+        view.quantity = 7
+        written.set()
+
+    with store._InventoryStore__row_locks.hold(2):  # A stock change to the same row is in progress
+        writer = threading.Thread(target=write)
+        writer.start()
+        assert not written.wait(0.05)
+    writer.join()
+
+    assert written.is_set()
+    assert store.quantity(2) == 7
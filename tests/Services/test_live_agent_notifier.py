@@ -1,7 +1,11 @@
+import asyncio
 import json
+import threading
+import time
 import pytest
-from unittest.mock import patch, mock_open
-from PirateEase.Services.live_agent_notifier import Agent, LiveAgentService, LiveAgentNotifier
+from unittest.mock import MagicMock, patch, mock_open
+from PirateEase.Services.live_agent_notifier import Agent, LiveAgentService, LiveAgentNotifier, WebhookAgent
+from PirateEase.stub_agent_endpoint import StubAgentEndpoint
 
 
 mock_agent_data = [
@@ -62,20 +66,17 @@ def test_agent_name_in_string(mock_agents_file, reset_singleton):
 
 
 @patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response")
-@patch("random.choice")
-def test_get_available_agent(mock_random_choice, mock_get_response, mock_agents_file, reset_singleton):
+def test_get_available_agent(mock_get_response, mock_agents_file, reset_singleton):
     service = LiveAgentService()
-
-    # Choose "Anne Bonny" as available agent
-    agent_obj = next(agent for agent in service._LiveAgentService__agents if agent.name == "Anne Bonny")
-    mock_random_choice.return_value = agent_obj
     mock_get_response.return_value = "Connecting you to {agent}"
 
-    response = service.get_available_agent()
+    response = service.get_available_agent("session-1")
 
-    assert "Anne Bonny" in response
+    agent_obj = next(agent for agent in service._LiveAgentService__agents if agent.name in response)
+    assert agent_obj.name in ("Captain Jack", "Anne Bonny")
     assert agent_obj.available is False
     assert agent_obj not in LiveAgentNotifier.observers
+    assert service.free_agents == 1
     mock_get_response.assert_called_once_with("connecting_agent")
 
 
@@ -101,10 +102,313 @@ def test_observer_add_remove_notify():
 
     with patch.object(agent1, 'alert') as alert1, patch.object(agent2, 'alert') as alert2:
         history = ["User asked something"]
-        LiveAgentNotifier.notify_agents(history)
+        LiveAgentNotifier.notify_agents(history).result(timeout=2)
 
-        alert1.assert_called_once_with(history)
-        alert2.assert_called_once_with(history)
+        alert1.assert_called_once_with(("User asked something",))
+        alert2.assert_called_once_with(("User asked something",))
 
     LiveAgentNotifier.remove_observer(agent1)
     assert agent1 not in LiveAgentNotifier.observers
+
+
+def test_agent_claim_is_atomic():
+    agent = Agent("Calico Jack", True)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(agent.claim())) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 1
+    assert agent.available is False
+
+
+@patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response",
+       side_effect=lambda key: {"connecting_agent": "{agent}", "agent_queue": "queued {position}"}[key])
+def test_concurrent_clients_never_share_an_agent(mock_get_response, reset_singleton):
+    agents = [{"name": f"Agent {i}", "available": True} for i in range(10)]
+    with patch("builtins.open", mock_open(read_data=json.dumps(agents))):
+        service = LiveAgentService()
+
+    responses = []
+    barrier = threading.Barrier(40)
+
+    def connect(session_id):
+        barrier.wait()
+        responses.append(service.get_available_agent(session_id))
+
+    threads = [threading.Thread(target=connect, args=(f"s{i}",)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    connected = [r for r in responses if not r.startswith("queued")]
+    assert sorted(connected) == sorted(a["name"] for a in agents)
+    assert sorted(r for r in responses if r.startswith("queued")) == sorted(f"queued {i}" for i in range(1, 31))
+    assert LiveAgentNotifier.observers == []
+    assert service.waiting == 30
+
+
+@pytest.fixture
+def two_agent_service(reset_singleton):
+    agents = [{"name": "Anne Bonny", "available": True}, {"name": "Mary Read", "available": True}]
+    with patch("builtins.open", mock_open(read_data=json.dumps(agents))):
+        service = LiveAgentService()
+    return service
+
+
+@patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response",
+       side_effect=lambda key: {"connecting_agent": "{agent}", "agent_queue": "queued {position}",
+                                "agents_busy": "busy"}[key])
+def test_full_pool_queues_then_turns_away(mock_get_response, two_agent_service, monkeypatch):
+    monkeypatch.setattr(LiveAgentService, "max_waiting", 2)
+    service = two_agent_service
+    assert {service.get_available_agent("a"), service.get_available_agent("b")} == {"Anne Bonny", "Mary Read"}
+    assert service.get_available_agent("c") == "queued 1"
+    assert service.get_available_agent("d") == "queued 2"
+    assert service.get_available_agent("c") == "queued 1"  # Asking again keeps your place
+    assert service.get_available_agent("e") == "busy"
+    assert service.free_agents == 0
+
+
+def test_release_hands_agent_to_next_in_line(two_agent_service):
+    service = two_agent_service
+    first = service.request_agent("a")
+    service.request_agent("b")
+    waiting = service.request_agent("c")
+    assert waiting.agent is None and service.position("c") == 1
+
+    service.release_agent(first.agent.name)
+    assert waiting.wait(1) is first.agent
+    assert service.waiting == 0
+    assert first.agent.available is False  # Went straight to the waiting session
+
+    service.release_agent(first.agent.name)
+    assert first.agent.available is True
+    assert first.agent in LiveAgentNotifier.observers
+    assert service.free_agents == 1
+
+
+def test_cancel_leaves_the_line(two_agent_service):
+    service = two_agent_service
+    service.request_agent("a")
+    service.request_agent("b")
+    service.request_agent("c")
+    service.request_agent("d")
+    service.cancel("c")
+    assert service.position("d") == 1
+    assert service.waiting == 1
+
+
+def test_cancel_frees_an_agent_the_session_never_took(two_agent_service):
+    service = two_agent_service
+    connected = service.request_agent("a")
+    service.request_agent("b")
+    service.cancel("a")
+    assert connected.agent.available is True
+    assert connected.agent in LiveAgentNotifier.observers
+    assert service.free_agents == 1
+    assert service.request_agent("c").agent is connected.agent
+
+
+def test_cancel_hands_freed_agent_to_next_in_line(two_agent_service):
+    service = two_agent_service
+    connected = service.request_agent("a")
+    service.request_agent("b")
+    waiting = service.request_agent("c")
+    service.cancel("a")
+    assert waiting.agent is connected.agent
+    assert service.waiting == 0 and service.free_agents == 0
+
+
+def test_lru_selection_rotates_agents(two_agent_service, monkeypatch):
+    LiveAgentService.reset()
+    LiveAgentNotifier.observers.clear()
+    monkeypatch.setattr(LiveAgentService, "selection", "lru")
+    agents = [{"name": "Anne Bonny", "available": True}, {"name": "Mary Read", "available": True}]
+    with patch("builtins.open", mock_open(read_data=json.dumps(agents))):
+        service = LiveAgentService()
+
+    assert service.request_agent("a").agent.name == "Anne Bonny"
+    service.release_agent("Anne Bonny")
+    assert service.request_agent("b").agent.name == "Mary Read"  # Mary has been free longer
+
+
+def test_upset_customers_are_served_first(two_agent_service):
+    service = two_agent_service
+    first = service.request_agent("a")
+    service.request_agent("b")
+    calm = service.request_agent("calm")
+    upset = service.request_agent("upset", urgent=True)
+    assert service.position("upset") == 1 and service.position("calm") == 2
+
+    service.release_agent(first.agent.name)
+    assert upset.agent is first.agent and calm.agent is None
+
+
+def test_calm_customer_who_gets_upset_moves_up(two_agent_service):
+    service = two_agent_service
+    service.request_agent("a")
+    service.request_agent("b")
+    service.request_agent("c")
+    service.request_agent("d")
+    service.request_agent("d", urgent=True)
+    assert service.position("d") == 1
+
+
+@patch("PirateEase.Services.live_agent_notifier.time.monotonic")
+def test_queue_status_estimates_wait(mock_clock, two_agent_service):
+    mock_clock.return_value = 0.0
+    service = two_agent_service
+    service.request_agent("a")
+    service.request_agent("b")
+    for session in "cde":
+        service.request_agent(session)
+
+    mock_clock.return_value = 100.0  # Both agents are 100s into a 300s average session
+    assert service.queue_status("c") == (1, 3, 200.0)
+    assert service.queue_status("d") == (2, 3, 200.0)
+    assert service.queue_status("e") == (3, 3, 500.0)
+    assert service.queue_status("a") == (0, 3, 0.0)
+
+
+@patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response",
+       side_effect=lambda key: {"agent_queue": "number {position} of {depth}"}[key])
+def test_place_in_line_is_taken_when_queued(mock_get_response, two_agent_service):
+    service = two_agent_service
+    service.request_agent("a")
+    service.request_agent("b")
+    assert service.request_agent("c").status[:2] == (1, 1)
+    with patch.object(service, "queue_status", side_effect=AssertionError("second lock")):
+        assert service.get_available_agent("d") == "number 2 of 2"
+
+
+@patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response",
+       side_effect=lambda key: {"connecting_agent": "Connecting {agent}",
+                                "agent_queue": "number {position} of {depth}, {minutes} min"}[key])
+def test_waiting_customer_is_told_and_later_connected(mock_get_response, two_agent_service):
+    service = two_agent_service
+    service.get_available_agent("a")
+    service.get_available_agent("b")
+    assert service.get_available_agent("c") == "number 1 of 1, 5 min"
+    assert service.pending_connection("c") == ""
+
+    anne = "Anne Bonny"
+    service.release_agent(anne)
+    assert service.pending_connection("c") == f"Connecting {anne}"
+    assert service.pending_connection("c") == ""  # Only handed over once
+
+
+
+@patch("PirateEase.Services.live_agent_notifier.ResponseFactory.get_response",
+       side_effect=lambda key: {"connecting_agent": "Connecting {agent}",
+                                "agent_queue": "number {position} of {depth}, {minutes} min"}[key])
+def test_agents_are_freed_when_connected_sessions_end(mock_get_response, two_agent_service):
+    service = two_agent_service
+    for session in range(6):  # One handoff after another, each session ending like the server's teardown does
+        assert service.get_available_agent(f"s{session}").startswith("Connecting")
+        service.cancel(f"s{session}")
+    assert service.free_agents == 2
+    assert service._LiveAgentService__handle_seconds < LiveAgentService.default_handle_seconds  # Sessions were timed
+
+    service.get_available_agent("a")
+    service.get_available_agent("b")
+    assert service.get_available_agent("c").startswith("number 1 of 1")
+    service.cancel("a")  # The first connected customer leaves, the waiting one gets their agent
+    assert service.pending_connection("c").startswith("Connecting")
+    assert service.free_agents == 0
+
+
+def test_released_agent_no_longer_belongs_to_the_session(two_agent_service):
+    service = two_agent_service
+    first = service.request_agent("a")
+    service.request_agent("b")
+    waiting = service.request_agent("c")
+    service.release_agent(first.agent.name)  # The agent is done with "a" and moves on to "c"
+    service.cancel("a")  # "a" leaving later must not free the agent now serving "c"
+    assert waiting.agent is first.agent and first.agent.available is False
+    service.cancel("c")
+    assert service.free_agents == 1
+
+
+class SlowAgent(Agent):
+    def __init__(self, name, delay):
+        super().__init__(name, True)
+        self.delay = delay
+
+    def alert(self, history):
+        time.sleep(self.delay)
+        return f"{self.name} saw {len(history)} lines"
+
+
+@pytest.fixture
+def observers():
+    LiveAgentNotifier.observers.clear()
+    yield LiveAgentNotifier.observers
+    LiveAgentNotifier.observers.clear()
+
+
+def test_notify_agents_runs_in_parallel_without_blocking(observers):
+    for i in range(8):
+        LiveAgentNotifier.add_observer(SlowAgent(f"Agent {i}", 0.2))
+
+    start = time.perf_counter()
+    outcome = LiveAgentNotifier.notify_agents(["hello", "help"])
+    assert time.perf_counter() - start < 0.1  # The caller does not wait on agents
+    results = outcome.result(timeout=2)
+    assert time.perf_counter() - start < 0.2 * 8 / 2  # Far quicker than one after another
+    assert results == {f"Agent {i}": f"Agent {i} saw 2 lines" for i in range(8)}
+
+
+def test_slow_and_failing_agents_do_not_hold_up_others(observers, monkeypatch):
+    monkeypatch.setattr(LiveAgentNotifier, "timeout", 0.2)
+    broken = Agent("Broken", True)
+    monkeypatch.setattr(broken, "alert", MagicMock(side_effect=ConnectionError("down")))
+    for agent in (SlowAgent("Quick", 0), SlowAgent("Sleepy", 1), broken):
+        LiveAgentNotifier.add_observer(agent)
+
+    results = LiveAgentNotifier.notify_agents([]).result(timeout=1)
+    assert results["Quick"] == "Quick saw 0 lines"
+    assert isinstance(results["Sleepy"], TimeoutError)
+    assert isinstance(results["Broken"], ConnectionError)
+
+
+def test_notify_agents_async(observers):
+    LiveAgentNotifier.add_observer(SlowAgent("Quick", 0))
+    assert asyncio.run(LiveAgentNotifier.notify_agents_async(["a"])) == {"Quick": "Quick saw 1 lines"}
+
+
+def test_history_snapshot_is_compact(monkeypatch):
+    monkeypatch.setattr(LiveAgentNotifier, "history_lines", 2)
+    monkeypatch.setattr(LiveAgentNotifier, "line_chars", 10)
+    history = ["one", "two", "a very long line indeed"]
+    snapshot = LiveAgentNotifier.snapshot(history)
+    assert snapshot == ("two", "a very ...")
+    history.append("later")
+    assert snapshot == ("two", "a very ...")  # The snapshot does not change with the session
+
+
+def test_webhook_agent_posts_history(observers):
+    with StubAgentEndpoint() as stub:
+        agent = WebhookAgent("Anne Bonny", True, stub.url)
+        LiveAgentNotifier.add_observer(agent)
+        results = LiveAgentNotifier.notify_agents(["User: help"]).result(timeout=2)
+    assert results == {"Anne Bonny": "Anne Bonny was alerted! (200)"}
+    assert stub.received == [{"agent": "Anne Bonny", "history": ["User: help"]}]
+
+
+def test_webhook_alerts_reuse_connections():
+    with StubAgentEndpoint() as stub:
+        agent = WebhookAgent("Anne Bonny", True, stub.url)
+        for _ in range(5):
+            assert agent.alert(["User: help"]) == "Anne Bonny was alerted! (200)"
+    assert len(stub.received) == 5
+    assert stub.connections == 1
+
+
+def test_agents_with_endpoints_are_webhook_agents(reset_singleton):
+    agents = [{"name": "Anne Bonny", "available": True, "endpoint": "http://127.0.0.1:1/alert"}]
+    with patch("builtins.open", mock_open(read_data=json.dumps(agents))):
+        service = LiveAgentService()
+    assert isinstance(service._LiveAgentService__agents[0], WebhookAgent)
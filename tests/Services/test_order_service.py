@@ -2,6 +2,7 @@ import pytest
 import json
 from unittest.mock import patch, mock_open
 from PirateEase.Services.order_service import OrderService, Order
+from PirateEase.Services.order_store import import_orders
 
 
 @pytest.fixture
@@ -80,6 +81,14 @@ def test_retrieve_nonexistent_order(mock_orders_file):
     assert response == ''
 
 
+def test_retrieve_orders(mock_orders_file, mock_response_factory):
+    responses = OrderService().retrieve_orders(["2", "999", "1"])
+
+    assert "Order #2 for Will" in responses[0]
+    assert responses[1] == ''
+    assert "Order #1 for Elizabeth" in responses[2]
+
+
 def test_order_str(mock_response_factory):
     order = Order(
         id=42,
@@ -94,4 +103,19 @@ def test_order_str(mock_response_factory):
     result = str(order)
 
     mock_response_factory.get_response.assert_called_once_with("order_arrival")
-    assert "Order #42 for Jack will arrive in 1.5 days." in result
\ No newline at end of file
+    assert "Order #42 for Jack will arrive in 1.5 days." in result
+
+def test_uses_sqlite_database_when_present(tmp_path, sample_orders, mock_response_factory, monkeypatch):
+    json_path = tmp_path / "orders.json"
+    json_path.write_text(json.dumps(sample_orders), encoding="utf-8")
+    db_path = tmp_path / "orders.db"
+    import_orders(str(json_path), str(db_path))
+    monkeypatch.setattr(OrderService, "database", str(db_path))
+
+    with patch("builtins.open") as mock_file:
+        service = OrderService()
+        mock_file.assert_not_called()  # Nothing is loaded up front
+
+    assert "Order #2 for Will will arrive in 1.0 days." in service.retrieve_order("2")
+    assert service.retrieve_order("999") == ''
+    assert service.retrieve_orders(["999", "2"])[1] == service.retrieve_order("2")
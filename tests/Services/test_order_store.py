@@ -0,0 +1,64 @@
+import json
+import threading
+
+import pytest
+
+from PirateEase.Services.order_service import Order
+from PirateEase.Services.order_store import SQLiteOrderStore, import_orders
+
+ORDERS = {
+    "7": {"customer_name": "Anne", "order_date": "2025-03-30", "eta_hours": 48, "item": "cutlass", "quantity": 2},
+    "3": {"customer_name": "Mary", "order_date": "2025-03-28", "eta_hours": 24, "item": "compass", "quantity": 1},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    json_path = tmp_path / "orders.json"
+    json_path.write_text(json.dumps(ORDERS), encoding="utf-8")
+    db_path = tmp_path / "orders.db"
+    assert import_orders(str(json_path), str(db_path)) == 2
+    assert not (tmp_path / "orders.db.tmp").exists()
+    return SQLiteOrderStore(str(db_path), Order)
+
+
+def test_point_lookup(store):
+    order = store[7]
+    assert isinstance(order, Order)
+    assert (order.id, order.customer_name, order.eta_hours, order.refunded) == (7, "Anne", 48, False)
+    assert store.get(8) is None
+    assert store.get(10 ** 30) is None
+    assert 3 in store and 4 not in store
+
+
+def test_mapping_interface(store):
+    assert len(store) == 2
+    assert list(store) == [3, 7]
+
+
+def test_get_many(store, monkeypatch):
+    monkeypatch.setattr("PirateEase.Services.order_store._MAX_VARIABLES", 1)  # Force several chunks
+    orders = store.get_many([7, 3, 8, 7, 10 ** 30])
+    assert sorted(orders) == [3, 7]
+    assert orders[7].customer_name == "Anne"
+    assert store.get_many([]) == {}
+
+
+def test_lookups_from_other_threads(store):
+    names = []
+    thread = threading.Thread(target=lambda: names.append(store[3].customer_name))
+    thread.start()
+    thread.join()
+    assert names == ["Mary"]
+
+
+def test_missing_database(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SQLiteOrderStore(str(tmp_path / "missing.db"), Order)
+
+
+def test_reimport_replaces_database(store, tmp_path):
+    json_path = tmp_path / "orders.json"
+    json_path.write_text(json.dumps({"1": ORDERS["3"]}), encoding="utf-8")
+    import_orders(str(json_path), str(tmp_path / "orders.db"))
+    assert list(SQLiteOrderStore(str(tmp_path / "orders.db"), Order)) == [1]
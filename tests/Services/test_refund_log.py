@@ -0,0 +1,125 @@
+import json
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from PirateEase.Services.refund_log import RefundLog
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "refunds.log", tmp_path / "snapshot.json"
+
+
+def open_log(paths, **kwargs) -> tuple[RefundLog, set[int]]:
+    log = RefundLog(str(paths[0]), str(paths[1]), **kwargs)
+    return log, log.replay()
+
+
+def test_appends_are_replayed(paths):
+    log, refunded = open_log(paths)
+    assert refunded == set()
+    log.append(101)
+    log.append(102)
+    log.close()
+
+    log, refunded = open_log(paths)
+    assert refunded == {101, 102}
+    log.close()
+
+
+def test_torn_last_record_is_ignored(paths):
+    paths[0].write_bytes(b"101\n10")
+    log, refunded = open_log(paths)
+    assert refunded == {101}
+    log.close()
+
+
+def test_concurrent_appends_share_fsyncs(paths, mocker):
+    real_fsync = os.fsync
+    stalled, resume = threading.Event(), threading.Event()
+
+    def slow_first_fsync(fd):
+        if not stalled.is_set():  # Hold the first flush on disk while everyone else appends
+            stalled.set()
+            assert resume.wait(5)
+        real_fsync(fd)
+
+    log, _ = open_log(paths)
+    fsync = mocker.patch("PirateEase.Services.refund_log.os.fsync", side_effect=slow_first_fsync)
+    threads = [threading.Thread(target=log.append, args=(i,)) for i in range(200)]
+    threads[0].start()
+    assert stalled.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while len(log._RefundLog__pending) < 199 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    resume.set()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+    assert fsync.call_count == 2  # The first append alone, then the other 199 together
+    log, refunded = open_log(paths)
+    assert refunded == set(range(200))
+    log.close()
+
+
+def test_compaction_folds_log_into_snapshot(paths):
+    log, _ = open_log(paths, compact_after=3)
+    for order_id in (1, 2, 3):
+        log.append(order_id)  # The third append starts a compaction
+    log.compact(wait=True)
+    log.append(4)
+    log.close()
+
+    assert json.loads(paths[1].read_text()) == [1, 2, 3]
+    assert paths[0].read_bytes() == b"4\n"
+    log, refunded = open_log(paths)
+    assert refunded == {1, 2, 3, 4}
+    log.close()
+
+
+def test_crash_during_compaction_is_recovered(paths):
+    paths[1].write_text("[1]")
+    paths[0].with_name("refunds.log.compacting").write_bytes(b"2\n")
+    paths[0].write_bytes(b"3\n")
+
+    log, refunded = open_log(paths)
+    assert refunded == {1, 2, 3}
+    log.compact(wait=True)  # Finishes the interrupted compaction
+    log.close()
+    assert json.loads(paths[1].read_text()) == [1, 2]
+    assert not paths[0].with_name("refunds.log.compacting").exists()
+
+
+def test_failed_write_keeps_record_pending(paths, mocker):
+    log, _ = open_log(paths)
+    mocker.patch("PirateEase.Services.refund_log.os.fsync", side_effect=[OSError("disk full"), None])
+    with pytest.raises(OSError):
+        log.append(7)
+    log.append(8)  # Retries the record that failed alongside the new one
+    log.close()
+    assert paths[0].read_bytes().count(b"7\n") >= 1
+
+
+def test_new_files_are_synced_into_their_directory(paths, mocker):
+    real_fsync = os.fsync
+    synced = []
+
+    def record(fd):
+        synced.append("directory" if stat.S_ISDIR(os.fstat(fd).st_mode) else "file")
+        real_fsync(fd)
+
+    mocker.patch("PirateEase.Services.refund_log.os.fsync", side_effect=record)
+    log, _ = open_log(paths)
+    assert synced == ["directory"]  # The fresh log exists before anything is appended to it
+    log.append(1)
+    log.compact(wait=True)
+    log.close()
+    # The record, the swapped in log, then the snapshot's contents and its rename
+    assert synced == ["directory", "file", "directory", "file", "directory"]
@@ -1,5 +1,6 @@
 import pytest
 import json
+import threading
 from unittest.mock import patch, mock_open
 from PirateEase.Services.refund_service import RefundService, PastOrder
 
@@ -43,7 +44,9 @@ def mock_response_factory():
 
 
 @pytest.fixture(autouse=True)
-def reset_singleton():
+def reset_singleton(tmp_path, monkeypatch):
+    monkeypatch.setattr(RefundService, "log_path", str(tmp_path / "refunds.log"))
+    monkeypatch.setattr(RefundService, "snapshot_path", str(tmp_path / "refunds_snapshot.json"))
     RefundService.reset()
     yield
     RefundService.reset()
@@ -92,3 +95,71 @@ def test_order_initialization(mock_past_orders_file):
     assert isinstance(orders[101], PastOrder)
     assert orders[101].item == "Spyglass"
     assert orders[102].refunded is True
+
+
+def test_refunds_survive_restart(mock_past_orders_file, mock_response_factory):
+    RefundService().refund_past_order("101")
+    RefundService().close()
+    RefundService.reset()
+
+    service = RefundService()
+    assert service._RefundService__orders[101].refunded is True
+    assert service.refund_past_order("101") == "Refund for order #101 was already processed."
+    service.close()
+
+
+def test_concurrent_refunds_never_double_refund(tmp_path, mock_response_factory):
+    orders = {str(i): {"customer_name": "Crew", "delivery_date": "2025-03-25", "item": "Rope", "quantity": 1,
+                       "refunded": False} for i in range(50)}
+    with patch("builtins.open", mock_open(read_data=json.dumps(orders))):
+        service = RefundService()
+
+    results = []
+    barrier = threading.Barrier(16)
+
+    def refund_all(start):
+        barrier.wait()
+        for i in range(50):
+            order_id = (start + i) % 50
+            results.append((order_id, service.try_refund(order_id)))
+
+    threads = [threading.Thread(target=refund_all, args=(n * 3,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    service.close()
+
+    winners = [order_id for order_id, refunded in results if refunded]
+    assert len(results) == 16 * 50
+    assert sorted(winners) == list(range(50))  # Every order refunded exactly once
+    logged = (tmp_path / "refunds.log").read_text().split()
+    assert sorted(map(int, logged)) == list(range(50))
+
+
+def test_refunds_of_different_orders_do_not_wait(mock_past_orders_file, mocker):
+    service = RefundService()
+    log = service._RefundService__log
+    in_append = threading.Event()
+    release = threading.Event()
+    real_append = log.append
+
+    def slow_append(order_id):
+        if order_id == 101:
+            in_append.set()
+            release.wait(2)
+        real_append(order_id)
+
+    mocker.patch.object(log, "append", side_effect=slow_append)
+    slow = threading.Thread(target=service.try_refund, args=(101,))
+    slow.start()
+    in_append.wait(2)
+
+    other = threading.Thread(target=service.try_refund, args=(102,))
+    other.start()
+    other.join(1)
+    assert not other.is_alive()  # Order 102 did not wait for order 101
+
+    release.set()
+    slow.join()
+    service.close()
@@ -0,0 +1,157 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from PirateEase.Services.inventory_service import InventoryService
+from PirateEase.Services.live_agent_notifier import LiveAgentNotifier, LiveAgentService
+from PirateEase.Services.order_service import Order, OrderService
+from PirateEase.Services.refund_service import RefundService
+from PirateEase.Services.transport import HTTPTransport, RemoteMapping, TransportError
+from PirateEase.stub_backend_server import StubBackendServer
+
+ORDERS = {
+    "7": {"customer_name": "Anne", "order_date": "2025-03-30", "eta_hours": 48, "item": "cutlass", "quantity": 2},
+    "3": {"customer_name": "Mary", "order_date": "2025-03-28", "eta_hours": 24, "item": "compass", "quantity": 1},
+}
+INVENTORY = [{"name": "eye patch", "quantity": 0, "price": 4.5, "synonyms": [], "tags": []}]
+PAST_ORDERS = {
+    "101": {"customer_name": "Davy", "delivery_date": "2025-03-25", "item": "spyglass", "quantity": 1,
+            "refunded": False},
+}
+AGENTS = [{"name": "Anne Bonny", "available": True}]
+
+
+@pytest.fixture
+def stub(tmp_path):
+    (tmp_path / "orders.json").write_text(json.dumps(ORDERS), encoding="utf-8")
+    (tmp_path / "inventory.json").write_text(json.dumps(INVENTORY), encoding="utf-8")
+    (tmp_path / "past_orders.json").write_text(json.dumps(PAST_ORDERS), encoding="utf-8")
+    (tmp_path / "agents.json").write_text(json.dumps(AGENTS), encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not served", encoding="utf-8")
+    with StubBackendServer(str(tmp_path)) as server:
+        yield server
+
+
+def test_get_json(stub):
+    transport = HTTPTransport(stub.url)
+    assert transport.get_json("/orders/7")["customer_name"] == "Anne"
+    assert transport.get_json("orders/8") is None
+    assert transport.get_json("/inventory/eye%20patch")["price"] == 4.5
+    assert transport.get_json("/notes") is None
+    assert sorted(transport.get_json(stub.url + "/orders")) == ["3", "7"]  # Absolute URLs work too
+
+
+def test_post_json_updates_record(stub):
+    transport = HTTPTransport(stub.url)
+    assert transport.post_json("/orders/3", {"refunded": True})["refunded"] is True
+    assert transport.get_json("/orders/3")["refunded"] is True
+    assert transport.post_json("/orders/99", {"refunded": True}) is None
+
+
+def test_connections_are_reused(stub):
+    transport = HTTPTransport(stub.url, max_connections=4)
+    results = []
+    threads = [threading.Thread(target=lambda: results.extend(transport.get_json("/orders/3") for _ in range(10)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 80
+    assert transport.connections_opened <= 4
+    assert stub.connections == transport.connections_opened
+    assert stub.requests == 80
+
+
+def test_stale_connection_is_replaced(stub):
+    transport = HTTPTransport(stub.url, retries=0)
+    transport.get_json("/orders/3")
+    stub_connections = stub.connections
+    # Simulate the server dropping the idle connection
+    pool = next(iter(transport._HTTPTransport__pools.values()))
+    ours, theirs = socket.socketpair()
+    theirs.close()
+    pool._ConnectionPool__idle[0].sock = ours
+
+    assert transport.get_json("/orders/7")["customer_name"] == "Anne"
+    assert stub.connections == stub_connections + 1
+
+
+def test_retries_then_fails(mocker):
+    transport = HTTPTransport("http://127.0.0.1:9", retries=2, backoff=0, timeout=0.5)
+    send = mocker.spy(transport, "_HTTPTransport__send")
+    with pytest.raises(TransportError):
+        transport.get_json("/orders/1")
+    assert send.call_count == 3
+    with pytest.raises(TransportError):
+        transport.post_json("/orders/1", {})
+    assert send.call_count == 4  # Posts are only sent once
+
+
+def test_retries_unavailable_status(mocker):
+    transport = HTTPTransport("http://example.invalid", backoff=0)
+    mocker.patch.object(transport, "_HTTPTransport__send", side_effect=[(503, b""), (200, b'{"ok": true}')])
+    assert transport.get_json("/health") == {"ok": True}
+
+
+def test_invalid_base_url():
+    with pytest.raises(ValueError):
+        HTTPTransport("ftp://example.com")
+
+
+def test_remote_mapping(stub):
+    orders = RemoteMapping(HTTPTransport(stub.url), "/orders", lambda key, record: record["item"], make_key=int)
+    assert orders[7] == "cutlass"
+    assert orders.get(8) is None
+    assert sorted(orders) == [3, 7] and len(orders) == 2
+
+
+def test_order_service_uses_remote_orders(stub, monkeypatch):
+    OrderService.reset()
+    monkeypatch.setattr(OrderService, "url", stub.url)
+    try:
+        service = OrderService()
+        assert "Anne" in service.retrieve_order("7")
+        assert service.retrieve_order("8") == ''
+        assert service.retrieve_orders(["3", "8"])[1] == ''
+    finally:
+        OrderService.reset()
+
+
+def test_refund_service_refunds_remote_orders(stub, monkeypatch):
+    RefundService.reset()
+    monkeypatch.setattr(RefundService, "url", stub.url)
+    try:
+        service = RefundService()
+        assert "101" in service.refund_past_order("101")
+        assert stub.lookup("/past_orders/101")["refunded"] is True  # Recorded by the remote system
+        assert not service.try_refund(101)  # Already refunded
+        assert service.refund_past_order("999") == ''
+    finally:
+        RefundService.reset()
+
+
+def test_inventory_service_reads_remote_stock(stub, monkeypatch):
+    InventoryService.reset()
+    monkeypatch.setattr(InventoryService, "url", stub.url)
+    try:
+        service = InventoryService()
+        assert "4.50" not in service.check_availability("eye patch")  # Out of stock
+        stub.update("/inventory/eye patch", {"quantity": 3})
+        assert "3" in service.check_availability("eye patch")  # Restocked remotely, seen without a restart
+    finally:
+        InventoryService.reset()
+
+
+def test_live_agent_service_loads_remote_agents(stub, monkeypatch):
+    LiveAgentService.reset()
+    monkeypatch.setattr(LiveAgentService, "url", stub.url)
+    observers = list(LiveAgentNotifier.observers)
+    try:
+        assert LiveAgentService().free_agents == 1
+    finally:
+        LiveAgentNotifier.observers[:] = observers
+        LiveAgentService.reset()
@@ -1,5 +1,18 @@
+import threading
+import time
+
 import pytest
-from PirateEase.Utils.backend_manager import BackendManager
+from PirateEase.Services.transport import TransportError
+from PirateEase.Utils.backend_manager import BackendManager, DegradedResponse, PendingResponse
+from PirateEase.Utils.circuit_breaker import CircuitBreaker
+from PirateEase.Utils.response_factory import ResponseFactory
+
+
+@pytest.fixture(autouse=True)
+def fresh_manager():
+    BackendManager.reset()
+    yield
+    BackendManager.reset()
 
 def test_process_request_order(mocker):
     mock_order_service = mocker.patch("PirateEase.Utils.backend_manager.OrderService")
@@ -42,9 +55,15 @@ def test_process_request_agent(mocker):
     result = BackendManager.process_request("agent")
 
     mock_agent_service.assert_called_once()
-    mock_instance.get_available_agent.assert_called_once()
+    mock_instance.get_available_agent.assert_called_once_with(urgent=False)
     assert result == "Agent Connected"
 
+
+def test_process_request_urgent_agent(mocker):
+    mock_agent_service = mocker.patch("PirateEase.Utils.backend_manager.LiveAgentService")
+    BackendManager.process_request("agent", "urgent")
+    mock_agent_service.return_value.get_available_agent.assert_called_once_with(urgent=True)
+
 def test_process_request_exit(mocker):
     mock_exit_service = mocker.patch("PirateEase.Utils.backend_manager.ExitService")
     mock_instance = mock_exit_service.return_value
@@ -56,9 +75,285 @@ def test_process_request_exit(mocker):
     mock_instance.get_exit_response.assert_called_once()
     assert result == "Goodbye"
 
+def test_process_request_refund_id(mocker):
+    mock_refund_service = mocker.patch("PirateEase.Utils.backend_manager.RefundService")
+    mock_refund_service.return_value.refund_past_order.return_value = "Already refunded"
+
+    assert BackendManager.process_request("refund_id", "456") == "Already refunded"
+    mock_refund_service.return_value.refund_past_order.assert_called_once_with("456")
+
+
 def test_process_request_invalid_type():
-    result = BackendManager.process_request("invalid_type", "data")
-    assert result is None
+    with pytest.raises(ValueError):
+        BackendManager.process_request("invalid_type", "data")
+
+
+def test_endpoints_are_bound_once(mocker):
+    mock_order_service = mocker.patch("PirateEase.Utils.backend_manager.OrderService")
+
+    for order_id in ("1", "2", "3"):
+        BackendManager.process_request("order", order_id)
+
+    mock_order_service.assert_called_once()
+    assert mock_order_service.return_value.retrieve_order.call_count == 3
+
+
+def test_process_batch_uses_batch_endpoint(mocker):
+    mock_order_service = mocker.patch("PirateEase.Utils.backend_manager.OrderService")
+    mock_order_service.return_value.retrieve_orders.return_value = ["a", "b"]
+
+    assert BackendManager.process_batch("order", ["1", "2"]) == ["a", "b"]
+    mock_order_service.return_value.retrieve_orders.assert_called_once_with(["1", "2"])
+    mock_order_service.return_value.retrieve_order.assert_not_called()
+
+
+def test_process_batch_falls_back_to_single_endpoint(mocker):
+    mock_inventory_service = mocker.patch("PirateEase.Utils.backend_manager.InventoryService")
+    mock_inventory_service.return_value.check_availability.side_effect = str.upper
+
+    assert BackendManager.process_batch("inventory", ["rum", "map"]) == ["RUM", "MAP"]
+
+
+def test_register_replaces_endpoint(monkeypatch):
+    monkeypatch.setattr(BackendManager, "_BackendManager__registry", dict(BackendManager._BackendManager__registry))
+    BackendManager.register("parrot", lambda: lambda data: data * 2)
+    assert "parrot" in BackendManager.request_types()
+    assert BackendManager.process_request("parrot", "squawk") == "squawksquawk"
+    BackendManager.register("parrot", lambda: lambda data: data)
+    assert BackendManager.process_request("parrot", "squawk") == "squawk"
+
+
+def test_stats_count_calls(mocker):
+    mocker.patch("PirateEase.Utils.backend_manager.ExitService")
+
+    BackendManager.process_request("exit")
+    BackendManager.process_request("exit")
+
+    stats = BackendManager.stats()
+    assert list(stats) == ["exit"]
+    assert stats["exit"]["calls"] == 2
+    assert stats["exit"]["seconds"] >= 0
 
 def test_backend_manager_is_singleton():
-    assert BackendManager() is BackendManager()
\ No newline at end of file
+    assert BackendManager() is BackendManager()
+
+def test_process_requests_deduplicates_idempotent_types(mocker):
+    mock_order_service = mocker.patch("PirateEase.Utils.backend_manager.OrderService")
+    mock_order_service.return_value.retrieve_orders.side_effect = lambda ids: [f"order {i}" for i in ids]
+    mock_inventory_service = mocker.patch("PirateEase.Utils.backend_manager.InventoryService")
+    mock_inventory_service.return_value.check_availability.side_effect = str.upper
+    mock_refund_service = mocker.patch("PirateEase.Utils.backend_manager.RefundService")
+    mock_refund_service.return_value.refund_past_order.side_effect = lambda order_id: f"refund {order_id}"
+
+    results = BackendManager.process_requests([("order", "1"), ("inventory", "rum"), ("order", "2"),
+                                               ("order", "1"), ("inventory", "rum"), ("refund", "1"),
+                                               ("refund", "1")])
+
+    assert results == ["order 1", "RUM", "order 2", "order 1", "RUM", "refund 1", "refund 1"]
+    mock_order_service.return_value.retrieve_orders.assert_called_once_with(["1", "2"])
+    mock_inventory_service.return_value.check_availability.assert_called_once_with("rum")
+    assert mock_refund_service.return_value.refund_past_order.call_count == 2  # Refunds are never shared
+
+def test_process_requests_keeps_reads_and_writes_in_order(mocker):
+    calls = []
+    mock_inventory_service = mocker.patch("PirateEase.Utils.backend_manager.InventoryService")
+    mock_inventory_service.return_value.check_availability.side_effect = lambda item: calls.append(("read", item))
+    mock_refund_service = mocker.patch("PirateEase.Utils.backend_manager.RefundService")
+    mock_refund_service.return_value.refund_past_order.side_effect = lambda order_id: calls.append(("write", order_id))
+
+    BackendManager.process_requests([("inventory", "rum"), ("refund", "1"), ("inventory", "rum")])
+
+    assert calls == [("read", "rum"), ("write", "1"), ("read", "rum")]  # The first read does not see the write
+
+
+def test_concurrent_order_lookups_are_coalesced(mocker):
+    release = threading.Event()
+    mock_order_service = mocker.patch("PirateEase.Utils.backend_manager.OrderService")
+
+    def retrieve_order(order_id):
+        release.wait(5)
+        return f"order {order_id}"
+
+    mock_order_service.return_value.retrieve_order.side_effect = retrieve_order
+    mock_order_service.return_value.retrieve_orders.side_effect = lambda ids: [f"order {i}" for i in ids]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(BackendManager.process_request("order", "7")))
+               for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while getattr(BackendManager._BackendManager__coalescer, "requests", 0) < 20:  # Everybody is waiting
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["order 7"] * 20
+    assert BackendManager.stats()["order"]["calls"] <= 2
+
+
+def test_distinct_inventory_lookups_run_side_by_side(mocker):
+    barrier = threading.Barrier(12, timeout=5)  # Only passes if all 12 lookups are running at once
+    mock_inventory_service = mocker.patch("PirateEase.Utils.backend_manager.InventoryService")
+    mock_inventory_service.return_value.check_availability.side_effect = lambda item: (barrier.wait(), item)[1]
+    results = {}
+    threads = [threading.Thread(target=lambda item=f"item {i}": results.update(
+        {item: BackendManager.process_request("inventory", item)})) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {f"item {i}": f"item {i}" for i in range(12)}  # Nobody got a canned reply
+
+
+@pytest.fixture
+def slow_service(monkeypatch):
+    """
+    Registers a budgeted, hedged 'slow' request type whose endpoint waits on an event per call.
+    """
+    for name in ("registry", "budgets", "hedges", "breakers", "service_of"):
+        attribute = f"_BackendManager__{name}"
+        monkeypatch.setattr(BackendManager, attribute, dict(getattr(BackendManager, attribute)))
+    monkeypatch.setattr(BackendManager, "_BackendManager__idempotent", set(BackendManager._BackendManager__idempotent))
+    calls = []
+    gates = []
+
+    def endpoint(data):
+        gate = threading.Event()
+        calls.append(data)
+        gates.append(gate)
+        if data == "bad":
+            raise ValueError(data)
+        gate.wait(5)
+        return f"answer {len(calls)}"
+
+    BackendManager.register("slow", lambda: endpoint, idempotent=True, budget=0.2, hedge_after=0.05)
+    yield calls, gates
+    for gate in gates:
+        gate.set()
+
+
+def test_budget_returns_degraded_response(slow_service):
+    calls, _ = slow_service
+    start = time.perf_counter()
+    response = BackendManager.process_request("slow", "1")
+
+    assert time.perf_counter() - start < 1
+    assert isinstance(response, DegradedResponse)
+    assert response in ResponseFactory.responses["service_degraded"]
+    assert len(calls) == 2  # Hedged once before giving up
+    stats = BackendManager.stats()["slow"]
+    assert (stats["degraded"], stats["hedged"], stats["breaker"]) == (1, 1, "closed")
+
+
+def test_hedged_request_takes_first_answer(slow_service):
+    calls, gates = slow_service
+    threading.Timer(0.1, lambda: gates[1].set()).start()  # Only the hedge answers
+
+    assert BackendManager.process_request("slow", "1") == "answer 2"
+
+
+def test_breaker_fails_fast_once_open(slow_service, monkeypatch):
+    calls, gates = slow_service
+    BackendManager._BackendManager__breakers["slow"] = CircuitBreaker(failure_threshold=2, reset_after=60)
+    BackendManager.process_request("slow", "1")
+    BackendManager.process_request("slow", "2")
+    assert len(calls) == 4
+
+    assert isinstance(BackendManager.process_request("slow", "3"), DegradedResponse)
+    assert len(calls) == 4  # Failed fast, never reached the service
+    assert BackendManager.stats()["slow"]["breaker"] == "open"
+
+
+def test_bad_request_is_not_a_service_failure(slow_service):
+    BackendManager._BackendManager__breakers["slow"] = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(ValueError):
+        BackendManager.process_request("slow", "bad")
+    assert BackendManager.stats()["slow"]["breaker"] == "closed"
+
+
+def test_refund_types_share_a_breaker(mocker):
+    mock_refund_service = mocker.patch("PirateEase.Utils.backend_manager.RefundService")
+    mock_refund_service.return_value.refund_past_order.side_effect = TransportError("down")
+    for _ in range(BackendManager.failure_threshold):
+        assert isinstance(BackendManager.process_request("refund", "1"), DegradedResponse)
+
+    assert isinstance(BackendManager.process_request("refund_id", "1"), DegradedResponse)
+    assert mock_refund_service.return_value.refund_past_order.call_count == BackendManager.failure_threshold
+
+
+def test_slow_write_is_processing_not_failed(slow_service):
+    gate, finished = threading.Event(), threading.Event()
+
+    def refund(data):
+        gate.wait(5)
+        finished.set()
+        return "refunded"
+
+    BackendManager.register("slow", lambda: refund, budget=0.05)
+    response = BackendManager.process_request("slow", "1")
+
+    assert isinstance(response, PendingResponse) and not isinstance(response, DegradedResponse)
+    assert response in ResponseFactory.responses["request_processing"]
+    assert BackendManager.stats()["slow"]["pending"] == 1
+    gate.set()
+    assert finished.wait(5)  # The write was not abandoned, it finishes in the background
+
+
+@pytest.fixture
+def slow_batch(slow_service):
+    """
+    Gives the 'slow' request type a batch endpoint that hangs until released, or fails if told to.
+    """
+    calls, gates = slow_service
+    release = threading.Event()
+    failure = []
+
+    def batch(items):
+        if failure:
+            raise failure[0]
+        release.wait(5)
+        return [f"batch {item}" for item in items]
+
+    endpoint = BackendManager._BackendManager__registry["slow"][0]
+    BackendManager.register("slow", endpoint, batch=lambda: batch, idempotent=True, budget=0.2, hedge_after=0.05)
+    yield calls, gates, failure
+    release.set()
+
+
+def test_slow_batch_only_degrades_unanswered_requests(slow_batch):
+    calls, gates, _ = slow_batch
+
+    def answer_two():  # The hedges of "1" and "2" answer, the one of "3" hangs
+        deadline = time.monotonic() + 5
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        for data in ("1", "2"):
+            gates[calls.index(data)].set()
+
+    threading.Thread(target=answer_two).start()
+    start = time.monotonic()
+    responses = BackendManager.process_batch("slow", ["1", "2", "3"])
+
+    assert time.monotonic() - start < 1  # Nobody waited longer than a request of their own would
+    assert responses[:2] == ["answer 3", "answer 3"]
+    assert isinstance(responses[2], DegradedResponse)
+    stats = BackendManager.stats()["slow"]
+    assert (stats["calls"], stats["degraded"], stats["hedged"]) == (3, 1, 3)
+
+
+def test_batch_failures_count_per_request(slow_batch):
+    _, _, failure = slow_batch
+    failure.append(TransportError("down"))
+    BackendManager._BackendManager__breakers["slow"] = CircuitBreaker(failure_threshold=3, reset_after=60)
+    responses = BackendManager.process_batch("slow", ["1", "2", "3"])
+
+    assert all(isinstance(response, DegradedResponse) for response in responses)
+    assert BackendManager.stats()["slow"]["breaker"] == "open"  # Three requests failed, not one batch
+
+
+def test_hedging_requires_idempotent_request():
+    with pytest.raises(ValueError):
+        BackendManager.register("refund", lambda: print, budget=1, hedge_after=0.1)
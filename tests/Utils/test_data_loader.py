@@ -0,0 +1,138 @@
+import json, os
+
+import pytest
+
+from PirateEase.Utils.data_loader import DataLoader
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataLoader, 'snapshot_dir', str(tmp_path / 'snapshots'))
+    DataLoader.clear()
+    yield tmp_path / 'snapshots'
+    DataLoader.clear()
+
+
+def write(path, data, mtime=None):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    if mtime is not None:  # Make the change visible even on filesystems with coarse timestamps
+        os.utime(path, ns=(mtime, mtime))
+    return str(path)
+
+
+class Builder:
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {phrase: len(phrase) for phrase in DataLoader.load(self.path)}
+
+
+def test_load_parses_each_file_once(tmp_path, mocker):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    parse = mocker.spy(json, 'load')
+    first = DataLoader.load(path)
+    assert DataLoader.load(path) is first
+    assert parse.call_count == 1
+
+
+def test_load_parses_again_after_the_file_changes(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'], mtime=1_000_000_000)
+    assert DataLoader.load(path) == ['hello']
+    write(tmp_path / 'phrases.json', ['hello', 'bye'], mtime=2_000_000_000)
+    assert DataLoader.load(path) == ['hello', 'bye']
+
+
+def test_load_without_cache_parses_every_time(tmp_path, mocker):
+    path = write(tmp_path / 'orders.json', {'1': {}})
+    parse = mocker.spy(json, 'load')
+    DataLoader.load(path, cache=False)
+    DataLoader.load(path, cache=False)
+    assert parse.call_count == 2
+
+
+def test_missing_file_is_parsed_through_open(mocker):
+    mocker.patch('builtins.open', mocker.mock_open(read_data='["hi"]'))
+    assert DataLoader.load('Databases/nowhere.json') == ['hi']
+
+
+def test_warm_derive_reads_the_snapshot(tmp_path, snapshot_dir):
+    path = write(tmp_path / 'phrases.json', ['hello', 'bye'])
+    build = Builder(path)
+    assert DataLoader.derive('lengths', (path,), build) == {'hello': 5, 'bye': 3}
+    assert (snapshot_dir / 'lengths.pickle').exists()
+    DataLoader.clear()  # As if restarted
+    assert DataLoader.derive('lengths', (path,), build) == {'hello': 5, 'bye': 3}
+    assert build.calls == 1
+
+
+def test_derive_returns_a_new_object_each_time(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    first = DataLoader.derive('lengths', (path,), Builder(path))
+    first['changed'] = 1
+    assert DataLoader.derive('lengths', (path,), Builder(path)) == {'hello': 5}
+
+
+def test_derive_rebuilds_when_a_source_changes(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'], mtime=1_000_000_000)
+    build = Builder(path)
+    DataLoader.derive('lengths', (path,), build)
+    write(tmp_path / 'phrases.json', ['hi'], mtime=2_000_000_000)
+    assert DataLoader.derive('lengths', (path,), build) == {'hi': 2}
+    assert build.calls == 2
+
+
+def test_derive_rebuilds_when_the_version_changes(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    build = Builder(path)
+    DataLoader.derive('lengths', (path,), build)
+    DataLoader.derive('lengths', (path,), build, version=2)
+    DataLoader.derive('lengths', (path,), build, version=2)
+    assert build.calls == 2
+
+
+def test_derive_rebuilds_when_the_code_changes(tmp_path, monkeypatch):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    build = Builder(path)
+    DataLoader.derive('lengths', (path,), build)
+    monkeypatch.setattr(DataLoader, '_DataLoader__code', 'edited')  # As if a class in the package was changed
+    DataLoader.derive('lengths', (path,), build)
+    DataLoader.derive('lengths', (path,), build)
+    assert build.calls == 2
+
+
+def test_derive_rebuilds_a_corrupt_snapshot(tmp_path, snapshot_dir):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    build = Builder(path)
+    DataLoader.derive('lengths', (path,), build)
+    (snapshot_dir / 'lengths.pickle').write_bytes(b'not a pickle')
+    assert DataLoader.derive('lengths', (path,), build) == {'hello': 5}
+    (snapshot_dir / 'lengths.pickle').write_bytes(b'')
+    assert DataLoader.derive('lengths', (path,), build) == {'hello': 5}
+    assert build.calls == 3
+
+
+def test_derive_builds_without_snapshot_when_a_source_is_missing(tmp_path, snapshot_dir):
+    assert DataLoader.derive('lengths', ('Databases/nowhere.json',), lambda: {'built': True}) == {'built': True}
+    assert not snapshot_dir.exists()
+
+
+def test_derive_still_builds_if_the_snapshot_cannot_be_written(tmp_path, monkeypatch):
+    path = write(tmp_path / 'phrases.json', ['hello'])
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(DataLoader, 'snapshot_dir', str(blocker / 'snapshots'))  # Parent is a file
+    assert DataLoader.derive('lengths', (path,), Builder(path)) == {'hello': 5}
+
+
+def test_derive_does_not_snapshot_a_source_saved_while_building(tmp_path, snapshot_dir):
+    path = write(tmp_path / 'phrases.json', ['hello'], mtime=1_000_000_000)
+
+    def build():
+        write(tmp_path / 'phrases.json', ['bye'], mtime=2_000_000_000)
+        return {'hello': 5}
+
+    assert DataLoader.derive('lengths', (path,), build) == {'hello': 5}
+    assert not (snapshot_dir / 'lengths.pickle').exists()
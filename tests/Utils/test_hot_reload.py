@@ -0,0 +1,94 @@
+import gc, json, os, time
+
+import pytest
+
+import PirateEase.QueryHandlers.query_database as query_database
+from PirateEase.QueryHandlers.query_database import QueryDatabase
+from PirateEase.Utils.data_loader import DataLoader
+from PirateEase.Utils.hot_reload import HotReloader, Reloadable
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataLoader, 'snapshot_dir', str(tmp_path / 'snapshots'))
+    DataLoader.clear()
+    yield
+    HotReloader.stop()
+    DataLoader.clear()
+
+
+def write(path, data, mtime):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    os.utime(path, ns=(mtime, mtime))  # Make each save visible even on filesystems with coarse timestamps
+    return str(path)
+
+
+def test_reload_swaps_in_a_new_version_only_when_a_source_changes(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'], 1_000_000_000)
+    reloadable = Reloadable((path,), lambda: tuple(DataLoader.load(path)))
+    old = reloadable.current
+    assert not reloadable.reload()
+    write(tmp_path / 'phrases.json', ['hello', 'bye'], 2_000_000_000)
+    assert reloadable.reload()
+    assert reloadable.current == ('hello', 'bye')
+    assert old == ('hello',)  # Whoever still holds the old version keeps it intact
+    assert reloadable.reloads == 1
+
+
+def test_failed_rebuild_keeps_current_version_and_retries(tmp_path):
+    path = tmp_path / 'phrases.json'
+    write(path, ['hello'], 1_000_000_000)
+    reloadable = Reloadable((str(path),), lambda: DataLoader.load(str(path)))
+    path.write_text('["hel', encoding='utf-8')  # Caught half saved
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert not reloadable.reload()
+    assert reloadable.current == ['hello']
+    assert isinstance(reloadable.error, json.JSONDecodeError)
+    write(path, ['hello', 'bye'], 3_000_000_000)
+    assert reloadable.reload()
+    assert reloadable.current == ['hello', 'bye'] and reloadable.error is None
+
+
+def test_first_version_can_be_given(tmp_path):
+    path = write(tmp_path / 'phrases.json', [], 1_000_000_000)
+    builds = []
+    reloadable = Reloadable((path,), lambda: builds.append(1) or 'built', current='given')
+    assert reloadable.current == 'given' and not builds
+    assert reloadable.reload(force=True)
+    assert reloadable.current == 'built'
+
+
+def test_poll_reloads_watched_structures_and_forgets_dropped_ones(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'], 1_000_000_000)
+    kept = HotReloader.watch((path,), lambda: DataLoader.load(path))
+    builds = []
+    HotReloader.watch((path,), lambda: builds.append(1))  # Nobody keeps this one
+    gc.collect()
+    write(tmp_path / 'phrases.json', ['bye'], 2_000_000_000)
+    assert HotReloader.poll() == 1
+    assert kept.current == ['bye']
+    assert len(builds) == 1  # Only its first build
+
+
+def test_background_thread_reloads_off_the_request_path(tmp_path):
+    path = write(tmp_path / 'phrases.json', ['hello'], 1_000_000_000)
+    reloadable = HotReloader.watch((path,), lambda: DataLoader.load(path))
+    HotReloader.start(interval=0.01)
+    write(tmp_path / 'phrases.json', ['bye'], 2_000_000_000)
+    deadline = time.monotonic() + 5
+    while reloadable.current != ['bye'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert reloadable.current == ['bye']
+
+
+def test_query_database_answers_from_reloaded_queries(tmp_path, monkeypatch):
+    path = write(tmp_path / 'queries.json', {'do you sell swords': 'Aye!'}, 1_000_000_000)
+    monkeypatch.setattr(query_database, 'QUERIES', path)
+    handler = QueryDatabase()
+    assert handler.handle('do you sell swords?') == 'Aye!'
+    assert handler.handle('do you sell cannons?') == ''
+    write(tmp_path / 'queries.json', {'do you sell cannons': 'Only small ones.'}, 2_000_000_000)
+    assert HotReloader.poll() >= 1
+    assert handler.handle('do you sell cannons?') == 'Only small ones.'
+    assert handler.handle('do you sell swords?') == ''
+    assert handler.queries == {'do you sell cannons': 'Only small ones.'}
@@ -58,4 +58,19 @@ def test_recognize_intent_with_empty_database(mocker):
 
     # All queries should return 'unknown'
     assert recognizer.recognize_intent("order") == "unknown"
-    assert recognizer.recognize_intent("refund") == "unknown"
\ No newline at end of file
+    assert recognizer.recognize_intent("refund") == "unknown"
+
+def test_recognize_intent_from_shared_scan(mocker):
+    mock_data = {
+        "order": ["order"],
+        "refund": ["refund"],
+    }
+    mocker.patch("builtins.open", mock_open())
+    mocker.patch("json.load", return_value=mock_data)
+
+    recognizer = IntentRecognizer()
+
+    assert ("refund", ("intent", "refund")) in list(recognizer.labeled_phrases())
+    # Database order still decides which category wins
+    assert recognizer.recognize_intent("ignored", {("intent", "refund"), ("intent", "order")}) == "order"
+    assert recognizer.recognize_intent("refund", {("negative", None)}) == "unknown"
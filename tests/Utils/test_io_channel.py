@@ -0,0 +1,96 @@
+import asyncio
+import socket
+
+import pytest
+from unittest.mock import patch
+from PirateEase.Utils.io_channel import (AsyncChannel, QueueChannel, SocketChannel, TerminalChannel, active_channel,
+                                         use_channel)
+
+
+def test_terminal_channel_is_default():
+    assert isinstance(active_channel(), TerminalChannel)
+
+    with patch('PirateEase.Utils.io_channel.slow_print') as mock_slow_print, \
+            patch('builtins.input', return_value='ahoy') as mock_input:
+        active_channel().write('Hello')
+        assert active_channel().read() == 'ahoy'
+
+    mock_slow_print.assert_called_once_with('Hello')
+    mock_input.assert_called_once_with('User: ')
+
+
+def test_use_channel_restores_previous_channel():
+    channel = QueueChannel()
+    with use_channel(channel):
+        assert active_channel() is channel
+    assert isinstance(active_channel(), TerminalChannel)
+
+
+def test_queue_channel_replays_and_records():
+    channel = QueueChannel(['first'])
+    channel.feed('second')
+
+    assert channel.read() == 'first'
+    assert channel.read() == 'second'
+    with pytest.raises(EOFError):
+        channel.read()
+
+    channel.write('Ahoy')
+    assert channel.outputs == ['Ahoy']
+
+
+def test_queue_channel_async_interface():
+    channel = QueueChannel(['aye'])
+
+    async def scenario():
+        await channel.send('Ready?')
+        return await channel.receive()
+
+    assert asyncio.run(scenario()) == 'aye'
+    assert channel.outputs == ['Ready?']
+
+
+def test_socket_channel_line_protocol():
+    server_sock, client_sock = socket.socketpair()
+    with server_sock, client_sock:
+        channel = SocketChannel(server_sock)
+        client = client_sock.makefile('rw', encoding='utf-8', newline='\n')
+
+        channel.write('What be yer order ID?')
+        assert client.readline() == 'What be yer order ID?\n'
+
+        client.write('123456\r\n')
+        client.flush()
+        assert channel.read() == '123456'
+
+        client.close()
+        client_sock.shutdown(socket.SHUT_WR)
+        with pytest.raises(EOFError):
+            channel.read()
+
+
+def test_async_channel_cannot_be_read_synchronously():
+    async def scenario():
+        channel = AsyncChannel()
+        channel.write('Hello')
+        channel.deliver('Hi')
+        assert await channel.next_output() == 'Hello'
+        assert await channel.receive() == 'Hi'
+        with pytest.raises(RuntimeError):
+            channel.read()
+
+    asyncio.run(scenario())
+
+
+def test_terminal_channel_send_does_not_wait_for_typing():
+    channel = TerminalChannel()
+
+    async def scenario():
+        with patch('sys.stdout') as mock_stdout, patch('builtins.input', return_value='aye'):
+            await channel.send('Ahoy')
+            mock_stdout.write.assert_not_called()  # Typing happens on the renderer's task
+            reply = await channel.receive()  # Prompting waits for the typing to finish
+            mock_stdout.write.assert_called_with('\n')
+            return reply
+
+    assert asyncio.run(scenario()) == 'aye'
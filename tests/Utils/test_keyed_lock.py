@@ -0,0 +1,58 @@
+import threading
+
+from PirateEase.Utils.keyed_lock import KeyedLock
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    locks = KeyedLock()
+    holding_a = threading.Event()
+    release_a = threading.Event()
+
+    def hold_a():
+        with locks.hold("a"):
+            holding_a.set()
+            release_a.wait(2)
+
+    thread = threading.Thread(target=hold_a)
+    thread.start()
+    holding_a.wait(2)
+
+    got_b = threading.Event()
+
+    def hold_b():
+        with locks.hold("b"):
+            got_b.set()
+
+    other = threading.Thread(target=hold_b)
+    other.start()
+    assert got_b.wait(1)  # "b" is free while "a" is held
+
+    release_a.set()
+    thread.join()
+    other.join()
+
+
+def test_same_key_is_mutually_exclusive():
+    locks = KeyedLock()
+    counter = {"value": 0}
+
+    def increment():
+        for _ in range(1000):
+            with locks.hold("counter"):
+                value = counter["value"]
+                counter["value"] = value + 1
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter["value"] == 8000
+
+
+def test_unused_locks_are_dropped():
+    locks = KeyedLock()
+    with locks.hold(1):
+        with locks.hold(2):
+            assert len(locks) == 2
+    assert len(locks) == 0
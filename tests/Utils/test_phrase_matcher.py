@@ -0,0 +1,44 @@
+import random
+
+from PirateEase.Utils.phrase_matcher import PhraseMatcher
+
+
+def test_find_labels_returns_every_matching_phrase():
+    matcher = PhraseMatcher([("he", "a"), ("she", "b"), ("his", "c"), ("hers", "d")])
+
+    assert matcher.find_labels("ushers") == {"a", "b", "d"}
+    assert matcher.find_labels("this") == {"c"}
+    assert matcher.find_labels("xyz") == set()
+
+
+def test_overlapping_and_nested_phrases():
+    matcher = PhraseMatcher([("refund", "refund"), ("fund", "money"), ("i want a refund", "long")])
+
+    assert matcher.find_labels("i want a refund now") == {"refund", "money", "long"}
+    assert matcher.find_labels("crowdfunding") == {"money"}
+
+
+def test_empty_phrase_matches_everything():
+    matcher = PhraseMatcher([("", "always"), ("bye", "exit")])
+
+    assert matcher.find_labels("") == {"always"}
+    assert matcher.find_labels("bye") == {"always", "exit"}
+
+
+def test_first_label_respects_order():
+    matcher = PhraseMatcher([("order", "order"), ("return", "refund")])
+
+    assert matcher.first_label("return my order", ["order", "refund"]) == "order"
+    assert matcher.first_label("return my order", ["refund", "order"]) == "refund"
+    assert matcher.first_label("hello", ["order", "refund"]) is None
+
+
+def test_matches_naive_substring_search():
+    rng = random.Random(7)
+    phrases = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(40)]
+    matcher = PhraseMatcher((phrase, i) for i, phrase in enumerate(phrases))
+
+    for _ in range(200):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 12)))
+        expected = {i for i, phrase in enumerate(phrases) if phrase in text}
+        assert matcher.find_labels(text) == expected
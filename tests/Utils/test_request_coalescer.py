@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from PirateEase.Utils.request_coalescer import RequestCoalescer
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_lone_request_is_served_at_once():
+    calls = []
+    coalescer = RequestCoalescer(lambda request_type, items: calls.append(items) or [i.upper() for i in items])
+
+    assert coalescer.request("order", "a") == "A"
+    assert coalescer.request("order", "a") == "A"
+    assert calls == [["a"], ["a"]]  # Serial requests are never shared
+
+
+def test_concurrent_identical_requests_share_one_call():
+    calls = []
+    release = threading.Event()
+
+    def serve(request_type, items):
+        calls.append(list(items))
+        release.wait(5)
+        return [f"{request_type}:{i}" for i in items]
+
+    coalescer = RequestCoalescer(serve)
+    results = {}
+
+    def ask(name):
+        results[name] = coalescer.request("inventory", "cutlass")
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: coalescer.requests == 8)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {i: "inventory:cutlass" for i in range(8)}
+    assert calls == [["cutlass"]] and coalescer.served == 1
+
+
+def test_distinct_requests_run_side_by_side():
+    barrier = threading.Barrier(12, timeout=5)  # Only passes if all 12 calls are running at once
+
+    def serve(request_type, items):
+        barrier.wait()
+        return [i.upper() for i in items]
+
+    coalescer = RequestCoalescer(serve)
+    results = {}
+
+    def ask(data):
+        results[data] = coalescer.request("inventory", data)
+
+    threads = [threading.Thread(target=ask, args=(f"item{i}",)) for i in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {f"item{i}": f"ITEM{i}" for i in range(12)}
+    assert coalescer.served == 12
+
+
+def test_batched_requests_queue_behind_a_running_call():
+    calls = []
+    release = threading.Event()
+
+    def serve(request_type, items):
+        calls.append((request_type, list(items)))
+        release.wait(5)
+        return [f"{request_type}:{i}" for i in items]
+
+    coalescer = RequestCoalescer(serve, batched=lambda request_type: request_type == "order")
+    results = {}
+
+    def ask(name, request_type, data):
+        results[name] = coalescer.request(request_type, data)
+
+    leader = threading.Thread(target=ask, args=("leader", "order", "1"))
+    leader.start()
+    wait_until(lambda: calls)  # The leader's call is running
+    followers = [threading.Thread(target=ask, args=(f"f{i}", "order", str(i % 3))) for i in range(12)]
+    for thread in followers:
+        thread.start()
+    wait_until(lambda: coalescer.requests == 13)
+    other = threading.Thread(target=ask, args=("other", "inventory", "0"))
+    other.start()
+    wait_until(lambda: len(calls) == 2)  # Another type does not wait for the order leader
+    assert calls[1] == ("inventory", ["0"])
+    release.set()
+    for thread in [leader, *followers, other]:
+        thread.join(5)
+
+    assert results["leader"] == "order:1" and results["other"] == "inventory:0"
+    assert all(results[f"f{i}"] == f"order:{i % 3}" for i in range(12))
+    # The leader's call, then one call for everything that queued behind it, "1" shared the call in flight
+    assert calls[0] == ("order", ["1"])
+    assert [(t, sorted(items)) for t, items in calls[2:]] == [("order", ["0", "2"])]
+    assert coalescer.served == 4
+
+
+def test_failing_request_only_fails_its_own_callers():
+    calls = []
+    release = threading.Event()
+
+    def serve(request_type, items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            release.wait(5)
+        return [int(i) for i in items]  # One bad item fails the whole batch
+
+    coalescer = RequestCoalescer(serve, batched=lambda request_type: True)
+    results = {}
+
+    def ask(data):
+        try:
+            results[data] = coalescer.request("order", data)
+        except ValueError as error:
+            results[data] = error
+
+    threads = [threading.Thread(target=ask, args=(data,)) for data in ("1", "abc", "5")]
+    threads[0].start()
+    wait_until(lambda: calls)  # The leader's call is running, the rest queue behind it as one batch
+    for thread in threads[1:]:
+        thread.start()
+    wait_until(lambda: coalescer.requests == 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert sorted(calls[1]) == ["5", "abc"]  # The bad and the good request were batched together
+    assert results["1"] == 1 and results["5"] == 5
+    assert isinstance(results["abc"], ValueError)
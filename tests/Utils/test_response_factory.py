@@ -1,4 +1,7 @@
+import json, subprocess, sys
+
 import pytest
+from PirateEase.Utils.data_loader import DataLoader
 from PirateEase.Utils.response_factory import ResponseFactory
 
 responses: dict[str, list[str]] = ResponseFactory.responses
@@ -13,3 +16,55 @@ def test_invalid_category():
     with pytest.raises(KeyError):
         ResponseFactory.get_response("non_existent_category")
 
+
+@pytest.fixture
+def responses_file(tmp_path, monkeypatch):
+    path = tmp_path / "responses.json"
+    path.write_text(json.dumps({"greeting": ["Ahoy!"]}), encoding="utf-8")
+    monkeypatch.setattr(ResponseFactory, "responses_path", str(path))
+    ResponseFactory.reset()
+    yield path
+    monkeypatch.undo()
+    ResponseFactory.reset()
+
+def test_import_reads_no_databases():
+    code = (
+        "import sys\n"
+        "opened = []\n"
+        "sys.addaudithook(lambda event, args: event == 'open' and isinstance(args[0], str) and "
+        "args[0].endswith('.json') and opened.append(args[0]))\n"
+        "import PirateEase.chatbot\n"
+        "print(opened)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_responses_load_on_first_use(responses_file, mocker):
+    load = mocker.spy(DataLoader, "load")
+    assert load.call_count == 0
+    assert ResponseFactory.get_response("greeting") == "Ahoy!"
+    ResponseFactory.get_response("greeting")
+    assert load.call_count == 1
+
+def test_responses_from_compiled_snapshot(responses_file, tmp_path, monkeypatch):
+    snapshot = str(tmp_path / "responses.pickle")
+    DataLoader.compile(str(responses_file), snapshot)
+    monkeypatch.setattr(ResponseFactory, "snapshot", snapshot)
+    responses_file.unlink()  # Not shipped with the snapshot
+    assert ResponseFactory.get_response("greeting") == "Ahoy!"
+
+def test_stale_snapshot_is_refused(responses_file, tmp_path):
+    snapshot = str(tmp_path / "responses.pickle")
+    DataLoader.compile(str(responses_file), snapshot)
+    responses_file.write_text(json.dumps({"greeting": ["Avast!"]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        DataLoader.read_snapshot(snapshot, str(responses_file))
+
+def test_stale_snapshot_falls_back_to_responses(responses_file, tmp_path, monkeypatch):
+    snapshot = str(tmp_path / "responses.pickle")
+    DataLoader.compile(str(responses_file), snapshot)
+    monkeypatch.setattr(ResponseFactory, "snapshot", snapshot)
+    assert ResponseFactory.get_response("greeting") == "Ahoy!"
+    responses_file.write_text(json.dumps({"greeting": ["Avast!"]}), encoding="utf-8")
+    assert ResponseFactory.catalog().reload()  # responses.json is watched as well as the snapshot
+    assert ResponseFactory.get_response("greeting") == "Avast!"
@@ -51,4 +51,14 @@ def test_negative_sentiment_detected_with_empty_database(mocker):
     analyzer = SentimentAnalyzer()
 
     assert not analyzer.negative_sentiment_detected("I am angry")
-    assert not analyzer.negative_sentiment_detected("This is terrible")
\ No newline at end of file
+    assert not analyzer.negative_sentiment_detected("This is terrible")
+
+def test_negative_sentiment_detected_from_shared_scan(mocker):
+    mocker.patch("builtins.open", mock_open())
+    mocker.patch("json.load", return_value=["angry"])
+
+    analyzer = SentimentAnalyzer()
+
+    assert list(analyzer.labeled_phrases()) == [("angry", ("negative", None))]
+    assert analyzer.negative_sentiment_detected("ignored", {("negative", None)})
+    assert not analyzer.negative_sentiment_detected("I am angry", {("intent", "refund")})
@@ -1,6 +1,6 @@
 import pytest
 
-from PirateEase.Utils.session_manager import SessionManager
+from PirateEase.Utils.session_manager import CurrentSession, SessionManager
 from PirateEase.Utils.singleton import Singleton
 
 @pytest.fixture
@@ -83,4 +83,39 @@ def test_reinitialization(session):
 
     # Verify state and history persist
     assert session2.get("test") == "value"
-    assert session2.history == ["message"]
\ No newline at end of file
+    assert session2.history == ["message"]
+
+def test_sessions_are_isolated(session):
+    alice = SessionManager("alice")
+    bob = SessionManager("bob")
+
+    alice.set("order_id", "111")
+    bob.append_history("Hello from Bob")
+
+    assert alice is SessionManager("alice")
+    assert alice is not bob
+    assert "order_id" not in bob
+    assert alice.history == []
+    assert "order_id" not in session
+
+
+def test_activate_switches_current_session(session):
+    current = CurrentSession()
+
+    with SessionManager.activate("alice") as alice:
+        current.set("refund_id", "222")
+        current.append_history("User: refund please")
+        assert SessionManager.current() is alice
+
+    assert SessionManager("alice").get("refund_id") == "222"
+    assert SessionManager("alice").history == ["User: refund please"]
+    assert "refund_id" not in current
+    assert SessionManager.current() is session
+
+
+def test_end_session(session):
+    SessionManager("alice").set("order_id", "111")
+
+    SessionManager.end_session("alice")
+
+    assert "order_id" not in SessionManager("alice")
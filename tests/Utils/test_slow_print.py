@@ -1,5 +1,16 @@
-from unittest.mock import patch, call
-from PirateEase.Utils.slow_print import slow_print
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch, call, MagicMock
+from PirateEase.Utils.slow_print import StreamRenderer, set_typing_effect, slow_print, typing_effect_enabled
+
+
+@pytest.fixture(autouse=True)
+def typing_effect_on():
+    set_typing_effect(True)
+    yield
+    set_typing_effect(None)
 
 
 def test_slow_print_output():
@@ -66,4 +77,56 @@ def test_slow_print_special_characters():
     # Verify each character was printed, including special chars
     char_calls = [call(c, end='', flush=True) for c in test_string]
     mock_print.assert_has_calls(char_calls)
-    mock_print.assert_called_with()
\ No newline at end of file
+    mock_print.assert_called_with()
+
+
+def test_slow_print_prints_at_once_when_typing_effect_off():
+    set_typing_effect(False)
+
+    with patch('builtins.print') as mock_print:
+        with patch('time.sleep') as mock_sleep:
+            slow_print("Hello")
+
+    mock_print.assert_called_once_with("Hello")
+    mock_sleep.assert_not_called()
+
+
+def test_typing_effect_follows_tty_when_not_forced():
+    set_typing_effect(None)
+
+    with patch('sys.stdout', MagicMock(isatty=MagicMock(return_value=False))):
+        assert not typing_effect_enabled()
+    with patch('sys.stdout', MagicMock(isatty=MagicMock(return_value=True))):
+        assert typing_effect_enabled()
+
+
+def test_stream_renderer_returns_immediately_and_types_in_chunks():
+    written = []
+    renderer = StreamRenderer(chunk_size=2, chars_per_second=100.0, write=written.append)
+
+    async def scenario():
+        start = time.perf_counter()
+        renderer.render("Hello")
+        renderer.render("Hi")
+        returned_after = time.perf_counter() - start
+        await renderer.drain()
+        return returned_after, time.perf_counter() - start
+
+    returned_after, finished_after = asyncio.run(scenario())
+
+    assert returned_after < 0.01
+    assert finished_after >= 0.06
+    assert written == ["He", "ll", "o", "\n", "Hi", "\n"]
+
+
+def test_stream_renderer_writes_at_once_when_typing_effect_off():
+    set_typing_effect(False)
+    written = []
+    renderer = StreamRenderer(write=written.append)
+
+    async def scenario():
+        renderer.render("Hello")
+        await renderer.drain()
+
+    asyncio.run(scenario())
+    assert written == ["Hello", "\n"]
@@ -0,0 +1,52 @@
+import pytest
+
+from PirateEase.Utils import tfidf_index
+from PirateEase.Utils.tfidf_index import TfidfIndex
+
+QUESTIONS = {
+    "password": "how do i reset my password",
+    "cards": "do you accept international credit cards",
+    "returns": "what's your return policy",
+    "pickup": "do you offer curbside pickup",
+}
+
+
+@pytest.fixture
+def index():
+    return TfidfIndex(QUESTIONS.items())
+
+
+def test_search(index):
+    assert len(index) == 4
+    key, score = index.search("How do I reset my password?")
+    assert key == "password" and score == pytest.approx(1.0)
+    assert index.search("i forgot my password, how can i change it", 0.3)[0] == "password"
+    assert index.search("zzz qqq", 0.1) is None
+
+
+def test_threshold(index):
+    key, score = index.search("can i pay with a credit card")
+    assert key == "cards"
+    assert index.search("can i pay with a credit card", score + 0.01) is None
+
+
+def test_search_many_matches_search(index):
+    texts = ["where's your return policy", "curbside pickup?", "parrots", "reset password"] * 500
+    results = index.search_many(texts, 0.2)
+    assert len(results) == 2000
+    assert results[:4] == [index.search(text, 0.2) for text in texts[:4]]
+    assert [result and result[0] for result in results[:4]] == ["returns", "pickup", None, "password"]
+
+
+def test_empty_index():
+    assert TfidfIndex([]).search_many(["anything"]) == [None]
+    assert TfidfIndex(QUESTIONS.items()).search_many([]) == []
+
+
+def test_scipy_and_python_scores_agree(monkeypatch):
+    pytest.importorskip("scipy")
+    with_scipy = TfidfIndex(QUESTIONS.items()).search_many(["reset my password", "return policy"])
+    monkeypatch.setattr(tfidf_index, "sparse", None)
+    without = TfidfIndex(QUESTIONS.items()).search_many(["reset my password", "return policy"])
+    assert [key for key, _ in with_scipy] == [key for key, _ in without]
+    assert [score for _, score in with_scipy] == pytest.approx([score for _, score in without])
@@ -0,0 +1,70 @@
+import random
+import string
+
+import pytest
+
+from PirateEase.Utils.trigram_index import TrigramIndex, normalize, trigrams
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("What’s your  Return policy??", "whats your return policy"),
+    ("what's your return policy", "whats your return policy"),
+    ("  Curbside\tpickup - available?  ", "curbside pickup available"),
+    ("snake_case", "snake case"),
+    ("", ""),
+])
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+
+def test_trigrams_are_padded():
+    assert trigrams("ab") == frozenset({"  a", " ab", "ab "})
+
+
+def test_nearest():
+    index = TrigramIndex([("password", "how do i reset my password"), ("cards", "do you accept credit cards")])
+    assert len(index) == 2
+    key, score = index.nearest("How do I reset my password?", 0.6)
+    assert key == "password" and score == 1.0
+    assert index.nearest("how can i reset my pasword", 0.6)[0] == "password"
+    assert index.nearest("do you sell parrots", 0.6) is None
+
+
+def test_nearest_picks_most_similar():
+    index = TrigramIndex()
+    index.add(1, "where is my order")
+    index.add(2, "where is my refund")
+    assert index.nearest("where is my ordr", 0.5)[0] == 1
+    assert index.nearest("where is my refnd", 0.5)[0] == 2
+
+
+class CountingGrams(list):
+    """
+    Counts how many entries a lookup scores.
+    """
+    reads = 0
+
+    def __getitem__(self, entry):
+        CountingGrams.reads += 1
+        return super().__getitem__(entry)
+
+
+def test_lookup_on_large_faq_scores_few_candidates():
+    rng = random.Random(7)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))) for _ in range(2000)]
+    questions = [" ".join(rng.choice(words) for _ in range(rng.randint(4, 9))) for _ in range(3000)]
+    index = TrigramIndex((question, question) for question in questions)
+    index._TrigramIndex__grams = CountingGrams(index._TrigramIndex__grams)
+    CountingGrams.reads = 0
+
+    for question in questions[:200]:
+        typo = question[:-1] + "?"
+        assert index.nearest(typo, 0.6)[0] == question
+    assert CountingGrams.reads / 200 < 10  # A handful of candidates each, not all 3000 questions
+
+
+def test_queries_do_not_grow_the_hash_cache():
+    index = TrigramIndex([("password", "how do i reset my password")])
+    cached = len(index._TrigramIndex__gram_hashes)
+    index.nearest("zebras quixotically jump over wavy fjords", 0.6)
+    assert len(index._TrigramIndex__gram_hashes) == cached
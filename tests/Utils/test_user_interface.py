@@ -1,13 +1,15 @@
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock, PropertyMock
+from PirateEase.Utils.io_channel import AsyncChannel, QueueChannel, use_channel
 from PirateEase.Utils.user_interface import UserInterface
 
 @pytest.fixture
 def mock_dependencies():
     """Fixture to mock all external dependencies"""
     with patch('PirateEase.Utils.user_interface.ResponseFactory') as mock_factory, \
-            patch('PirateEase.Utils.user_interface.slow_print'), \
-            patch('PirateEase.Utils.user_interface.SessionManager') as mock_session_manager, \
+            patch('PirateEase.Utils.io_channel.slow_print'), \
+            patch('PirateEase.Utils.user_interface.CurrentSession') as mock_session_manager, \
             patch('builtins.input'):
         # Configure mock ResponseFactory
         mock_factory.get_response.side_effect = lambda x: {
@@ -111,4 +113,51 @@ def test_empty_input_handling(mock_dependencies):
 
     # Verify empty input was recorded
     calls = mock_session.append_history.call_args_list
-    assert calls[1][0][0] == 'User: '
\ No newline at end of file
+    assert calls[1][0][0] == 'User: '
+
+def test_get_order_id_async_waits_on_channel(mock_dependencies):
+    mock_factory, mock_session = mock_dependencies
+
+    async def conversation():
+        channel = AsyncChannel()
+        with use_channel(channel):
+            task = asyncio.create_task(UserInterface.get_order_id_async('order_id'))
+            assert await channel.next_output() == 'PirateEase: Please enter your order ID: '
+            channel.deliver('abc')
+            assert await channel.next_output() == 'Invalid order ID!'
+            assert await channel.next_output() == 'PirateEase: Please enter your order ID: '
+            channel.deliver(' 54321 ')
+            return await task
+
+    assert asyncio.run(conversation()) == '54321'
+    calls = [c[0][0] for c in mock_session.append_history.call_args_list]
+    assert calls == ['PirateEase: Please enter your order ID: ', 'User: abc', 'Invalid order ID!',
+                     'PirateEase: Please enter your order ID: ', 'User: 54321']
+
+
+def test_queue_channel_drives_prompts_without_terminal(mock_dependencies):
+    mock_factory, mock_session = mock_dependencies
+    channel = QueueChannel(['oops', '777', 'Cursed'])
+
+    with use_channel(channel), patch('builtins.input') as mock_input:
+        assert UserInterface.get_order_id('order_id') == '777'
+        assert UserInterface.get_refund_reason() == 'Cursed'
+        mock_input.assert_not_called()
+
+    assert channel.outputs == ['PirateEase: Please enter your order ID: ', 'Invalid order ID!',
+                               'PirateEase: Please enter your order ID: ',
+                               'PirateEase: Why are you requesting a refund? ']
+
+
+def test_sync_and_async_say_record_history_before_a_failed_send(mock_dependencies):
+    mock_factory, mock_session = mock_dependencies
+    channel = MagicMock()
+    channel.write.side_effect = channel.send.side_effect = ConnectionResetError
+
+    with use_channel(channel):
+        with pytest.raises(ConnectionResetError):
+            UserInterface.say('Ahoy!')
+        with pytest.raises(ConnectionResetError):
+            asyncio.run(UserInterface.say_async('Ahoy!'))
+
+    assert [c[0][0] for c in mock_session.append_history.call_args_list] == ['Ahoy!', 'Ahoy!']
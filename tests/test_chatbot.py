@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 import json
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock, AsyncMock, mock_open
 from PirateEase.chatbot import ChatBot
 
 
@@ -20,14 +21,13 @@ def bot(mock_dependencies):
             patch("PirateEase.chatbot.IntentRecognizer"), \
             patch("PirateEase.chatbot.SentimentAnalyzer"), \
             patch("PirateEase.chatbot.SessionManager"), \
-            patch("PirateEase.chatbot.LiveAgentService"):
-
-
+            patch("PirateEase.chatbot.LiveAgentService") as mock_agent_service:
+        mock_agent_service.return_value.pending_connection.return_value = ''  # Nobody waiting on an agent
         return ChatBot()
 
 
 def test_process_query_negative_sentiment(bot):
-    with patch.object(bot._ChatBot__sentiment_analyzer, "negative_sentiment_detected", return_value=True), \
+    with patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=True), \
             patch("PirateEase.chatbot.ResponseFactory.get_response", return_value="I'm sorry to hear that."), \
             patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
         # Simulate live agent handler returning a response
@@ -42,7 +42,7 @@ def test_process_query_negative_sentiment(bot):
 
 
 def test_process_query_from_database(bot):
-    with patch.object(bot._ChatBot__sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
+    with patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
             patch.object(bot._ChatBot__query_manager.get_handler("db"), "handle", return_value="Yes, we do sell that!"):
         result = bot.process_query("Do you sell swords?")
         assert result == "Yes, we do sell that!"
@@ -50,8 +50,8 @@ def test_process_query_from_database(bot):
 
 def test_process_query_with_intent_routing(bot):
     # Sentiment is not negative
-    with patch.object(bot._ChatBot__sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
-            patch.object(bot._ChatBot__intent_recognizer, "recognize_intent", return_value="refund"), \
+    with patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
+            patch.object(bot._ChatBot__phrases.current.intent_recognizer, "recognize_intent", return_value="refund"), \
             patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
 
         # First call: get_handler("db") should return a mock that returns an empty string
@@ -96,3 +96,59 @@ def test_should_not_disconnect(bot):
     with patch.object(bot._ChatBot__agent_service, "agent_name_in_string", return_value=False):
         result = bot.should_disconnect("Tell me about cutlasses.")
         assert result is False
+
+
+def test_process_query_scans_query_once_for_all_components(bot):
+    with patch.object(bot._ChatBot__phrases.current.matcher, "find_labels", return_value={("intent", "refund")}) as mock_scan, \
+            patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=False) as mock_sentiment, \
+            patch.object(bot._ChatBot__phrases.current.intent_recognizer, "recognize_intent", return_value="refund") as mock_intent, \
+            patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
+        mock_get_handler.return_value.handle.return_value = ""
+
+        bot.process_query("I want a REFUND")
+
+        mock_scan.assert_called_once_with("i want a refund")
+        mock_sentiment.assert_called_once_with("I want a REFUND", {("intent", "refund")})
+        mock_intent.assert_called_once_with("I want a REFUND", {("intent", "refund")})
+
+
+def test_process_query_activates_given_session(bot):
+    with patch("PirateEase.chatbot.SessionManager") as mock_session_manager, \
+            patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
+            patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
+        mock_get_handler.return_value.handle.return_value = "Ahoy!"
+
+        result = bot.process_query("hello", session_id="abc")
+
+        mock_session_manager.activate.assert_called_once_with("abc")
+        assert result == "Ahoy!"
+
+
+def test_process_query_async_awaits_handler(bot):
+    with patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=False), \
+            patch.object(bot._ChatBot__phrases.current.intent_recognizer, "recognize_intent", return_value="order"), \
+            patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
+        mock_get_handler.return_value.handle.return_value = ""
+        mock_get_handler.return_value.handle_async = AsyncMock(return_value="Order #1 is on its way.")
+
+        result = asyncio.run(bot.process_query_async("Where is my ORDER?", session_id="abc"))
+
+        assert result == "Order #1 is on its way."
+        mock_get_handler.return_value.handle_async.assert_awaited_once_with("where is my order?")
+
+
+def test_process_query_hands_over_assigned_agent(bot):
+    bot._ChatBot__agent_service.pending_connection.return_value = "Connecting you to Anne Bonny..."
+    with patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
+        result = bot.process_query("are you still there?")
+    assert result == "Connecting you to Anne Bonny..."
+    mock_get_handler.assert_not_called()
+
+
+def test_negative_sentiment_escalation_is_urgent(bot):
+    with patch.object(bot._ChatBot__phrases.current.sentiment_analyzer, "negative_sentiment_detected", return_value=True), \
+            patch("PirateEase.chatbot.ResponseFactory.get_response", return_value="Sorry!"), \
+            patch.object(bot._ChatBot__query_manager, "get_handler") as mock_get_handler:
+        mock_get_handler.return_value.handle.return_value = "PirateEase: Hold on.\nYou're number 1 in line"
+        bot.process_query("This is awful")
+    mock_get_handler.return_value.handle.assert_called_with("This is awful", urgent=True)
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from PirateEase.chatbot import GREETING
+from PirateEase.main import chat
+from PirateEase.Utils.io_channel import TerminalChannel, active_channel
+from PirateEase.Utils.slow_print import StreamRenderer, set_typing_effect
+
+
+@pytest.fixture(autouse=True)
+def no_typing_effect():
+    set_typing_effect(False)
+    yield
+    set_typing_effect(None)
+
+
+class ScriptedBot:
+    """
+    Stand-in for ChatBot that answers every query and hangs up on 'bye'.
+    """
+
+    def __init__(self):
+        self.channels: list = []
+
+    def should_disconnect(self, response: str) -> bool:
+        return 'bye' in response
+
+    async def process_query_async(self, query: str) -> str:
+        self.channels.append(active_channel())
+        return f'You said {query}'
+
+
+def test_chat_renders_responses_in_the_background(mocker, capsys):
+    written = []
+    renderer = StreamRenderer(write=written.append)
+    render = mocker.spy(renderer, 'render')
+    mocker.patch('PirateEase.Utils.io_channel.StreamRenderer', return_value=renderer)
+    slow_print = mocker.patch('PirateEase.Utils.io_channel.slow_print')
+    mocker.patch('builtins.input', side_effect=['hello', 'bye'])
+    channel = TerminalChannel()
+    bot = ScriptedBot()
+
+    asyncio.run(chat(bot, channel))
+
+    assert capsys.readouterr().out.splitlines() == list(GREETING)
+    assert bot.channels == [channel, channel]
+    assert [call.args[0] for call in render.call_args_list] == ['PirateEase: You said hello',
+                                                                'PirateEase: You said bye']
+    assert ''.join(written) == 'PirateEase: You said hello\nPirateEase: You said bye\n'
+    slow_print.assert_not_called()
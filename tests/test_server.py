@@ -0,0 +1,125 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from PirateEase.chatbot import GREETING
+from PirateEase.server import BUSY_MESSAGE, ChatServer
+from PirateEase.Utils.session_manager import SessionManager
+from PirateEase.Utils.user_interface import UserInterface
+
+
+@pytest.fixture(autouse=True)
+def agent_service(mocker):
+    return mocker.patch('PirateEase.server.LiveAgentService').return_value
+
+
+class EchoBot:
+    """
+    Stand-in for ChatBot that asks for a name on 'name' and hangs up on 'bye'.
+    """
+
+    def __init__(self):
+        self.sessions: list[str] = []
+
+    def should_disconnect(self, response: str) -> bool:
+        return 'bye' in response
+
+    async def process_query_async(self, query: str) -> str:
+        self.sessions.append(SessionManager.current().session_id)
+        if query == 'name':
+            return 'Hi ' + await UserInterface.ask_async('PirateEase: Who are ye?')
+        return query.upper()
+
+
+async def read_line(reader: asyncio.StreamReader) -> str:
+    return (await asyncio.wait_for(reader.readline(), 2)).decode('utf-8').rstrip('\n')
+
+
+async def connect(server: ChatServer) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    for line in GREETING:
+        assert await read_line(reader) == line
+    return reader, writer
+
+
+async def send(writer: asyncio.StreamWriter, line: str) -> None:
+    writer.write((line + '\n').encode('utf-8'))
+    await writer.drain()
+
+
+def test_each_connection_gets_its_own_session():
+    bot = EchoBot()
+
+    async def scenario():
+        server = ChatServer(bot, port=0)
+        await server.start()
+        reader_a, writer_a = await connect(server)
+        reader_b, writer_b = await connect(server)
+        assert server.active_sessions == 2
+
+        # A is suspended at a follow-up prompt while B keeps chatting
+        await send(writer_a, 'name')
+        assert await read_line(reader_a) == 'PirateEase: Who are ye?'
+        await send(writer_b, 'ahoy')
+        assert await read_line(reader_b) == 'PirateEase: AHOY'
+        await send(writer_a, 'Anne')
+        assert await read_line(reader_a) == 'PirateEase: Hi Anne'
+
+        await send(writer_b, 'bye')
+        assert await read_line(reader_b) == 'PirateEase: BYE'
+        assert await read_line(reader_b) == ''  # Server hung up
+
+        writer_a.close()
+        await server.close()
+        assert server.active_sessions == 0
+
+    asyncio.run(scenario())
+    assert len(set(bot.sessions)) == 2
+
+
+def test_hang_up_withdraws_the_agent_request(agent_service):
+    bot = EchoBot()
+
+    async def scenario():
+        server = ChatServer(bot, port=0)
+        await server.start()
+        reader, writer = await connect(server)
+        await send(writer, 'ahoy')
+        assert await read_line(reader) == 'PirateEase: AHOY'
+        writer.close()  # Client leaves mid conversation
+        await server.close()
+
+    asyncio.run(scenario())
+    agent_service.cancel.assert_called_once_with(bot.sessions[0])
+
+
+def test_connections_over_the_limit_are_turned_away():
+    async def scenario():
+        server = ChatServer(EchoBot(), port=0, max_sessions=1)
+        await server.start()
+        _, writer_a = await connect(server)
+
+        reader_b, _ = await asyncio.open_connection('127.0.0.1', server.port)
+        assert await read_line(reader_b) == BUSY_MESSAGE
+        assert await read_line(reader_b) == ''
+
+        writer_a.close()
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_server_uses_chatbot_interface():
+    bot = MagicMock()
+    bot.should_disconnect.return_value = True
+
+    async def scenario():
+        server = ChatServer(bot, port=0)
+        await server.start()
+        reader, _ = await connect(server)
+        assert await read_line(reader) == ''  # Disconnects right after the greeting
+        await server.close()
+
+    asyncio.run(scenario())
+    bot.should_disconnect.assert_called_once_with('')